@@ -3,9 +3,19 @@ import math
 import random
 import os
 from games.pega_pega.pega_pega_game import PegaPegaGame
-from ui.widgets import Button, Title, ColorPicker, InputBox, load_font
+from games.pega_pega.replay import Recording
+from games.pega_pega.simulation import PegaPegaSim
+from games.pega_pega import netplay
+from ui.widgets import Button, Title, ColorPicker, InputBox, ModeSelector, load_font, render_text
+from ui.surfaces import get_overlay
+from ui.loading import draw_loading
+from utils.tracing import tracer, traced
+from utils.assets import assets
+from utils.scenes import scenes
 
 class GameManager:
+    PRELOAD_IDLE_MS = 250  # Menu parado por esse tempo: prepara a partida em segundo plano
+
     def __init__(self, screen, width, height):
         self.screen = screen
         self.width = width
@@ -22,9 +32,26 @@ class GameManager:
         self.intro_start = pygame.time.get_ticks()
         self.INTRO_MS = 7000
 
+        # Pré-carga da partida: configurações do menu e quando mudaram pela última vez
+        self.menu_settings = None
+        self.settings_changed = 0
+        self.loading_key = None
+        self.loading_since = 0
+
         # Recursos
         self.load_assets()
 
+    @property
+    def current_state(self):
+        return self._state
+
+    @current_state.setter
+    def current_state(self, state):
+        # Toda troca de estado vira um marco no trace
+        if getattr(self, "_state", None) != state:
+            tracer.instant(f"estado: {getattr(self, '_state', None)} -> {state}", cat="state")
+        self._state = state
+
     def setup_visuals(self):
         """Configura cores, fontes e paleta"""
         # Cores
@@ -54,7 +81,7 @@ class GameManager:
         self.section_spacing = 120
 
         # Player 1
-        self.player1_label = self.FT_SM.render("", True, self.WHITE)
+        self.player1_label = render_text(self.FT_SM, "", True, self.WHITE)
         self.pick1 = ColorPicker(
             x=self.width // 2 - 200,
             y=self.menu_y_start,
@@ -72,7 +99,7 @@ class GameManager:
 
         # Player 2
         p2_y = self.menu_y_start + self.section_spacing
-        self.player2_label = self.FT_SM.render("", True, self.WHITE)
+        self.player2_label = render_text(self.FT_SM, "", True, self.WHITE)
         self.pick2 = ColorPicker(
             x=self.width // 2 - 200,
             y=p2_y,
@@ -88,40 +115,51 @@ class GameManager:
             "Player 2 (SETAS)"
         )
 
-        # Botões
+        # Modo: dois jogadores no teclado ou Player 2 controlado pela IA
         btn_y = self.menu_y_start + self.section_spacing * 2
+        self.mode_sel = ModeSelector(self.width // 2 - 120, btn_y - 52, 240, 36,
+                                     ["2 JOGADORES", "VS CPU"])
+
+        # Botões
         self.btn = Button((self.width // 2 - 100, btn_y, 200, 56), "🎮 INICIAR JOGO")
         self.back_btn = Button((20, self.height - 60, 140, 40), "← VOLTAR")
 
         # Título principal (texto igual ao jogo; se quiser o exato do exemplo, troque aqui)
         self.title_text = "CORRIDA MALUCA"
 
+        # Parte fixa do menu, composta no primeiro desenho
+        self.menu_layer = None
+
+    @staticmethod
+    def preload(width, height):
+        """Thread de pré-carga do seletor: lê e decodifica o fundo e a música do menu"""
+        assets.prefetch_image("assets/python.png", (width, height))
+        assets.data("assets/bg_music.wav")
+
+    @traced("GameManager.load_assets", cat="assets")
     def load_assets(self):
         """Carrega recursos opcionais"""
         self.music_ok = self.tag_ok = self.hit_ok = False
 
+        # Tudo vem do cache compartilhado: um novo GameManager não relê nem re-escala nada
         try:
-            pygame.mixer.music.load("assets/bg_music.wav")
-            pygame.mixer.music.set_volume(0.4)
-            self.music_ok = True
-        except:
+            if assets.music("assets/bg_music.wav", owner="menu"):
+                pygame.mixer.music.set_volume(0.4)
+                self.music_ok = True
+        except pygame.error:
             pass
 
-        try:
-            self.BG_IMG = pygame.image.load("assets/python.png").convert_alpha()
-            self.BG_IMG = pygame.transform.smoothscale(self.BG_IMG, (self.width, self.height))
-        except:
-            self.BG_IMG = None
+        self.BG_IMG = assets.image("assets/python.png", (self.width, self.height), owner="menu")
 
-    def draw_bg(self):
+    def draw_bg(self, surface=None):
         """Desenha o fundo com imagem ou cor sólida"""
+        surface = surface or self.screen
         if self.BG_IMG:
-            self.screen.blit(self.BG_IMG, (0, 0))
-            sh = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            sh.fill((0, 0, 0, 80))  # leve escurecido como no exemplo
-            self.screen.blit(sh, (0, 0))
+            surface.blit(self.BG_IMG, (0, 0))
+            # leve escurecido como no exemplo
+            surface.blit(get_overlay((self.width, self.height), (0, 0, 0, 80)), (0, 0))
         else:
-            self.screen.fill(self.BG)
+            surface.fill(self.BG)
 
     def handle_event(self, event):
         """Gerencia eventos"""
@@ -129,6 +167,10 @@ class GameManager:
             self.handle_intro_event(event)
         elif self.current_state == "MENU":
             self.handle_menu_event(event)
+        elif self.current_state == "LOADING":
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.loading_key = None
+                self.current_state = "MENU"
         elif self.current_state == "GAME" and self.current_game:
             self.current_game.handle_event(event)
 
@@ -153,32 +195,148 @@ class GameManager:
         self.inp2.handle_event(event)
         self.pick1.handle_event(event)
         self.pick2.handle_event(event)
+        self.mode_sel.handle_event(event)
 
         # Iniciar
         if (event.type == pygame.MOUSEBUTTONDOWN and self.btn.is_clicked(event.pos)) or \
            (event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN):
             self.start_pega_pega()
 
+    def match_settings(self):
+        """Nomes, cores e modo escolhidos no menu (a chave da partida pré-carregada)"""
+        vs_cpu = self.mode_sel.get_selected_mode() == "VS CPU"
+        return (
+            self.inp1.text or "Player 1",
+            self.inp2.text or ("CPU" if vs_cpu else "Player 2"),
+            tuple(self.pick1.get_selected_color()),
+            tuple(self.pick2.get_selected_color()),
+            vs_cpu,
+        )
+
+    def preload_match(self):
+        """Com o menu parado por PRELOAD_IDLE_MS, prepara a partida das configurações atuais"""
+        settings = self.match_settings()
+        now = pygame.time.get_ticks()
+        if settings != self.menu_settings:
+            # Ainda digitando/escolhendo: cada mudança reinicia a espera
+            self.menu_settings = settings
+            self.settings_changed = now
+        elif now - self.settings_changed >= self.PRELOAD_IDLE_MS:
+            self.prepare_match(settings)
+
+    def prepare_match(self, settings):
+        key = ("match", settings)
+        if not scenes.scheduled(key):
+            # Partidas preparadas com configurações antigas não vão mais ser usadas
+            scenes.discard("match", keep=key)
+            player1_name, player2_name, player1_color, player2_color, _ = settings
+            scenes.prepare(key, lambda: PegaPegaGame.preload(
+                self.width, self.height, player1_name, player2_name, player1_color, player2_color))
+        return key
+
+    @traced("GameManager.start_pega_pega", cat="state")
     def start_pega_pega(self):
-        """Inicia o jogo Pega-Pega com as configurações do menu"""
-        player1_name = self.inp1.text or "Player 1"
-        player2_name = self.inp2.text or "Player 2"
-        player1_color = self.pick1.get_selected_color()
-        player2_color = self.pick2.get_selected_color()
+        """
+        Inicia o jogo Pega-Pega com as configurações do menu. Se a partida já foi
+        preparada em segundo plano é só trocar; senão espera na tela de carregamento.
+        """
+        key = self.prepare_match(self.match_settings())
+        if scenes.ready(key):
+            self.begin_match(key)
+        else:
+            self.loading_key = key
+            self.loading_since = pygame.time.get_ticks()
+            self.current_state = "LOADING"
 
+    def begin_match(self, key):
+        player1_name, player2_name, player1_color, player2_color, vs_cpu = key[1]
         print(f"🎮 Iniciando Corrida Maluca: {player1_name} vs {player2_name}")
 
+        # None se a pré-carga falhou: o jogo monta a simulação ele mesmo
+        sim = scenes.take(key)
+        self.loading_key = None
         self.current_game = PegaPegaGame(
             self.screen, self.width, self.height,
             player1_name, player2_name,
             player1_color, player2_color,
-            "TAG"
+            "TAG",
+            bots=(1,) if vs_cpu else (),
+            sim=sim
         )
         self.current_state = "GAME"
 
         if self.music_ok:
             pygame.mixer.music.play(-1)
 
+    @traced("GameManager.start_replay", cat="state")
+    def start_replay(self, path, speed=1):
+        """Reproduz uma partida gravada (speed: ticks por passo; 0 = o mais rápido possível)"""
+        recording = Recording.load(path)
+        print(f"▶ Reproduzindo {path} ({recording.ticks} ticks)")
+        self.current_game = PegaPegaGame(
+            self.screen, self.width, self.height,
+            replay=recording, replay_speed=speed
+        )
+        self.current_state = "GAME"
+
+    def netplay_host_sim(self, dt):
+        """Simulação do anfitrião, com nome e cores do menu, e o cabeçalho que o convidado recebe"""
+        sim = PegaPegaSim(
+            self.width, self.height,
+            self.inp1.text or "Player 1", "Player 2",
+            self.pick1.get_selected_color(), self.pick2.get_selected_color(),
+            start_ms=pygame.time.get_ticks()
+        )
+        return sim, Recording.from_sim(sim, dt).header
+
+    def begin_netplay(self, sim, local_index, transport, dt, input_delay):
+        session = netplay.RollbackSession(sim, local_index, transport, dt, input_delay)
+        self.current_game = PegaPegaGame(self.screen, self.width, self.height, netplay=session)
+        self.current_state = "GAME"
+
+    @traced("GameManager.start_netplay", cat="state")
+    def start_netplay(self, transport, local_index, dt, input_delay=2):
+        """
+        Partida em rede contra outra cabine. O anfitrião (local_index 0) cria a
+        simulação e manda o cabeçalho; o convidado recria a mesma a partir dele.
+        """
+        if local_index == 0:
+            sim, header = self.netplay_host_sim(dt)
+            print(f"📡 Aguardando o outro jogador em {transport.address[1]}...")
+            if not netplay.host(transport, header, pump=pygame.event.pump):
+                print("❌ Ninguém conectou")
+                transport.close()
+                return False
+        else:
+            print("📡 Conectando ao anfitrião...")
+            header = netplay.join(transport, pump=pygame.event.pump)
+            if header is None:
+                print("❌ Anfitrião não respondeu")
+                transport.close()
+                return False
+            sim = Recording(header).make_sim()
+
+        self.begin_netplay(sim, local_index, transport, dt, input_delay)
+        return True
+
+    async def start_netplay_async(self, transport, local_index, dt, input_delay=2):
+        """start_netplay como tarefa: o menu continua vivo durante o handshake"""
+        if local_index == 0:
+            sim, header = self.netplay_host_sim(dt)
+            print(f"📡 Aguardando o outro jogador em {transport.address[1]}...")
+            ok = await netplay.host_async(transport, header)
+        else:
+            print("📡 Conectando ao anfitrião...")
+            header = await netplay.join_async(transport)
+            ok = header is not None
+            sim = Recording(header).make_sim() if ok else None
+        if not ok:
+            print("❌ Conexão não estabelecida")
+            transport.close()
+            return False
+        self.begin_netplay(sim, local_index, transport, dt, input_delay)
+        return True
+
     def return_to_menu(self):
         """Volta para o menu do jogo"""
         if self.current_game:
@@ -193,6 +351,7 @@ class GameManager:
     def return_to_main_menu(self):
         """Volta para o menu principal (seletor de jogos)"""
         self.return_to_menu()
+        scenes.discard("match")
         self.current_state = "MAIN_MENU"
 
     def update(self, dt):
@@ -201,27 +360,44 @@ class GameManager:
             elapsed = pygame.time.get_ticks() - self.intro_start
             if elapsed >= self.INTRO_MS:
                 self.current_state = "MENU"
+        elif self.current_state == "MENU":
+            self.preload_match()
+        elif self.current_state == "LOADING":
+            if scenes.ready(self.loading_key):
+                self.begin_match(self.loading_key)
         elif self.current_state == "GAME" and self.current_game:
             self.current_game.update(dt)
 
-    def draw(self):
-        """Desenha o estado atual"""
+    def draw(self, alpha=1.0):
+        """Desenha o estado atual; devolve as áreas alteradas ou None se a tela toda mudou"""
+        if self.current_state == "GAME" and self.current_game:
+            # O jogo desenha o próprio fundo e pode atualizar só retângulos sujos
+            return self.current_game.draw(alpha)
+
+        if self.current_state == "MENU":
+            self.draw_menu()
+            return None
+
+        if self.current_state == "LOADING":
+            # Espera curta fica no menu; a tela de carregamento só aparece se demorar
+            elapsed = pygame.time.get_ticks() - self.loading_since
+            if elapsed < scenes.LOADING_DELAY_MS:
+                self.draw_menu()
+            else:
+                draw_loading(self.screen, self.title_text, elapsed / 1000.0)
+            return None
+
         self.draw_bg()
 
         if self.current_state == "INTRO":
             self.draw_intro()
-        elif self.current_state == "MENU":
-            self.draw_menu()
-        elif self.current_state == "GAME" and self.current_game:
-            self.current_game.draw()
         elif self.current_state == "MAIN_MENU":
             pass
+        return None
 
     def draw_intro(self):
         """Desenha a tela de introdução animada (igual ao exemplo)"""
-        shade = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        shade.fill((0, 0, 0, 90))
-        self.screen.blit(shade, (0, 0))
+        self.screen.blit(get_overlay((self.width, self.height), (0, 0, 0, 90)), (0, 0))
 
         elapsed = pygame.time.get_ticks() - self.intro_start
         p = elapsed / self.INTRO_MS
@@ -238,8 +414,9 @@ class GameManager:
         txt = "FAÇAM SUAS APOSTAS!"
         tsec = pygame.time.get_ticks() / 1000.0
         scale = 1.0 + 0.02 * math.sin(tsec * 3.0)
-        text = self.FT_MEGA.render(txt, True, self.WHITE)
-        shadow = self.FT_MEGA.render(txt, True, (0, 0, 0))
+        # Cópias: o alpha muda a cada frame e o texto em cache é compartilhado
+        text = render_text(self.FT_MEGA, txt, True, self.WHITE).copy()
+        shadow = render_text(self.FT_MEGA, txt, True, (0, 0, 0)).copy()
         text.set_alpha(alpha)
         shadow.set_alpha(int(alpha * 0.6))
         text = pygame.transform.rotozoom(text, 0, scale)
@@ -247,57 +424,79 @@ class GameManager:
         self.screen.blit(shadow, shadow.get_rect(center=(self.width // 2 + 3, self.height // 2 + 2)))
         self.screen.blit(text, text.get_rect(center=(self.width // 2, self.height // 2)))
 
-    def draw_menu(self):
-        """Desenha o menu principal com o estilo do componente de exemplo"""
+    def draw_menu(self, surface=None):
+        """Menu: camada fixa pronta + um blit por widget (cada um só se redesenha quando muda)"""
+        surface = surface or self.screen
+        if self.menu_layer is None:
+            self.menu_layer = self.build_menu_layer()
+        surface.blit(self.menu_layer, (0, 0))
+
+        self.pick1.draw(surface)
+        self.inp1.draw(surface)
+        self.pick2.draw(surface)
+        self.inp2.draw(surface)
+        self.mode_sel.draw(surface)
+
+        # Botões
+        mouse_pos = pygame.mouse.get_pos()
+        tsec = pygame.time.get_ticks() / 1000.0
+        self.btn.draw(surface, self.btn.is_hovered(mouse_pos), tsec)
+        self.back_btn.draw(surface, self.back_btn.is_hovered(mouse_pos), tsec)
+
+    def warm(self):
+        """Antes de aparecer (pré-carga do seletor): compõe a camada do menu e os widgets num rascunho"""
+        self.draw_menu(pygame.Surface((self.width, self.height)))
+
+    def build_menu_layer(self):
+        """Fundo, marca, título e rótulos do menu compostos numa única superfície"""
+        layer = pygame.Surface((self.width, self.height)).convert()
+        self.draw_bg(layer)
+
         # Marca
-        brand = self.FT.render("Vannpipe Game Inc.", True, self.WHITE)
-        self.screen.blit(brand, (self.width // 2 - brand.get_width() // 2, 90))
+        brand = render_text(self.FT, "Vannpipe Game Inc.", True, self.WHITE)
+        layer.blit(brand, (self.width // 2 - brand.get_width() // 2, 90))
 
         # Título com camadas (a cor azul leve nas sombras)
         title = self.title_text
         for i, a in enumerate([90, 60, 30]):
-            s = load_font(46 + i * 2).render(title, True, (100, 170, 255))
-            s.set_alpha(a)
-            self.screen.blit(s, (self.width // 2 - s.get_width() // 2, 125 - i * 2))
-        main = self.FT_BIG.render(title, True, self.WHITE)
-        self.screen.blit(main, (self.width // 2 - main.get_width() // 2, 120))
+            s = render_text(load_font(46 + i * 2), title, True, (100, 170, 255), alpha=a)
+            layer.blit(s, (self.width // 2 - s.get_width() // 2, 125 - i * 2))
+        main = render_text(self.FT_BIG, title, True, self.WHITE)
+        layer.blit(main, (self.width // 2 - main.get_width() // 2, 120))
 
         # Posições
         y_start = self.menu_y_start
         spacing = self.section_spacing
 
-        # Labels e widgets
-        # P1
-        self.screen.blit(self.player1_label, (self.width // 2 - 200, y_start - 18))
-        self.pick1.draw(self.screen)
-        self.inp1.draw(self.screen)
-        # P2
-        self.screen.blit(self.player2_label, (self.width // 2 - 200, y_start + spacing - 18))
-        self.pick2.draw(self.screen)
-        self.inp2.draw(self.screen)
-
-        # Botões
-        mouse_pos = pygame.mouse.get_pos()
-        tsec = pygame.time.get_ticks() / 1000.0
-        self.btn.draw(self.screen, self.btn.is_hovered(mouse_pos), tsec)
-        self.back_btn.draw(self.screen, self.back_btn.is_hovered(mouse_pos), tsec)
+        # Labels
+        layer.blit(self.player1_label, (self.width // 2 - 200, y_start - 18))
+        layer.blit(self.player2_label, (self.width // 2 - 200, y_start + spacing - 18))
 
         # Instruções
-        instructions = self.FT_SM.render("", True, (200, 200, 200))
-        self.screen.blit(instructions, (self.width // 2 - instructions.get_width() // 2, self.height - 100))
+        instructions = render_text(self.FT_SM, "", True, (200, 200, 200))
+        layer.blit(instructions, (self.width // 2 - instructions.get_width() // 2, self.height - 100))
+
+        tip = render_text(self.FT_SM, "", True, (150, 150, 150))
+        layer.blit(tip, (self.width // 2 - tip.get_width() // 2, self.height - 80))
 
-        tip = self.FT_SM.render("", True, (150, 150, 150))
-        self.screen.blit(tip, (self.width // 2 - tip.get_width() // 2, self.height - 80))
+        return layer
 
     def update_screen(self, new_screen):
         """Atualiza a referência da tela (para fullscreen)"""
         self.screen = new_screen
+        # O cache já foi reconvertido para o novo modo; só pega as superfícies de novo
+        self.BG_IMG = assets.image("assets/python.png", (self.width, self.height), owner="menu")
+        self.menu_layer = None
         if self.current_game:
             self.current_game.screen = new_screen
+            self.current_game.load_assets()
+            self.current_game.invalidate()
 
     def cleanup(self):
         """Limpeza ao sair do jogo"""
+        scenes.discard("match")
         if self.current_game:
             self.current_game.cleanup()
         if self.music_ok and pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
\ No newline at end of file
+            pygame.mixer.music.stop()
+        assets.release("menu")
\ No newline at end of file
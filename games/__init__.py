@@ -2,6 +2,7 @@
 Games package - Todos os jogos disponíveis
 """
 
+from .registry import registry, GameRegistry, GameInfo
 from .base_game import BaseGame
 
-__all__ = ['BaseGame']
\ No newline at end of file
+__all__ = ['BaseGame', 'registry', 'GameRegistry', 'GameInfo']
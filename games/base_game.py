@@ -1,9 +1,25 @@
 from abc import ABC, abstractmethod
 import pygame
+from utils.tracing import traced
+from games.registry import registry
 
 class BaseGame(ABC):
     """Classe abstrata base para todos os jogos"""
     
+    # Métodos do ciclo de vida instrumentados automaticamente nas subclasses
+    TRACED_METHODS = ("handle_event", "update", "draw")
+    
+    def __init_subclass__(cls, game_id=None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # class MeuJogo(BaseGame, game_id="...") liga a classe à ficha GAME do pacote
+        if game_id is not None:
+            cls.game_id = game_id
+            registry.register_class(game_id, cls)
+        for name in cls.TRACED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__traced__", False):
+                setattr(cls, name, traced(f"{cls.__name__}.{name}", cat="lifecycle")(method))
+    
     def __init__(self, screen, width, height):
         self.screen = screen
         self.width = width
@@ -21,8 +37,12 @@ class BaseGame(ABC):
         pass
     
     @abstractmethod
-    def draw(self):
-        """Desenha o jogo"""
+    def draw(self, alpha=1.0):
+        """Desenha o jogo (alpha: fração do passo fixo para interpolação, 0..1)"""
+        pass
+    
+    def invalidate(self):
+        """Descarta o que estiver em cache do frame anterior e força redesenho completo"""
         pass
     
     def cleanup(self):
@@ -0,0 +1,17 @@
+"""
+Guerra Relâmpago - Mata-Mata competitivo (em desenvolvimento)
+
+Sem `entry` o seletor mostra o cartão como "EM BREVE!". Quando o jogo existir,
+aponte `entry` para a fábrica do gerenciador, como em games/pega_pega.
+"""
+
+GAME = {
+    "id": "GUERRA_RELAMPAGO",
+    "name": "GUERRA RELÂMPAGO",
+    "tagline": "Mata-Mata",
+    "description": "Modo Mata-Mata competitivo!",
+    "color": (255, 100, 100),
+    "icon": "⚔️",
+    "order": 10,
+    "entry": None,
+}
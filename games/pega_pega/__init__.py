@@ -1,18 +1,56 @@
 """
 Pega-Pega game package
+
+O seletor só lê GAME; as classes abaixo são importadas no primeiro acesso
+(from games.pega_pega import PegaPegaGame continua funcionando).
 """
+import importlib
+
+GAME = {
+    "id": "CORRIDA_MALUCA",
+    "name": "CORRIDA MALUCA",
+    "tagline": "Pega-Pega Caótico",
+    "description": "Pega-Pega caótico com power-ups!",
+    "color": (100, 170, 255),
+    "icon": "🏃‍♂️",
+    "order": 0,
+    "entry": "game_manager:GameManager",
+    "modules": ["games.pega_pega.simulation", "games.pega_pega.pega_pega_game"],
+}
+
+_EXPORTS = {
+    'PegaPegaGame': 'pega_pega_game',
+    'PegaPegaSim': 'simulation',
+    'EntityStore': 'entity_store',
+    'Player': 'entities',
+    'PowerUp': 'entities',
+    'spawn_powerup': 'entities',
+    'apply_powerup': 'entities',
+    'PegaPegaAI': 'ai',
+    'NavGrid': 'ai',
+    'Recording': 'replay',
+    'ReplayPlayer': 'replay',
+    'run_replay': 'replay',
+    'ReplayArchive': 'replay_archive',
+    'ArchiveWriter': 'replay_archive',
+    'write_archive': 'replay_archive',
+    'RollbackSession': 'netplay',
+    'UdpTransport': 'netplay',
+    'LinkSimulator': 'netplay',
+    'get_map': 'maps',
+    'draw_obstacles': 'maps',
+    'MovingRect': 'maps',
+}
+
+__all__ = list(_EXPORTS)
 
-from .pega_pega_game import PegaPegaGame
-from .entities import Player, PowerUp, spawn_powerup, apply_powerup
-from .maps import get_map, draw_obstacles, MovingRect
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
 
-__all__ = [
-    'PegaPegaGame', 
-    'Player', 
-    'PowerUp', 
-    'spawn_powerup', 
-    'apply_powerup',
-    'get_map', 
-    'draw_obstacles', 
-    'MovingRect'
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,369 @@
+import math
+from collections import deque
+import numpy as np
+from games.pega_pega.entity_store import UP, DOWN, LEFT, RIGHT
+
+# Vizinhança de 8 células: (dcol, drow)
+STEPS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+class NavGrid:
+    """
+    Grade de navegação grossa de um mapa para os bots.
+
+    A parte estática (onde o centro de um círculo de raio `radius` cabe) e a lista
+    de vizinhos de cada célula saem do campo de distância uma vez por mapa. Os
+    movers só marcam/desmarcam as células que entraram ou saíram da área deles.
+    """
+    def __init__(self, field, radius, cell_size=24):
+        self.cell_size = cell_size
+        self.radius = radius
+        self.cols = int(math.ceil(field.width / cell_size))
+        self.rows = int(math.ceil(field.height / cell_size))
+        xs = (np.arange(self.cols) + 0.5) * cell_size
+        ys = (np.arange(self.rows) + 0.5) * cell_size
+        cx, cy = np.meshgrid(xs, ys)
+        self.static_free = field.static_clearance(cx.ravel(), cy.ravel()) >= radius
+
+        # Bloqueios dos movers: contador por célula e faixa atual de cada mover
+        self.mover_count = np.zeros(self.rows * self.cols, dtype=np.int16)
+        self.mover_spans = {}
+        self.version = 0  # Muda sempre que o conjunto de células livres muda
+        self.fields = {}  # Campos de distância por célula de origem (ver FlowField)
+
+        # Vizinhos válidos de cada célula; diagonais só sem cortar quina
+        free = self.static_free
+        cols, rows = self.cols, self.rows
+        self.neighbors = []
+        for i in range(rows * cols):
+            row, col = divmod(i, cols)
+            links = []
+            for dc, dr in STEPS:
+                c, r = col + dc, row + dr
+                if not (0 <= c < cols and 0 <= r < rows) or not free[r * cols + c]:
+                    continue
+                if dc and dr and not (free[row * cols + c] and free[r * cols + col]):
+                    continue
+                links.append(r * cols + c)
+            self.neighbors.append(links)
+
+    def cell_of(self, x, y):
+        """Índice (achatado) da célula do ponto"""
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def center(self, i):
+        row, col = divmod(i, self.cols)
+        return (col + 0.5) * self.cell_size, (row + 0.5) * self.cell_size
+
+    def _span(self, rect):
+        """Células cujo centro fica a menos de `radius` do retângulo (faixa de colunas e linhas)"""
+        cs, r = self.cell_size, self.radius
+        c0 = max(int(math.ceil((rect.left - r) / cs - 0.5)), 0)
+        c1 = min(int(math.floor((rect.right + r) / cs - 0.5)), self.cols - 1)
+        r0 = max(int(math.ceil((rect.top - r) / cs - 0.5)), 0)
+        r1 = min(int(math.floor((rect.bottom + r) / cs - 0.5)), self.rows - 1)
+        return c0, r0, c1, r1
+
+    def _mark(self, span, delta):
+        c0, r0, c1, r1 = span
+        grid = self.mover_count.reshape(self.rows, self.cols)
+        grid[r0:r1 + 1, c0:c1 + 1] += delta
+
+    def update_movers(self, rects):
+        """Atualiza só os movers cuja faixa de células mudou desde o último tick"""
+        for i, rect in enumerate(rects):
+            span = self._span(rect)
+            old = self.mover_spans.get(i)
+            if old == span:
+                continue
+            if old is not None:
+                self._mark(old, -1)
+            self._mark(span, 1)
+            self.mover_spans[i] = span
+            self.version += 1
+
+    def free_mask(self):
+        """Array de booleanos (achatado) com as células livres agora"""
+        return self.static_free & (self.mover_count == 0)
+
+    def free_cells(self):
+        """Lista de booleanos (achatada) com as células livres agora"""
+        return self.free_mask().tolist()
+
+class FlowField:
+    """
+    Distância (em passos de célula) de cada célula até a origem mais próxima.
+
+    Guarda um campo por célula de origem (BFS daquela célula) e o combina
+    pelo mínimo quando há várias origens. Uma origem que muda de célula volta,
+    em geral, para uma célula que já teve campo; o BFS só roda para células
+    que ainda não tiveram campo nesta grade. Um campo guardado que ficou para
+    trás em relação aos movers é reparado no lugar, só na região afetada
+    (ver repair); o resultado é sempre igual ao de build().
+    """
+    def __init__(self, nav):
+        self.nav = nav
+        self.sources = None
+        self.version = -1
+        self.free = None  # Células livres na versão atual da grade (array e lista)
+        self.free_list = None
+        self.dist = None
+        # célula de origem -> (dist, máscara de livres para a qual vale). Fica na
+        # grade: os campos do pegador e dos fugitivos (os papéis se trocam a cada
+        # pegada) e os de um mapa que volta reaproveitam o que já foi calculado
+        self.fields = nav.fields
+        self.stats = {"builds": 0, "repairs": 0, "hits": 0}
+
+    def update(self, sources):
+        sources = tuple(sorted(set(sources)))
+        nav = self.nav
+        if sources == self.sources and self.version == nav.version:
+            return
+        if self.version != nav.version:
+            self.free = nav.free_mask()
+            self.free_list = self.free.tolist()
+            self.version = nav.version
+        fields = [self.field(s) for s in sources]
+        if len(fields) == 1:
+            self.dist = fields[0]
+        elif fields:
+            self.dist = [min(d) for d in zip(*fields)]
+        else:
+            self.dist = [math.inf] * len(self.free)
+        self.sources = sources
+
+    def field(self, source):
+        """Campo de uma única origem, atualizado para as células livres de agora"""
+        entry = self.fields.get(source)
+        if entry is None:
+            dist = self.build((source,), self.free_list)
+            self.stats["builds"] += 1
+        else:
+            dist, free = entry
+            if free is not self.free:
+                changed = np.flatnonzero(free != self.free).tolist()
+                if changed:
+                    self.repair(source, dist, self.free_list, changed)
+                    self.stats["repairs"] += 1
+            self.stats["hits"] += 1
+        self.fields[source] = (dist, self.free)
+        return dist
+
+    def build(self, sources, free):
+        """BFS multi-origem pela vizinhança pré-calculada"""
+        neighbors = self.nav.neighbors
+        dist = [math.inf] * len(free)
+        queue = deque()
+        for s in sources:
+            dist[s] = 0
+            queue.append(s)
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for j in neighbors[i]:
+                if d < dist[j] and free[j]:
+                    dist[j] = d
+                    queue.append(j)
+        return dist
+
+    def repair(self, source, dist, free, changed):
+        """
+        Leva `dist` (BFS de `source`) para as células livres `free` (lista de
+        booleanos), sabendo que só as células `changed` trocaram de estado.
+        Primeiro as liberadas recebem distância dos vizinhos e propagam
+        reduções; depois as bloqueadas invalidam as células que só tinham apoio
+        nelas (nenhum vizinho válido com distância uma a menos), que são
+        refeitas a partir da borda que ficou válida.
+
+        A origem sempre entra como semente: numa célula bloqueada ela tem
+        vizinhos, mas não aparece na lista de vizinhos deles.
+        """
+        neighbors = self.nav.neighbors
+        inf = math.inf
+        opened = [c for c in changed if free[c] and c != source]
+        blocked = [c for c in changed if not free[c] and c != source]
+
+        # Reduções, ainda contando com as bloqueadas (nada sobe nesta fase)
+        if opened:
+            union = free[:]
+            for c in blocked:
+                union[c] = True
+            self._lower(dist, self._border(dist, opened, source), union)
+
+        # Aumentos: o que ficava nas bloqueadas ou só dependia delas fica sem distância
+        buckets = {}
+        affected = set()
+        for c in blocked:
+            if dist[c] != inf:
+                affected.add(c)
+                buckets.setdefault(dist[c], []).append(c)
+        if not affected:
+            return
+        level = min(buckets)
+        while buckets:
+            cells = buckets.pop(level, None)
+            if cells:
+                child = level + 1
+                for i in cells:
+                    for j in neighbors[i]:
+                        if dist[j] != child or j in affected:
+                            continue
+                        # Ainda tem outro vizinho um passo mais perto da origem?
+                        for k in neighbors[j]:
+                            if dist[k] == level and k not in affected:
+                                break
+                        else:
+                            affected.add(j)
+                            buckets.setdefault(child, []).append(j)
+            level += 1
+        for c in affected:
+            dist[c] = inf
+        self._lower(dist, self._border(dist, affected, source), free)
+
+    def _border(self, dist, cells, source):
+        """Vizinhos com distância conhecida das células (e a origem): sementes para _lower"""
+        neighbors = self.nav.neighbors
+        inf = math.inf
+        border = {source}
+        for c in cells:
+            for k in neighbors[c]:
+                if dist[k] != inf:
+                    border.add(k)
+        return border
+
+    def _lower(self, dist, seeds, free):
+        """Propaga a partir das sementes (já com a distância nova), em ordem de distância"""
+        neighbors = self.nav.neighbors
+        buckets = {}
+        for c in seeds:
+            buckets.setdefault(dist[c], []).append(c)
+        level = min(buckets)
+        while buckets:
+            cells = buckets.pop(level, None)
+            level += 1
+            if not cells:
+                continue
+            nxt = []
+            for i in cells:
+                if dist[i] != level - 1:
+                    continue  # Já foi reduzida de novo por outro caminho
+                for j in neighbors[i]:
+                    if level < dist[j] and free[j]:
+                        dist[j] = level
+                        nxt.append(j)
+            if nxt:
+                buckets.setdefault(level, []).extend(nxt)
+
+def steer_mask(dx, dy):
+    """Máscara de direção (8 sentidos) mais próxima do vetor (dx, dy)"""
+    n = math.hypot(dx, dy)
+    if n == 0:
+        return 0
+    mask = 0
+    # 0.38 ~ sen(22.5°): abaixo disso o eixo é ignorado
+    if dx > 0.38 * n:
+        mask |= RIGHT
+    elif dx < -0.38 * n:
+        mask |= LEFT
+    if dy > 0.38 * n:
+        mask |= DOWN
+    elif dy < -0.38 * n:
+        mask |= UP
+    return mask
+
+class PegaPegaAI:
+    """
+    Bots do Pega-Pega guiados por dois flow fields compartilhados: um até os
+    fugitivos (usado pelo pegador) e um a partir do pegador (usado por quem foge).
+    Cada bot só olha as 8 células vizinhas da sua: decisão O(1) por tick.
+    Power-ups próximos (no máximo 3 em jogo) desviam o bot se forem seguros.
+    """
+    PICKUP_RANGE = 160  # Distância máxima de desvio para pegar um power-up
+
+    def __init__(self, sim, bots):
+        self.sim = sim
+        self.bots = list(bots)
+        self.nav = None
+        self.chase = self.flee = None
+
+    def sync_map(self):
+        """Os flow fields acompanham a grade de navegação do mapa atual"""
+        if self.nav is not self.sim.nav:
+            self.nav = self.sim.nav
+            self.chase = FlowField(self.nav)
+            self.flee = FlowField(self.nav)
+
+    def fill(self, inputs):
+        """Escreve em `inputs` as máscaras dos jogadores controlados pela IA"""
+        sim = self.sim
+        self.sync_map()
+        nav = self.nav
+        players = sim.players
+        it = sim.it_index()
+        runner_cells = [nav.cell_of(p.x, p.y) for i, p in enumerate(players) if i != it]
+        chaser = players[it]
+        it_cell = nav.cell_of(chaser.x, chaser.y)
+
+        # Os campos só são atualizados por quem vai lê-los (um bot indo atrás
+        # de power-up não olha o campo)
+        for i in self.bots:
+            if i == it:
+                inputs[i] = self.chase_mask(players[i], runner_cells)
+            else:
+                inputs[i] = self.flee_mask(players[i], chaser, it_cell)
+        return inputs
+
+    def best_neighbor(self, cell, dist, sign):
+        """Vizinho livre que mais reduz (sign=1) ou aumenta (sign=-1) a distância"""
+        best, best_d = None, dist[cell] * sign
+        for j in self.nav.neighbors[cell]:
+            d = dist[j] * sign
+            if d < best_d and dist[j] != math.inf:
+                best, best_d = j, d
+        return best
+
+    def steer_to_cell(self, player, cell):
+        x, y = self.nav.center(cell)
+        return steer_mask(x - player.x, y - player.y)
+
+    def nearby_powerup(self, player, chaser=None):
+        """Power-up ao alcance; para quem foge, só se o pegador estiver mais longe dele"""
+        best, best_d = None, self.PICKUP_RANGE
+        for pu in self.sim.powerups:
+            d = math.hypot(pu.x - player.x, pu.y - player.y)
+            if d >= best_d:
+                continue
+            if chaser is not None and math.hypot(pu.x - chaser.x, pu.y - chaser.y) <= d:
+                continue
+            best, best_d = pu, d
+        return best
+
+    def chase_mask(self, player, runner_cells):
+        pu = self.nearby_powerup(player)
+        if pu is not None and pu.kind in ("speed", "teleport"):
+            return steer_mask(pu.x - player.x, pu.y - player.y)
+        cell = self.nav.cell_of(player.x, player.y)
+        self.chase.update(runner_cells)
+        dist = self.chase.dist
+        if dist[cell] <= 1:
+            # Alvo na célula vizinha: vai direto no fugitivo mais próximo
+            target = self.sim.opponent_of(player)
+            return steer_mask(target.x - player.x, target.y - player.y)
+        nxt = self.best_neighbor(cell, dist, 1)
+        if nxt is None:
+            target = self.sim.opponent_of(player)
+            return steer_mask(target.x - player.x, target.y - player.y)
+        return self.steer_to_cell(player, nxt)
+
+    def flee_mask(self, player, chaser, it_cell):
+        pu = self.nearby_powerup(player, chaser)
+        if pu is not None:
+            return steer_mask(pu.x - player.x, pu.y - player.y)
+        cell = self.nav.cell_of(player.x, player.y)
+        self.flee.update([it_cell])
+        nxt = self.best_neighbor(cell, self.flee.dist, -1)
+        if nxt is None:
+            # Encurralado (ou fora da grade): foge em linha reta
+            return steer_mask(player.x - chaser.x, player.y - chaser.y)
+        return self.steer_to_cell(player, nxt)
@@ -2,34 +2,61 @@ import pygame
 import math
 import random
 from utils.helpers import clamp, circle_rect, circles_collide, dist
+from ui.widgets import get_font, render_text
+from games.pega_pega.entity_store import EntityStore, _Field, UP, DOWN, LEFT, RIGHT
 
 class Player:
-    def __init__(self, x, y, r, color, vel, keys, name=""):
-        self.x = x
-        self.y = y
-        self.r = r
+    """Visão de um participante dentro do EntityStore (os dados ficam nos arrays)"""
+    x = _Field(float)
+    y = _Field(float)
+    prev_x = _Field(float)  # Posição no tick anterior (interpolação do desenho)
+    prev_y = _Field(float)
+    r = _Field(float)
+    vel = _Field(float)  # pixels por segundo
+    score = _Field(float)
+    is_it = _Field(bool)
+    speed_mul = _Field(float)
+    speed_until = _Field(float)
+    shield = _Field(int)
+    frozen_until = _Field(float)
+
+    def __init__(self, x, y, r, color, vel, keys, name="", store=None):
+        self.store = store if store is not None else EntityStore(1)
+        self.idx = self.store.add(x, y, r, vel)
         self.color = color
-        self.vel = vel
         self.keys = keys
-        self.score = 0.0
-        self.is_it = False
         self.name = name
-        self.speed_mul = 1.0
-        self.speed_until = 0
-        self.shield = 0
-        self.frozen_until = 0
         self.stuck_protection = 0
 
-    def input(self):
+    def read_keys(self):
+        """Lê o teclado e devolve a máscara de direções do jogador (0 se não tem teclas)"""
+        if not self.keys:
+            return 0
         k = pygame.key.get_pressed()
-        dx = dy = 0
+        mask = 0
+        if k[self.keys["up"]]:
+            mask |= UP
+        if k[self.keys["down"]]:
+            mask |= DOWN
         if k[self.keys["left"]]:
-            dx -= 1
+            mask |= LEFT
         if k[self.keys["right"]]:
+            mask |= RIGHT
+        return mask
+
+    def input(self, mask=None, now=None):
+        if mask is None:
+            mask = self.read_keys()
+        if now is None:
+            now = pygame.time.get_ticks()
+        dx = dy = 0
+        if mask & LEFT:
+            dx -= 1
+        if mask & RIGHT:
             dx += 1
-        if k[self.keys["up"]]:
+        if mask & UP:
             dy -= 1
-        if k[self.keys["down"]]:
+        if mask & DOWN:
             dy += 1
         if dx and dy:
             inv = 1 / math.sqrt(2)
@@ -37,30 +64,36 @@ class Player:
             dy *= inv
         
         v = self.vel * self.speed_mul
-        if pygame.time.get_ticks() < self.frozen_until:
+        if now < self.frozen_until:
             v = 0
         return dx * v, dy * v
 
-    def move_collide(self, dx, dy, arena, rects, movers, circles):
-        old_x, old_y = self.x, self.y
+    def move_collide(self, dx, dy, arena, rects=(), movers=(), circles=(), world=None):
+        """Move eixo a eixo desfazendo o passo que colide; com `world` usa a grade do mapa"""
+        old_x, old_y, r = self.x, self.y, self.r
+        
+        def blocked(x, y):
+            if world is not None:
+                return world.circle_hits(x, y, r)
+            return any(circle_rect(x, y, r, rc) for rc in rects) or \
+                   any(circle_rect(x, y, r, m) for m in movers) or \
+                   any(circles_collide(x, y, r, cx, cy, cr) for (cx, cy, cr) in circles)
         
         # Tenta mover em X
-        self.x = clamp(self.x + dx, self.r, arena.right - self.r)
-        collision_x = any(circle_rect(self.x, self.y, self.r, r) for r in rects) or \
-                     any(circle_rect(self.x, self.y, self.r, m) for m in movers) or \
-                     any(circles_collide(self.x, self.y, self.r, cx, cy, cr) for (cx, cy, cr) in circles)
+        x = clamp(old_x + dx, r, arena.right - r)
+        collision_x = blocked(x, old_y)
         
         if collision_x:
-            self.x = old_x
+            x = old_x
         
         # Tenta mover em Y
-        self.y = clamp(self.y + dy, self.r, arena.bottom - self.r)
-        collision_y = any(circle_rect(self.x, self.y, self.r, r) for r in rects) or \
-                     any(circle_rect(self.x, self.y, self.r, m) for m in movers) or \
-                     any(circles_collide(self.x, self.y, self.r, cx, cy, cr) for (cx, cy, cr) in circles)
+        y = clamp(old_y + dy, r, arena.bottom - r)
+        collision_y = blocked(x, y)
         
         if collision_y:
-            self.y = old_y
+            y = old_y
+        
+        self.x, self.y = x, y
         
         return collision_x or collision_y
 
@@ -68,12 +101,23 @@ class Player:
         """Retorna o retângulo de colisão do jogador"""
         return pygame.Rect(self.x - self.r, self.y - self.r, self.r * 2, self.r * 2)
 
-    def draw(self, surf):
+    def snap(self):
+        """Descarta a interpolação (teleporte, troca de mapa, novo round)"""
+        self.prev_x, self.prev_y = self.x, self.y
+
+    def lerp_pos(self, alpha=1.0):
+        """Posição interpolada entre o tick anterior e o atual"""
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+
+    def draw(self, surf, alpha=1.0):
+        x, y = self.lerp_pos(alpha)
+        pos = (int(x), int(y))
         if self.is_it:
-            pygame.draw.circle(surf, (255, 210, 0), (int(self.x), int(self.y)), self.r + 6, 4)
+            pygame.draw.circle(surf, (255, 210, 0), pos, self.r + 6, 4)
         if self.shield:
-            pygame.draw.circle(surf, (120, 240, 255), (int(self.x), int(self.y)), self.r + 2, 2)
-        pygame.draw.circle(surf, self.color, (int(self.x), int(self.y)), self.r)
+            pygame.draw.circle(surf, (120, 240, 255), pos, self.r + 2, 2)
+        pygame.draw.circle(surf, self.color, pos, self.r)
 
 class PowerUp:
     def __init__(self, kind, pos):
@@ -96,39 +140,69 @@ class PowerUp:
         
         labels = {"speed": "⚡", "shield": "🛡", "freeze": "❄", "teleport": "🔀"}
         label = labels.get(self.kind, "?")
-        font = pygame.font.Font(None, 22)
-        t = font.render(label, True, (0, 0, 0))
+        t = render_text(get_font(None, 22), label, True, (0, 0, 0))
         s.blit(t, (self.x - t.get_width() / 2, self.y - t.get_height() / 2))
 
-def spawn_powerup(pus, static_rects, movers, circles, W, H):
+def spawn_powerup(pus, static_rects, movers, circles, W, H, now=None, rng=random, world=None,
+                  field=None):
+    if field is not None:
+        # Sorteia direto entre as células livres do campo de distância
+        pos = field.sample_free(rng, 14, (60, 110, W - 60, H - 60))
+        if pos is None:
+            return None
+        pu = PowerUp(rng.choice(["speed", "shield", "freeze", "teleport"]), pos)
+        pus.append(pu)
+        if world is not None:
+            world.add_item(pu, pu.x, pu.y, 14)
+        return pu
+
+    if world is None:
+        mover_rects = [m.rect(now) for m in movers]
     for _ in range(100):
-        x = random.randint(60, W - 60)
-        y = random.randint(110, H - 60)
-        mover_rects = [m.rect() for m in movers]
+        x = rng.randint(60, W - 60)
+        y = rng.randint(110, H - 60)
         
-        if not any(circle_rect(x, y, 14, rc) for rc in static_rects + mover_rects) and \
-           not any(dist(x, y, cx, cy) <= 14 + cr for (cx, cy, cr) in circles):
-            pus.append(PowerUp(random.choice(["speed", "shield", "freeze", "teleport"]), (x, y)))
-            return
+        if world is not None:
+            free = not world.circle_hits(x, y, 14)
+        else:
+            free = not any(circle_rect(x, y, 14, rc) for rc in static_rects + mover_rects) and \
+                   not any(dist(x, y, cx, cy) <= 14 + cr for (cx, cy, cr) in circles)
+        if free:
+            pu = PowerUp(rng.choice(["speed", "shield", "freeze", "teleport"]), (x, y))
+            pus.append(pu)
+            if world is not None:
+                world.add_item(pu, x, y, 14)
+            return pu
 
-def apply_powerup(who, other, kind, W, H):
-    now = pygame.time.get_ticks()
+def apply_powerup(who, other, kind, W, H, now=None, rng=random, field=None,
+                  speed_mul=1.6, speed_ms=3000, freeze_ms=2000, teleport_dist=250):
+    if now is None:
+        now = pygame.time.get_ticks()
     if kind == "speed":
-        who.speed_mul = 1.6
-        who.speed_until = now + 3000
+        who.speed_mul = speed_mul
+        who.speed_until = now + speed_ms
     elif kind == "shield":
         who.shield = 1
     elif kind == "freeze":
         if not who.is_it:
-            other.frozen_until = now + 2000
+            other.frozen_until = now + freeze_ms
     elif kind == "teleport":
         if who.is_it:
-            who.x = random.randint(60, W - 60)
-            who.y = random.randint(110, H - 60)
+            pos = field.sample_free(rng, who.r, (60, 110, W - 60, H - 60)) if field is not None else None
+            if pos is not None:
+                who.x, who.y = pos
+            else:
+                who.x = rng.randint(60, W - 60)
+                who.y = rng.randint(110, H - 60)
+            who.snap()
         else:
-            min_distance = 250
-            angle = random.uniform(0, 2 * math.pi)
+            min_distance = teleport_dist
+            angle = rng.uniform(0, 2 * math.pi)
             who.x = other.x + min_distance * math.cos(angle)
             who.y = other.y + min_distance * math.sin(angle)
             who.x = clamp(who.x, who.r, W - who.r)
-            who.y = clamp(who.y, who.r, H - who.r)
\ No newline at end of file
+            who.y = clamp(who.y, who.r, H - who.r)
+            if field is not None:
+                # Nunca termina dentro de um obstáculo
+                who.x, who.y = field.push_out(who.x, who.y, who.r)
+            who.snap()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import math
+import numpy as np
+
+# Bits de direção usados como entrada (teclado, bots ou simulação headless)
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+def _direction_table():
+    """Vetor unitário (dx, dy) de cada uma das 16 máscaras possíveis"""
+    table = np.zeros((16, 2))
+    for m in range(16):
+        dx = bool(m & RIGHT) - bool(m & LEFT)
+        dy = bool(m & DOWN) - bool(m & UP)
+        if dx and dy:
+            dx, dy = dx / math.sqrt(2), dy / math.sqrt(2)
+        table[m] = dx, dy
+    return table
+
+DIRECTIONS = _direction_table()
+
+class EntityStore:
+    """
+    Estado de todos os participantes em arrays NumPy contíguos (struct-of-arrays).
+    Movimento, expiração de timers, score e detecção de toques rodam vetorizados;
+    Player é só uma visão (store, índice) sobre estes arrays.
+    """
+    FIELDS = {
+        "x": np.float64, "y": np.float64,
+        "prev_x": np.float64, "prev_y": np.float64,
+        "r": np.float64, "vel": np.float64,
+        "vx": np.float64, "vy": np.float64,
+        "speed_mul": np.float64, "speed_until": np.float64,
+        "shield": np.int8, "frozen_until": np.float64,
+        "is_it": np.bool_, "score": np.float64,
+    }
+
+    def __init__(self, capacity=2):
+        self.count = 0
+        self.capacity = max(1, capacity)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+
+    def view(self, name):
+        """Array só com as entradas ocupadas"""
+        return getattr(self, name)[:self.count]
+
+    def add(self, x, y, r, vel):
+        """Reserva uma entrada e devolve seu índice"""
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.count += 1
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.r[i] = r
+        self.vel[i] = vel
+        self.speed_mul[i] = 1.0
+        return i
+
+    def _grow(self, capacity):
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def snap(self):
+        """prev = atual para todos (início do tick)"""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def velocities(self, masks, now):
+        """Velocidades (px/s) a partir das máscaras de direção de cada participante"""
+        d = DIRECTIONS[np.asarray(masks, dtype=np.intp) & 15]
+        n = self.count
+        v = self.vel[:n] * self.speed_mul[:n]
+        v[now < self.frozen_until[:n]] = 0.0
+        np.multiply(d[:, 0], v, out=self.vx[:n])
+        np.multiply(d[:, 1], v, out=self.vy[:n])
+        return self.vx[:n], self.vy[:n]
+
+    def expire_timers(self, now):
+        """Encerra os power-ups de velocidade vencidos"""
+        n = self.count
+        self.speed_mul[:n][now > self.speed_until[:n]] = 1.0
+
+    def add_score(self, dt):
+        """Quem não é o pegador acumula tempo de fuga"""
+        n = self.count
+        self.score[:n][~self.is_it[:n]] += dt
+
+    def distance_matrix(self):
+        """Matriz (n, n) de distâncias entre centros"""
+        x, y = self.view("x"), self.view("y")
+        return np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+
+    def contacts(self):
+        """Matriz booleana (n, n) de pares que se tocam (diagonal falsa)"""
+        r = self.view("r")
+        touching = self.distance_matrix() <= r[:, None] + r[None, :]
+        np.fill_diagonal(touching, False)
+        return touching
+
+class _Field:
+    """Atributo de Player que lê/escreve direto no array do EntityStore"""
+    def __init__(self, cast):
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.cast(getattr(obj.store, self.name)[obj.idx])
+
+    def __set__(self, obj, value):
+        getattr(obj.store, self.name)[obj.idx] = value
@@ -1,17 +1,20 @@
 import pygame
 import math
 import random
+import numpy as np
 
 class MovingRect:
-    def __init__(self, x, y, w, h, axis, amp, speed):
+    def __init__(self, x, y, w, h, axis, amp, speed, rng=random):
         self.base = pygame.Rect(x, y, w, h)
         self.axis = axis
         self.amp = amp
         self.speed = speed
-        self.t0 = random.random() * 1000
+        self.t0 = rng.random() * 1000
     
-    def rect(self):
-        t = (pygame.time.get_ticks() + self.t0) / 1000.0
+    def rect(self, now=None):
+        if now is None:
+            now = pygame.time.get_ticks()
+        t = (now + self.t0) / 1000.0
         off = math.sin(t * self.speed) * self.amp
         r = self.base.copy()
         if self.axis == "x":
@@ -24,7 +27,41 @@ class MovingRect:
         # Para compatibilidade - atualização do mover
         pass
 
-def get_map(map_name, W, H):
+class MoverBank:
+    """
+    Avalia todos os MovingRect de um mapa de uma vez (NumPy), gerando um snapshot
+    (n, 4) de x, y, w, h por tick. Com lut_size > 0 o seno vem de uma tabela periódica.
+    """
+    def __init__(self, movers, lut_size=0):
+        self.count = len(movers)
+        self.base = np.array([(m.base.x, m.base.y, m.base.w, m.base.h) for m in movers],
+                             dtype=np.float64).reshape(-1, 4)
+        self.axis = np.array([0 if m.axis == "x" else 1 for m in movers], dtype=np.intp)
+        self.amp = np.array([m.amp for m in movers], dtype=np.float64)
+        self.speed = np.array([m.speed for m in movers], dtype=np.float64)
+        self.t0 = np.array([m.t0 for m in movers], dtype=np.float64)
+        self.rows = np.arange(self.count)
+        self.lut = None
+        if lut_size:
+            self.lut = np.sin(np.linspace(0.0, 2 * math.pi, lut_size, endpoint=False))
+
+    def evaluate(self, now):
+        """Snapshot inteiro (n, 4) dos movers no instante `now` (ms)"""
+        phase = (now + self.t0) / 1000.0 * self.speed
+        if self.lut is None:
+            s = np.sin(phase)
+        else:
+            n = len(self.lut)
+            s = self.lut[(phase * (n / (2 * math.pi))).astype(np.int64) % n]
+        snap = self.base.copy()
+        snap[self.rows, self.axis] += s * self.amp
+        return snap.astype(np.int64)
+
+    @staticmethod
+    def to_rects(snapshot):
+        return [pygame.Rect(row) for row in snapshot.tolist()]
+
+def get_map(map_name, W, H, rng=random):
     if map_name == "original":
         static_rects = [
             pygame.Rect(W*0.10, H*0.20, 200, 24),
@@ -33,8 +70,8 @@ def get_map(map_name, W, H):
         ]
         circles = [(W*0.25, H*0.62, 36), (W*0.80, H*0.25, 28)]
         movers = [
-            MovingRect(W*0.40, H*0.38, 24, 140, "x", 40, 1.3),
-            MovingRect(W*0.55, H*0.18, 160, 20, "y", 40, 1.7)
+            MovingRect(W*0.40, H*0.38, 24, 140, "x", 40, 1.3, rng=rng),
+            MovingRect(W*0.55, H*0.18, 160, 20, "y", 40, 1.7, rng=rng)
         ]
     else:  # novo_mapa
         static_rects = [
@@ -44,8 +81,8 @@ def get_map(map_name, W, H):
         ]
         circles = [(W*0.60, H*0.40, 32), (W*0.25, H*0.70, 28)]
         movers = [
-            MovingRect(W*0.20, H*0.50, 120, 24, "x", 60, 1.1),
-            MovingRect(W*0.60, H*0.70, 24, 100, "y", 50, 1.5)
+            MovingRect(W*0.20, H*0.50, 120, 24, "x", 60, 1.1, rng=rng),
+            MovingRect(W*0.60, H*0.70, 24, 100, "y", 50, 1.5, rng=rng)
         ]
     
     return {
@@ -54,19 +91,29 @@ def get_map(map_name, W, H):
         "movers": movers
     }
 
-def draw_obstacles(surf, static_rects, movers, circles):
+def draw_obstacles(surf, static_rects, movers, circles, now=None):
+    draw_static(surf, static_rects, circles)
+    draw_movers(surf, [m.rect(now) for m in movers])
+
+def draw_static(surf, static_rects, circles):
     # Desenhar obstáculos estáticos
     for r in static_rects:
         pygame.draw.rect(surf, (55, 55, 55), r, 0, 6)
         pygame.draw.rect(surf, (90, 90, 90), r.inflate(-6, -6), 0, 6)
     
-    # Desenhar obstáculos móveis
-    for m in movers:
-        r = m.rect()
-        pygame.draw.rect(surf, (75, 75, 75), r, 0, 6)
-        pygame.draw.rect(surf, (120, 120, 120), r.inflate(-6, -6), 0, 6)
-    
     # Desenhar círculos
     for (cx, cy, cr) in circles:
         pygame.draw.circle(surf, (55, 55, 55), (int(cx), int(cy)), int(cr))
-        pygame.draw.circle(surf, (90, 90, 90), (int(cx), int(cy)), int(max(2, cr-6)))
\ No newline at end of file
+        pygame.draw.circle(surf, (90, 90, 90), (int(cx), int(cy)), int(max(2, cr-6)))
+
+def draw_movers(surf, mover_rects):
+    # Desenhar obstáculos móveis (retângulos já avaliados no snapshot do tick)
+    for r in mover_rects:
+        pygame.draw.rect(surf, (75, 75, 75), r, 0, 6)
+        pygame.draw.rect(surf, (120, 120, 120), r.inflate(-6, -6), 0, 6)
+
+def bake_map_layer(background, static_rects, circles):
+    """Camada pré-composta: fundo (imagem + sombra) com os obstáculos estáticos já desenhados"""
+    layer = background.copy()
+    draw_static(layer, static_rects, circles)
+    return layer
\ No newline at end of file
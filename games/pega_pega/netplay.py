@@ -0,0 +1,426 @@
+"""
+Netplay ponto a ponto com rollback (estilo GGPO) para duas cabines.
+
+Cada cabine simula a partida inteira. A entrada local entra com `input_delay`
+ticks de atraso; a do par, enquanto não chega, é prevista (repete a última
+confirmada). Quando a entrada real chega e difere da prevista, a simulação
+volta ao snapshot daquele tick e re-simula até o tick atual.
+
+Pacotes UDP (little-endian):
+
+    "PN" | tipo u8 | ...
+    HELLO: cabeçalho JSON da partida (o do Recording)   READY: vazio
+    INPUT: tick u32 | ack i32 | vantagem i16 | primeiro u32 | n u8 | n máscaras
+           | k u8 | k x (tick u32, hash 8 bytes)
+    BYE:   vazio
+
+Cada INPUT repete todas as entradas locais ainda não confirmadas (`ack`) pelo
+par, então pacotes perdidos não precisam de retransmissão própria.
+"""
+import asyncio
+import hashlib
+import heapq
+import json
+import random
+import socket
+import struct
+import time
+from games.pega_pega.replay import Recording
+
+MAGIC = b"PN"
+HELLO, READY, INPUT, BYE = 1, 2, 3, 4
+PACKET_HEAD = struct.Struct("<2sB")
+INPUT_HEAD = struct.Struct("<IihIB")
+HASH_ENTRY = struct.Struct("<I8s")
+MAX_INPUTS = 255  # Entradas por pacote (n é u8)
+
+# --- Transporte --------------------------------------------------------------
+
+class UdpTransport:
+    """Socket UDP não bloqueante; sem `peer`, o primeiro endereço que falar vira o par"""
+    def __init__(self, bind=("0.0.0.0", 0), peer=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+        self.peer = peer
+
+    @property
+    def address(self):
+        return self.sock.getsockname()
+
+    def send(self, data):
+        if self.peer is not None:
+            self.sock.sendto(data, self.peer)
+
+    def receive(self):
+        """Todos os datagramas pendentes do par"""
+        packets = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return packets
+            except ConnectionResetError:
+                continue  # ICMP de porta fechada (Windows); o par pode ainda não ter aberto
+            if self.peer is None:
+                self.peer = addr
+            if addr == self.peer:
+                packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+class LinkSimulator:
+    """
+    Envolve um transporte e piora os pacotes enviados: latência, jitter
+    (que também reordena) e perda. Para testar o rollback em loopback.
+    """
+    def __init__(self, transport, latency_ms=0, jitter_ms=0, loss=0.0, seed=None,
+                 clock=time.perf_counter):
+        self.transport = transport
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.queue = []
+        self.seq = 0
+
+    @property
+    def address(self):
+        return self.transport.address
+
+    def send(self, data):
+        self.flush()
+        if self.rng.random() < self.loss:
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self.queue, (self.clock() + delay, self.seq, data))
+        self.seq += 1
+
+    def flush(self):
+        now = self.clock()
+        while self.queue and self.queue[0][0] <= now:
+            self.transport.send(heapq.heappop(self.queue)[2])
+
+    def receive(self):
+        self.flush()
+        return self.transport.receive()
+
+    def close(self):
+        self.transport.close()
+
+# --- Pacotes -----------------------------------------------------------------
+
+def encode_input(frame, ack, advantage, first, masks, hashes):
+    parts = [PACKET_HEAD.pack(MAGIC, INPUT),
+             INPUT_HEAD.pack(frame, ack, advantage, first, len(masks)), bytes(masks),
+             bytes([len(hashes)])]
+    parts += [HASH_ENTRY.pack(tick, bytes.fromhex(digest)) for tick, digest in hashes]
+    return b"".join(parts)
+
+def decode_input(data):
+    pos = PACKET_HEAD.size
+    frame, ack, advantage, first, count = INPUT_HEAD.unpack_from(data, pos)
+    pos += INPUT_HEAD.size
+    masks = data[pos:pos + count]
+    pos += count
+    hashes = []
+    for _ in range(data[pos]):
+        tick, digest = HASH_ENTRY.unpack_from(data, pos + 1 + len(hashes) * HASH_ENTRY.size)
+        hashes.append((tick, digest.hex()))
+    return frame, ack, advantage, first, masks, hashes
+
+def packet_type(data):
+    if len(data) < PACKET_HEAD.size:
+        return None
+    magic, kind = PACKET_HEAD.unpack_from(data)
+    return kind if magic == MAGIC else None
+
+def snapshot_hash(snap):
+    """Resumo (hex) de um snapshot() da simulação, comparável entre as duas cabines"""
+    h = hashlib.blake2b(digest_size=8)
+    for name in sorted(snap["arrays"]):
+        h.update(snap["arrays"][name].tobytes())
+    h.update(repr((sorted(snap["scalars"].items()), snap["wins"], snap["powerups"],
+                   snap["map"], snap["movers_t0"], snap["rng"])).encode())
+    return h.hexdigest()
+
+# --- Conexão -----------------------------------------------------------------
+
+def hello_packet(header):
+    return PACKET_HEAD.pack(MAGIC, HELLO) + json.dumps(header).encode("utf-8")
+
+RETRY_S = 0.05  # Intervalo entre tentativas do handshake
+
+def _host_poll(transport, hello):
+    transport.send(hello)
+    return any(packet_type(data) in (READY, INPUT) for data in transport.receive())
+
+def _join_poll(transport):
+    transport.send(PACKET_HEAD.pack(MAGIC, READY))  # Também abre NAT/firewall local
+    for data in transport.receive():
+        if packet_type(data) == HELLO:
+            transport.send(PACKET_HEAD.pack(MAGIC, READY))
+            return json.loads(data[PACKET_HEAD.size:].decode("utf-8"))
+    return None
+
+def host(transport, header, timeout=30.0, pump=None):
+    """
+    Anuncia a partida (HELLO com o cabeçalho) até o par responder READY. Se o
+    HELLO se perder depois disso, a sessão do anfitrião o reenvia a cada READY.
+    """
+    hello = hello_packet(header)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _host_poll(transport, hello):
+            return True
+        if pump:
+            pump()
+        time.sleep(RETRY_S)
+    return False
+
+def join(transport, timeout=30.0, pump=None):
+    """Espera o HELLO do anfitrião, responde READY e devolve o cabeçalho da partida"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        header = _join_poll(transport)
+        if header is not None:
+            return header
+        if pump:
+            pump()
+        time.sleep(RETRY_S)
+    return None
+
+async def host_async(transport, header, timeout=30.0):
+    """host() sem bloquear: o loop principal continua desenhando enquanto espera"""
+    hello = hello_packet(header)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if _host_poll(transport, hello):
+            return True
+        await asyncio.sleep(RETRY_S)
+    return False
+
+async def join_async(transport, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        header = _join_poll(transport)
+        if header is not None:
+            return header
+        await asyncio.sleep(RETRY_S)
+    return None
+
+# --- Sessão ------------------------------------------------------------------
+
+class RollbackSession:
+    """
+    Mantém uma PegaPegaSim de dois jogadores em sincronia com o par.
+
+    advance(mask) é chamado a cada passo fixo com a máscara do jogador local e
+    devolve os eventos do tick simulado (None quando a sessão segura o tick
+    porque está adiantada demais). Só os eventos da primeira simulação de cada
+    tick são devolvidos; re-simulações de rollback não tocam sons de novo.
+
+    A cada `hash_interval` ticks os pares trocam o hash do estado assim que
+    todas as entradas anteriores estão confirmadas; `desync` guarda o primeiro
+    tick em que divergiram.
+    """
+    SYNC_EVERY = 20  # Ticks entre correções de ritmo quando um lado está adiantado
+
+    def __init__(self, sim, local_index, transport, dt, input_delay=2, max_prediction=8,
+                 hash_interval=60):
+        self.sim = sim
+        self.local_index = local_index
+        self.remote_index = 1 - local_index
+        self.transport = transport
+        self.dt = dt
+        self.input_delay = input_delay
+        self.max_prediction = max_prediction
+        self.hash_interval = hash_interval
+
+        self.frame = 0  # Próximo tick a simular
+        self.local_inputs = {tick: 0 for tick in range(input_delay)}
+        self.last_local = input_delay - 1  # Último tick com entrada local (local_inputs é podado)
+        self.remote_inputs = {}
+        self.remote_confirmed = -1  # Último tick com todas as entradas do par até ele
+        self.predicted = {}  # tick -> máscara prevista para o par
+        self.snapshots = {}  # tick -> estado antes do tick
+        self.rollback_from = None
+
+        self.peer_ack = -1  # Último tick local que o par confirmou ter recebido
+        self.peer_frame = 0
+        self.local_advantage = 0
+        self.remote_advantage = 0
+
+        self.next_hash = 0
+        self.local_hashes = {}
+        self.remote_hashes = {}
+        self.desync = None
+        self.disconnected = False
+        self.last_heard = time.monotonic()
+
+        # A partida confirmada vira uma gravação comum (.ppr)
+        self.recording = Recording.from_sim(sim, dt)
+        self.recorded = 0
+        self.hello = hello_packet(self.recording.header) if local_index == 0 else None
+
+        self.stats = {"rollbacks": 0, "resimulated": 0, "max_depth": 0, "stalls": 0,
+                      "sent": 0, "received": 0}
+
+    # Recebimento
+
+    def poll(self):
+        for data in self.transport.receive():
+            kind = packet_type(data)
+            if kind == INPUT:
+                self.on_input(*decode_input(data))
+            elif kind == HELLO:
+                # Nosso READY se perdeu: o anfitrião ainda está esperando
+                self.transport.send(PACKET_HEAD.pack(MAGIC, READY))
+            elif kind == READY and self.hello:
+                # O convidado ainda não recebeu o cabeçalho
+                self.transport.send(self.hello)
+            elif kind == BYE:
+                self.disconnected = True
+
+    def on_input(self, frame, ack, advantage, first, masks, hashes):
+        self.stats["received"] += 1
+        self.last_heard = time.monotonic()
+        self.peer_frame = max(self.peer_frame, frame)
+        self.peer_ack = max(self.peer_ack, ack)
+        self.remote_advantage = advantage
+        for offset, mask in enumerate(masks):
+            tick = first + offset
+            if tick <= self.remote_confirmed or tick in self.remote_inputs:
+                continue
+            self.remote_inputs[tick] = mask
+            guess = self.predicted.pop(tick, None)
+            if guess is not None and guess != mask:
+                self.rollback_from = tick if self.rollback_from is None else min(self.rollback_from, tick)
+        while self.remote_confirmed + 1 in self.remote_inputs:
+            self.remote_confirmed += 1
+        for tick, digest in hashes:
+            self.remote_hashes[tick] = digest
+            self.check_hash(tick)
+
+    def check_hash(self, tick):
+        mine, theirs = self.local_hashes.get(tick), self.remote_hashes.get(tick)
+        if mine is None or theirs is None:
+            return
+        if mine != theirs and self.desync is None:
+            self.desync = tick
+            print(f"⚠ Dessincronização no tick {tick}: {mine} != {theirs}")
+        del self.remote_hashes[tick]
+
+    # Simulação
+
+    def advance(self, mask):
+        """Um passo fixo: recebe, corrige previsões erradas e simula o próximo tick"""
+        self.poll()
+        self.local_advantage = self.frame - self.peer_frame
+        if self.should_stall():
+            self.stats["stalls"] += 1
+            self.send()
+            return None
+
+        target = self.frame + self.input_delay
+        if target not in self.local_inputs:
+            self.local_inputs[target] = mask
+            self.last_local = max(self.last_local, target)
+
+        self.rollback()
+        events = self.simulate(self.frame)
+        self.frame += 1
+
+        self.hash_confirmed()
+        self.record_confirmed()
+        self.discard_old()
+        self.send()
+        return events
+
+    def should_stall(self):
+        # Sem entradas do par há max_prediction ticks: prever mais só aumentaria o rollback
+        if self.frame - self.remote_confirmed > self.max_prediction:
+            return True
+        # Adiantado em relação ao par: cede um tick de vez em quando para os relógios se alinharem
+        ahead = (self.local_advantage - self.remote_advantage) / 2
+        return ahead >= 1 and self.frame % self.SYNC_EVERY == 0
+
+    def masks_for(self, tick):
+        remote = self.remote_inputs.get(tick)
+        if remote is None:
+            remote = self.remote_inputs.get(self.remote_confirmed, 0)
+            self.predicted[tick] = remote
+        masks = [0, 0]
+        masks[self.local_index] = self.local_inputs[tick]
+        masks[self.remote_index] = remote
+        return masks
+
+    def simulate(self, tick):
+        self.snapshots[tick] = self.sim.snapshot()
+        return self.sim.step(self.masks_for(tick), self.dt)
+
+    def rollback(self):
+        if self.rollback_from is None:
+            return
+        start, self.rollback_from = self.rollback_from, None
+        depth = self.frame - start
+        self.stats["rollbacks"] += 1
+        self.stats["resimulated"] += depth
+        self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+        self.sim.restore(self.snapshots[start])
+        for tick in range(start, self.frame):
+            self.simulate(tick)
+
+    def hash_confirmed(self):
+        """Hash do estado antes de cada tick múltiplo de hash_interval, assim que nada antes dele pode mudar"""
+        tick = self.next_hash
+        while tick <= self.remote_confirmed + 1 and tick < self.frame:
+            self.local_hashes[tick] = snapshot_hash(self.snapshots[tick])
+            self.check_hash(tick)
+            tick += self.hash_interval
+        self.next_hash = tick
+
+    def record_confirmed(self):
+        last = min(self.remote_confirmed, self.frame - 1)
+        while self.recorded <= last:
+            masks = [0, 0]
+            masks[self.local_index] = self.local_inputs[self.recorded]
+            masks[self.remote_index] = self.remote_inputs[self.recorded]
+            self.recording.append(masks)
+            self.recorded += 1
+
+    def discard_old(self):
+        """Esquece o que nenhum rollback ou reenvio vai precisar"""
+        confirmed = min(self.remote_confirmed, self.recorded - 1)
+        for tick in [t for t in self.snapshots if t <= confirmed]:
+            del self.snapshots[tick]
+        for tick in [t for t in self.remote_inputs if t < confirmed]:
+            del self.remote_inputs[tick]
+        keep_local = min(confirmed, self.peer_ack)
+        for tick in [t for t in self.local_inputs if t <= keep_local]:
+            del self.local_inputs[tick]
+        for tick in [t for t in self.local_hashes if t < self.frame - 10 * self.hash_interval]:
+            del self.local_hashes[tick]
+
+    # Envio
+
+    def send(self):
+        first = self.peer_ack + 1
+        # Sem entrada nova além do que o par já confirmou o pacote segue vazio (ack e hashes)
+        last = self.last_local
+        masks = [self.local_inputs[t] for t in range(first, min(last, first + MAX_INPUTS - 1) + 1)]
+        hashes = sorted(self.local_hashes.items())[-2:]
+        self.transport.send(encode_input(self.frame, self.remote_confirmed,
+                                         max(-32768, min(32767, self.local_advantage)),
+                                         first, masks, hashes))
+        self.stats["sent"] += 1
+
+    def connection_lost(self, timeout=5.0):
+        """Par avisou que saiu ou está mudo há `timeout` segundos"""
+        return self.disconnected or time.monotonic() - self.last_heard > timeout
+
+    def close(self):
+        self.transport.send(PACKET_HEAD.pack(MAGIC, BYE))
+        self.transport.close()
@@ -0,0 +1,126 @@
+import json
+import struct
+import time
+from array import array
+from games.pega_pega.simulation import PegaPegaSim
+
+MAGIC = b"PPRP"
+VERSION = 1
+
+def pack_masks(masks, players):
+    """Máscaras de um tick em (players + 1) // 2 bytes: dois jogadores por byte"""
+    packed = [0] * ((players + 1) // 2)
+    for i, mask in enumerate(masks[:players]):
+        packed[i >> 1] |= (mask & 15) << (4 * (i & 1))
+    return packed
+
+def unpack_masks(data, base, players):
+    return [(data[base + (i >> 1)] >> (4 * (i & 1))) & 15 for i in range(players)]
+
+class Recording:
+    """
+    Partida gravada: cabeçalho (semente, relógio inicial, jogadores, dt) e as
+    máscaras de direção de cada tick num array('B'), dois jogadores por byte
+    (4 bits cada). Com o mesmo cabeçalho e as mesmas máscaras a simulação se
+    repete bit a bit.
+    """
+    def __init__(self, header, inputs=None):
+        self.header = header
+        self.players = header["players"]
+        self.stride = (self.players + 1) // 2  # bytes por tick
+        self.inputs = inputs if inputs is not None else array("B")
+
+    @property
+    def ticks(self):
+        return len(self.inputs) // self.stride
+
+    @classmethod
+    def from_sim(cls, sim, dt):
+        """Cabeçalho com tudo o que é preciso para recriar `sim` do zero"""
+        header = {
+            "version": VERSION,
+            "seed": sim.seed,
+            "start_ms": sim.start_ms,
+            "width": sim.width,
+            "height": sim.height,
+            "player1": [sim.player1_name, list(sim.player1_color)],
+            "player2": [sim.player2_name, list(sim.player2_color)],
+            "extra_players": [[name, list(color)] for name, color in sim.extra_players],
+            "players": len(sim.players),
+            "dt": dt,
+        }
+        return cls(header)
+
+    def make_sim(self):
+        """Nova simulação no mesmo estado inicial da gravada"""
+        h = self.header
+        return PegaPegaSim(
+            h["width"], h["height"],
+            h["player1"][0], h["player2"][0],
+            tuple(h["player1"][1]), tuple(h["player2"][1]),
+            seed=h["seed"], start_ms=h["start_ms"],
+            extra_players=[(name, tuple(color)) for name, color in h["extra_players"]]
+        )
+
+    def append(self, masks):
+        """Grava as máscaras de um tick"""
+        self.inputs.extend(pack_masks(masks, self.players))
+
+    def masks(self, tick):
+        """Máscaras de todos os jogadores no tick"""
+        return unpack_masks(self.inputs, tick * self.stride, self.players)
+
+    def save(self, path):
+        header = json.dumps(self.header).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<BI", VERSION, len(header)))
+            f.write(header)
+            self.inputs.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path}: não é um replay do Pega-Pega")
+        version, size = struct.unpack_from("<BI", data, 4)
+        if version != VERSION:
+            raise ValueError(f"{path}: versão de replay {version} não suportada")
+        start = 4 + struct.calcsize("<BI")
+        header = json.loads(data[start:start + size].decode("utf-8"))
+        inputs = array("B")
+        inputs.frombytes(data[start + size:])
+        return cls(header, inputs)
+
+class ReplayPlayer:
+    """Devolve, tick a tick, as máscaras gravadas (None quando a gravação acaba)"""
+    def __init__(self, recording):
+        self.recording = recording
+        self.tick = 0
+
+    @property
+    def finished(self):
+        return self.tick >= self.recording.ticks
+
+    def next_masks(self):
+        if self.finished:
+            return None
+        masks = self.recording.masks(self.tick)
+        self.tick += 1
+        return masks
+
+def run_replay(recording, sim=None):
+    """Reexecuta a gravação inteira sem janela, o mais rápido possível; devolve a simulação"""
+    sim = sim or recording.make_sim()
+    dt = recording.header["dt"]
+    for tick in range(recording.ticks):
+        sim.step(recording.masks(tick), dt)
+    return sim
+
+def verify(recording):
+    """Reexecuta e compara com o hash final gravado; devolve (ok, hash, segundos)"""
+    t = time.perf_counter()
+    sim = run_replay(recording)
+    digest = sim.state_hash()
+    expected = recording.header.get("final_hash")
+    return expected is None or digest == expected, digest, time.perf_counter() - t
@@ -0,0 +1,285 @@
+"""
+Arquivo de replay indexado (.ppra).
+
+    "PPRA" | versão u8 | tamanho u32 | cabeçalho JSON
+    blocos: keyframe (snapshot completo, zlib) + entradas do bloco (delta)
+    índice: uma entrada por bloco (tick inicial, ticks, offsets e tamanhos)
+    trailer JSON (ticks, hash final, placar)
+    rodapé: offset e tamanho do índice e do trailer | "PPRE"
+
+O leitor mapeia o arquivo com mmap, lê só cabeçalho, rodapé e índice, e para ir
+a um tick restaura o keyframe do bloco e simula apenas o trecho até ele.
+"""
+import bisect
+import json
+import mmap
+import struct
+import zlib
+import numpy as np
+from games.pega_pega.entity_store import EntityStore
+from games.pega_pega.replay import Recording, pack_masks, unpack_masks
+
+MAGIC = b"PPRA"
+END_MAGIC = b"PPRE"
+VERSION = 1
+HEAD = struct.Struct("<4sBI")
+FOOTER = struct.Struct("<QIQI4s")
+INDEX_DTYPE = np.dtype([("tick", "<u4"), ("ticks", "<u4"),
+                        ("key_off", "<u8"), ("key_len", "<u4"),
+                        ("in_off", "<u8"), ("in_len", "<u4")])
+
+# --- Keyframes ---------------------------------------------------------------
+
+def encode_snapshot(snap):
+    """snapshot() do PegaPegaSim -> bytes (metadados JSON + arrays e estado do RNG binários)"""
+    version, internal, gauss = snap["rng"]
+    meta = {
+        "scalars": snap["scalars"], "wins": snap["wins"], "powerups": snap["powerups"],
+        "map": snap["map"], "movers_t0": snap["movers_t0"], "history": snap["history"],
+        "count": len(snap["arrays"]["x"]), "rng": [version, gauss],
+    }
+    meta = json.dumps(meta).encode("utf-8")
+    parts = [struct.pack("<I", len(meta)), meta, np.array(internal, dtype="<u4").tobytes()]
+    parts += [snap["arrays"][name].tobytes() for name in EntityStore.FIELDS]
+    return zlib.compress(b"".join(parts))
+
+def decode_snapshot(data):
+    data = zlib.decompress(data)
+    (size,) = struct.unpack_from("<I", data)
+    meta = json.loads(data[4:4 + size].decode("utf-8"))
+    pos = 4 + size
+    internal = np.frombuffer(data, dtype="<u4", count=625, offset=pos)
+    pos += internal.nbytes
+    n = meta["count"]
+    arrays = {}
+    for name, dtype in EntityStore.FIELDS.items():
+        arr = np.frombuffer(data, dtype=dtype, count=n, offset=pos)
+        arrays[name] = arr
+        pos += arr.nbytes
+    version, gauss = meta["rng"]
+    return {
+        "scalars": meta["scalars"], "wins": meta["wins"],
+        "powerups": [tuple(pu) for pu in meta["powerups"]],
+        "map": meta["map"], "movers_t0": meta["movers_t0"], "history": meta["history"],
+        "arrays": arrays, "rng": (version, tuple(int(v) for v in internal), gauss),
+    }
+
+# --- Entradas (delta) --------------------------------------------------------
+# Cada tick é XOR com o anterior; ticks sem mudança viram um contador (varint).
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _read_varint(buf, pos):
+    value = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        value |= (b & 0x7F) << shift
+        if b < 0x80:
+            return value, pos
+        shift += 7
+
+def encode_inputs(rows, stride):
+    """Bytes empacotados de vários ticks -> (ticks repetidos, XOR do tick que mudou)..."""
+    out = bytearray()
+    prev = bytes(stride)
+    skip = 0
+    for base in range(0, len(rows), stride):
+        cur = bytes(rows[base:base + stride])
+        if cur == prev:
+            skip += 1
+            continue
+        _write_varint(out, skip)
+        out += bytes(a ^ b for a, b in zip(cur, prev))
+        prev = cur
+        skip = 0
+    return bytes(out)
+
+def decode_inputs(buf, stride, ticks):
+    out = bytearray()
+    prev = bytes(stride)
+    pos = 0
+    total = ticks * stride
+    while pos < len(buf):
+        skip, pos = _read_varint(buf, pos)
+        out += prev * skip
+        prev = bytes(a ^ b for a, b in zip(buf[pos:pos + stride], prev))
+        pos += stride
+        out += prev
+    out += prev * ((total - len(out)) // stride)
+    return bytes(out)
+
+# --- Escrita -----------------------------------------------------------------
+
+class ArchiveWriter:
+    """
+    Grava a partida em blocos: chame record(sim, masks) antes de cada sim.step
+    e close(sim) no fim. A cada `keyframe_interval` ticks abre um bloco novo com
+    o snapshot completo do estado.
+    """
+    def __init__(self, path, header, keyframe_interval=600):
+        self.header = dict(header, format="ppra", keyframe_interval=keyframe_interval)
+        self.players = header["players"]
+        self.stride = (self.players + 1) // 2
+        self.interval = keyframe_interval
+        self.file = open(path, "wb")
+        meta = json.dumps(self.header).encode("utf-8")
+        self.file.write(HEAD.pack(MAGIC, VERSION, len(meta)))
+        self.file.write(meta)
+        self.index = []
+        self.tick = 0
+        self.block_start = 0
+        self.block_key = None
+        self.block_rows = bytearray()
+
+    def record(self, sim, masks):
+        if self.tick % self.interval == 0:
+            self._flush()
+            self.block_start = self.tick
+            self.block_key = encode_snapshot(sim.snapshot())
+        self.block_rows += bytes(pack_masks(masks, self.players))
+        self.tick += 1
+
+    def _flush(self):
+        if self.block_key is None:
+            return
+        f = self.file
+        key_off = f.tell()
+        f.write(self.block_key)
+        inputs = encode_inputs(self.block_rows, self.stride)
+        in_off = f.tell()
+        f.write(inputs)
+        self.index.append((self.block_start, self.tick - self.block_start,
+                           key_off, len(self.block_key), in_off, len(inputs)))
+        self.block_key = None
+        self.block_rows = bytearray()
+
+    def close(self, sim):
+        self._flush()
+        f = self.file
+        index_off = f.tell()
+        f.write(np.array(self.index, dtype=INDEX_DTYPE).tobytes())
+        trailer = json.dumps({
+            "ticks": self.tick,
+            "final_hash": sim.state_hash(),
+            "wins": list(sim.wins),
+            "winner_msg": sim.winner_msg,
+            "game_state": sim.game_state,
+        }).encode("utf-8")
+        trailer_off = f.tell()
+        f.write(trailer)
+        f.write(FOOTER.pack(index_off, len(self.index), trailer_off, len(trailer), END_MAGIC))
+        f.close()
+
+def write_archive(recording, path, keyframe_interval=600):
+    """Converte uma Recording (.ppr) no arquivo indexado, re-simulando para tirar os keyframes"""
+    sim = recording.make_sim()
+    dt = recording.header["dt"]
+    writer = ArchiveWriter(path, recording.header, keyframe_interval)
+    for tick in range(recording.ticks):
+        masks = recording.masks(tick)
+        writer.record(sim, masks)
+        sim.step(masks, dt)
+    writer.close(sim)
+    return sim
+
+# --- Leitura -----------------------------------------------------------------
+
+class ReplayArchive:
+    """Leitor com acesso aleatório por mmap; nada além de cabeçalho, rodapé e índice é lido na abertura"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size = HEAD.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: não é um arquivo de replay indexado")
+        if version != VERSION:
+            raise ValueError(f"{path}: versão {version} não suportada")
+        self.header = json.loads(self.mm[HEAD.size:HEAD.size + size].decode("utf-8"))
+
+        index_off, count, trailer_off, trailer_len, end = FOOTER.unpack_from(self.mm, len(self.mm) - FOOTER.size)
+        if end != END_MAGIC:
+            raise ValueError(f"{path}: arquivo incompleto (sem rodapé)")
+        self.trailer = json.loads(self.mm[trailer_off:trailer_off + trailer_len].decode("utf-8"))
+        self.index = np.frombuffer(self.mm, dtype=INDEX_DTYPE, count=count, offset=index_off)
+        self.block_ticks = self.index["tick"].tolist()
+        self.players = self.header["players"]
+        self.stride = (self.players + 1) // 2
+        self.dt = self.header["dt"]
+
+    @property
+    def ticks(self):
+        return self.trailer["ticks"]
+
+    def close(self):
+        self.index = None
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def block_of(self, tick):
+        """Índice do bloco que contém o tick"""
+        if not 0 <= tick < self.ticks:
+            raise IndexError(f"tick {tick} fora da gravação (0..{self.ticks - 1})")
+        return bisect.bisect_right(self.block_ticks, tick) - 1
+
+    def keyframe(self, block):
+        entry = self.index[block]
+        off, size = int(entry["key_off"]), int(entry["key_len"])
+        return decode_snapshot(self.mm[off:off + size])
+
+    def block_inputs(self, block):
+        entry = self.index[block]
+        off, size = int(entry["in_off"]), int(entry["in_len"])
+        return decode_inputs(self.mm[off:off + size], self.stride, int(entry["ticks"]))
+
+    def masks(self, start, end):
+        """Máscaras dos ticks [start, end), decodificando só os blocos necessários"""
+        result = []
+        tick = start
+        while tick < end:
+            block = self.block_of(tick)
+            first = self.block_ticks[block]
+            rows = self.block_inputs(block)
+            last = min(end, first + int(self.index[block]["ticks"]))
+            for t in range(tick, last):
+                result.append(unpack_masks(rows, (t - first) * self.stride, self.players))
+            tick = last
+        return result
+
+    def make_sim(self):
+        return Recording(self.header).make_sim()
+
+    def seek(self, tick, sim=None):
+        """
+        Simulação no estado de antes do tick: keyframe do bloco + só o trecho que
+        falta. tick == ticks dá o estado final (depois do último tick gravado).
+        """
+        if not 0 <= tick <= self.ticks:
+            raise ValueError(f"tick {tick} fora da gravação (0..{self.ticks})")
+        sim = sim or self.make_sim()
+        if self.ticks == 0:
+            return sim
+        # O estado final não tem bloco próprio: parte do último e simula até o fim
+        block = self.block_of(min(tick, self.ticks - 1))
+        sim.restore(self.keyframe(block))
+        for masks in self.masks(self.block_ticks[block], tick):
+            sim.step(masks, self.dt)
+        return sim
+
+def scan(paths):
+    """Percorre muitos arquivos lendo só cabeçalho e trailer; gera (caminho, cabeçalho, trailer)"""
+    for path in paths:
+        with ReplayArchive(path) as archive:
+            yield path, archive.header, archive.trailer
@@ -0,0 +1,499 @@
+import hashlib
+import math
+import random
+import numpy as np
+import pygame
+from games.pega_pega.entities import Player, PowerUp, spawn_powerup, apply_powerup
+from games.pega_pega.entity_store import EntityStore
+from games.pega_pega.maps import get_map, MoverBank
+from games.pega_pega.ai import NavGrid
+from utils.collision import CollisionWorld
+from utils.distance_field import DistanceField, circles_clear_of_boxes
+from utils.tracing import traced
+
+# Passos de simulação por segundo do jogo (main.py) e, por padrão, das ferramentas headless
+SIM_HZ = 120
+
+class PegaPegaSim:
+    """
+    Núcleo headless do Pega-Pega: movimento, colisões, power-ups, troca de mapa e rounds.
+
+    Não usa janela, teclado nem mixer. O tempo vem de um relógio virtual (ms) avançado
+    por step() e as entradas são máscaras de direção (UP/DOWN/LEFT/RIGHT) injetadas por
+    jogador. Sons e efeitos ficam a cargo de quem consome a lista de eventos do tick.
+
+    Os participantes vivem num EntityStore: além dos dois jogadores do teclado,
+    `extra_players` aceita (nome, cor) de participantes sem teclas (bots, rede),
+    para partidas com 8 a 32 jogadores.
+
+    `navs` (dicionário) permite que partidas jogadas uma depois da outra no
+    mesmo processo compartilhem as grades de navegação dos bots e os campos já
+    calculados nelas.
+    """
+    def __init__(self, width, height, player1_name="Player 1", player2_name="Player 2",
+                 player1_color=(255, 109, 106), player2_color=(92, 225, 230),
+                 seed=None, start_ms=0, extra_players=(), navs=None):
+        self.width = width
+        self.height = height
+        self.player1_name = player1_name
+        self.player2_name = player2_name
+        self.player1_color = player1_color
+        self.player2_color = player2_color
+        self.extra_players = list(extra_players)
+
+        # Relógio virtual e RNG próprios (nada de get_ticks ou random global); a semente
+        # é sempre concreta para que a partida possa ser gravada e reproduzida
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.start_ms = start_ms
+        self.now = start_ms
+        self.prev_now = start_ms  # Instante do tick anterior (interpolação dos movers)
+        self.events = []
+
+        # Configurações do jogo
+        self.ROUND_MS = 60 * 1000
+        self.COOLDOWN = 500
+        self.round_idx = 1
+        self.wins = [0] * (2 + len(self.extra_players))
+        self.winner_msg = ""
+        self.game_state = "PLAYING"
+        self.MOVER_LUT_SIZE = 0  # > 0 troca o seno dos movers por uma tabela periódica
+        self.history = []  # Resultado de cada round (placar final e vencedor)
+
+        # Balanceamento dos power-ups (ajustável pelo simulador de balanceamento)
+        self.SPEED_MUL = 1.6
+        self.SPEED_MS = 3000
+        self.FREEZE_MS = 2000
+        self.TELEPORT_DIST = 250
+        self.PU_SPAWN_MS = (3000, 6000)  # Intervalo entre spawns
+
+        # Inicializa mapa e jogadores (grade de colisão e campo de distância são refeitos
+        # a cada mapa; a grade de navegação dos bots fica guardada por geometria e volta
+        # pronta quando o mapa se repete)
+        self.world = CollisionWorld()
+        self.field = DistanceField(width, height)
+        self.navs = {} if navs is None else navs
+        self.current_map = "original"
+        self.load_map()
+        self.initialize_players()
+
+        # Power-ups
+        self.powerups = []
+        self.world.clear_items()
+        self.next_pu = 0
+
+        # Transição de mapa
+        self.map_transition_timer = self.now
+        self.MAP_TRANSITION_TIME = 15000  # 15 segundos entre trocas
+        self.transition_warning_start = 5000  # 5 segundos antes começa a piscar
+        self.transition_warning = False  # Controla a piscada da tela
+        self.warning_alpha = 0  # Alpha para o efeito de piscada
+
+        # Inicia primeiro round
+        self.reset_round()
+
+    def initialize_players(self):
+        """Inicializa os jogadores com as configurações do menu"""
+        self.store = EntityStore(2 + len(self.extra_players))
+        self.players = []
+
+        self.players.append(Player(
+            x=self.width * 0.25, y=self.height * 0.55, r=22,
+            color=self.player1_color, vel=300.0,
+            keys={"up": pygame.K_w, "down": pygame.K_s,
+                  "left": pygame.K_a, "right": pygame.K_d},
+            name=self.player1_name, store=self.store
+        ))
+
+        self.players.append(Player(
+            x=self.width * 0.75, y=self.height * 0.55, r=22,
+            color=self.player2_color, vel=300.0,
+            keys={"up": pygame.K_UP, "down": pygame.K_DOWN,
+                  "left": pygame.K_LEFT, "right": pygame.K_RIGHT},
+            name=self.player2_name, store=self.store
+        ))
+
+        # Participantes extras não leem teclado: as máscaras vêm de fora
+        for i, (name, color) in enumerate(self.extra_players):
+            side = 0.25 if i % 2 == 0 else 0.75
+            self.players.append(Player(
+                x=self.width * side, y=self.height * 0.55, r=22,
+                color=color, vel=300.0, keys=None,
+                name=name, store=self.store
+            ))
+
+    @property
+    def p1(self):
+        return self.players[0]
+
+    @property
+    def p2(self):
+        return self.players[1]
+
+    def it_index(self):
+        """Índice do pegador atual"""
+        return int(np.argmax(self.store.view("is_it")))
+
+    @traced("PegaPegaSim.load_map", cat="map")
+    def load_map(self):
+        """Carrega o mapa atual"""
+        self.apply_map(get_map(self.current_map, self.width, self.height, rng=self.rng))
+
+    def apply_map(self, map_data):
+        """Instala a geometria de um mapa (dicionário no formato de get_map) e refaz as grades"""
+        self.static_rects = map_data["static_rects"]
+        self.circles = map_data["circles"]
+        self.movers = map_data["movers"]
+        self.mover_bank = MoverBank(self.movers, self.MOVER_LUT_SIZE)
+        self.world.set_static(self.static_rects, self.circles)
+        self.field.set_static(self.static_rects, self.circles)
+        key = (self.width, self.height, tuple(tuple(rect) for rect in self.static_rects),
+               tuple(self.circles))
+        self.nav = self.navs.get(key)
+        if self.nav is None:
+            self.nav = self.navs[key] = NavGrid(self.field, radius=22)
+        self.update_movers()
+        self.prev_mover_snapshot = self.mover_snapshot
+
+    def update_movers(self):
+        """Avalia todos os movers uma única vez no tick e atualiza grades e campo de distância"""
+        self.mover_snapshot = self.mover_bank.evaluate(self.now)
+        self.mover_rects = MoverBank.to_rects(self.mover_snapshot)
+        self.world.update_movers(self.mover_rects)
+        self.field.set_movers(self.mover_rects)
+        self.nav.update_movers(self.mover_rects)
+
+    def emit(self, name):
+        """Registra um evento do tick (ex.: 'hit', 'tag') para a camada de apresentação"""
+        self.events.append(name)
+
+    def step(self, inputs, dt):
+        """Avança a simulação em dt segundos com as máscaras de direção de cada jogador"""
+        self.events = []
+        self.prev_now = self.now
+        self.prev_mover_snapshot = self.mover_snapshot
+        self.store.snap()
+        if self.game_state != "PLAYING":
+            return self.events
+
+        self.now += dt * 1000
+        now = self.now
+        elapsed = now - self.start_ticks
+        self.remain = self.ROUND_MS - elapsed
+
+        # Verifica transição de mapa e avisos
+        time_until_transition = self.MAP_TRANSITION_TIME - (now - self.map_transition_timer)
+
+        # Ativa aviso de transição (piscada) nos últimos 5 segundos
+        self.transition_warning = time_until_transition <= self.transition_warning_start
+
+        # Controla o alpha para o efeito de piscada
+        if self.transition_warning:
+            # Pisca a cada 500ms (0.5 segundos)
+            self.warning_alpha = 100 if (now // 500) % 2 == 0 else 0
+
+        # Executa a transição de mapa
+        if time_until_transition <= 0:
+            self.switch_map()
+
+        # Atualiza obstáculos móveis
+        for mover in self.movers:
+            mover.update()
+        self.update_movers()
+
+        # Spawn de power-ups
+        if now >= self.next_pu and len(self.powerups) < 3:
+            spawn_powerup(self.powerups, self.static_rects, self.movers,
+                          self.circles, self.width, self.height, now=now, rng=self.rng,
+                          world=self.world, field=self.field)
+            self.next_pu = now + self.rng.randint(*self.PU_SPAWN_MS)
+
+        # Movimento dos jogadores
+        self.update_players(inputs, dt)
+
+        # Verifica colisões entre jogadores
+        self.check_player_collision(now)
+
+        # Verifica power-ups
+        self.check_powerups()
+
+        # Verifica fim do round
+        if self.remain <= 0:
+            self.end_round()
+
+        return self.events
+
+    def render_time(self, alpha=1.0):
+        """Relógio interpolado entre o tick anterior e o atual"""
+        return self.prev_now + (self.now - self.prev_now) * alpha
+
+    def mover_rects_at(self, alpha=1.0):
+        """Retângulos dos movers interpolados entre os snapshots dos dois últimos ticks"""
+        prev, cur = self.prev_mover_snapshot, self.mover_snapshot
+        if alpha >= 1.0 or prev.shape != cur.shape:
+            return self.mover_rects
+        return MoverBank.to_rects(prev + ((cur - prev) * alpha).astype(cur.dtype))
+
+    def state_hash(self):
+        """Resumo (hex) do estado da partida; execuções idênticas dão o mesmo valor"""
+        h = hashlib.blake2b(digest_size=8)
+        n = self.store.count
+        for name in EntityStore.FIELDS:
+            h.update(getattr(self.store, name)[:n].tobytes())
+        h.update(repr((self.now, self.game_state, self.round_idx, self.wins, self.current_map,
+                       self.tag_until, self.next_pu, self.map_transition_timer,
+                       [(pu.kind, pu.x, pu.y) for pu in self.powerups])).encode())
+        h.update(repr(self.rng.getstate()).encode())
+        return h.hexdigest()
+
+    # Escalares que, junto com arrays, power-ups, RNG e movers, formam o estado da partida
+    SNAPSHOT_FIELDS = ("now", "prev_now", "round_idx", "winner_msg", "game_state", "start_ticks",
+                       "remain", "tag_until", "next_pu", "map_transition_timer",
+                       "transition_warning", "warning_alpha")
+
+    def snapshot(self):
+        """Cópia compacta de todo o estado da partida (para keyframes e rollback)"""
+        n = self.store.count
+        return {
+            "scalars": {name: getattr(self, name) for name in self.SNAPSHOT_FIELDS},
+            "wins": list(self.wins),
+            "arrays": {name: getattr(self.store, name)[:n].copy() for name in EntityStore.FIELDS},
+            "powerups": [(pu.kind, pu.x, pu.y) for pu in self.powerups],
+            "rng": self.rng.getstate(),
+            "map": self.current_map,
+            "movers_t0": [m.t0 for m in self.movers],
+            "history": [dict(rnd) for rnd in self.history],
+        }
+
+    def restore(self, snap):
+        """Volta exatamente ao estado de um snapshot() desta mesma partida"""
+        for name, value in snap["scalars"].items():
+            setattr(self, name, value)
+        self.wins = list(snap["wins"])
+        self.history = [dict(rnd) for rnd in snap["history"]]
+
+        # Geometria: só é refeita se o mapa (ou a fase dos movers) for outro
+        if snap["map"] != self.current_map or [m.t0 for m in self.movers] != snap["movers_t0"]:
+            self.current_map = snap["map"]
+            map_data = get_map(self.current_map, self.width, self.height, rng=random.Random(0))
+            for mover, t0 in zip(map_data["movers"], snap["movers_t0"]):
+                mover.t0 = t0
+            self.apply_map(map_data)
+        self.update_movers()
+        self.prev_mover_snapshot = self.mover_snapshot
+
+        n = self.store.count
+        for name, values in snap["arrays"].items():
+            getattr(self.store, name)[:n] = values
+
+        self.powerups = []
+        self.world.clear_items()
+        for kind, x, y in snap["powerups"]:
+            pu = PowerUp(kind, (x, y))
+            self.powerups.append(pu)
+            self.world.add_item(pu, x, y, 14)
+
+        self.rng.setstate(snap["rng"])
+        self.events = []
+
+    def run(self, input_fn, ticks, dt):
+        """Executa até `ticks` passos; input_fn(sim) devolve as máscaras de cada tick"""
+        for i in range(ticks):
+            if self.game_state != "PLAYING":
+                return i
+            self.step(input_fn(self), dt)
+        return ticks
+
+    @traced("PegaPegaSim.switch_map", cat="map")
+    def switch_map(self):
+        """Alterna entre mapas"""
+        self.current_map = "novo_mapa" if self.current_map == "original" else "original"
+        self.load_map()
+        self.map_transition_timer = self.now
+
+        # Quem ficou dentro da geometria nova é empurrado para a área livre mais próxima
+        for player in self.players:
+            if self.world.circle_hits(player.x, player.y, player.r):
+                player.x, player.y = self.field.push_out(player.x, player.y, player.r)
+            player.snap()
+
+    def reposition_players(self):
+        """Reposiciona jogadores no novo mapa"""
+        self.update_movers()
+        placed = []
+        for i, player in enumerate(self.players):
+            side = "left" if i % 2 == 0 else "right"
+            # Com muitos participantes, evita nascer em cima de outro
+            for _ in range(8):
+                x, y = self.find_safe_spawn(side, player.r)
+                if all(math.hypot(x - px, y - py) > player.r + pr for px, py, pr in placed):
+                    break
+            player.x, player.y = x, y
+            placed.append((x, y, player.r))
+        self.store.snap()
+
+    def find_safe_spawn(self, side, radius):
+        """Sorteia uma posição livre no lado pedido direto do campo de distância"""
+        if side == "left":
+            x_range = (80, int(self.width * 0.40))
+        else:
+            x_range = (int(self.width * 0.60), self.width - 80)
+
+        pos = self.field.sample_free(self.rng, radius, (x_range[0], 110, x_range[1], self.height - 80))
+        if pos is not None:
+            return pos
+
+        # Fallback
+        if side == "left":
+            return self.width * 0.25, self.height * 0.5
+        else:
+            return self.width * 0.75, self.height * 0.5
+
+    def update_players(self, inputs, dt):
+        """Atualiza movimento dos jogadores (vetorizado; colisão fina só para quem precisa)"""
+        now = self.now
+        store = self.store
+        n = store.count
+        masks = list(inputs)[:n]
+        masks += [0] * (n - len(masks))
+
+        vx, vy = store.velocities(masks, now)
+        dx, dy = vx * dt, vy * dt
+        x, y, r = store.view("x"), store.view("y"), store.view("r")
+        nx = np.minimum(np.maximum(x + dx, r), self.width - r)
+        ny = np.minimum(np.maximum(y + dy, r), self.height - r)
+
+        # Broadphase: com folga no destino maior que raio + passo, o caminho eixo a eixo
+        # está livre e a posição é aceita direto; o resto passa pelo move_collide
+        step = np.hypot(dx, dy)
+        reach = r + step
+        safe = self.field.static_clearance(nx, ny) - self.field.slack > reach
+        safe &= circles_clear_of_boxes(nx, ny, reach, self.mover_snapshot)
+        x[safe] = nx[safe]
+        y[safe] = ny[safe]
+
+        arena = pygame.Rect(0, 0, self.width, self.height)
+        hits = False
+        for i in np.flatnonzero(~safe & (step > 0)):
+            hits |= self.players[i].move_collide(dx[i], dy[i], arena, world=self.world)
+
+        # Efeito sonoro de colisão
+        if hits:
+            self.emit("hit")
+
+        # Atualiza timers de power-ups e scores
+        store.expire_timers(now)
+        store.add_score(dt)
+
+    def check_player_collision(self, now):
+        """Verifica se o pegador encostou em alguém (o mais próximo, se vários)"""
+        if now < self.tag_until:
+            return
+
+        it = self.it_index()
+        touching = np.flatnonzero(self.store.contacts()[it])
+        if len(touching) == 0:
+            return
+
+        d = self.store.distance_matrix()[it]
+        chaser = self.players[it]
+        runner = self.players[int(touching[np.argmin(d[touching])])]
+
+        if runner.shield:
+            runner.shield = 0
+        else:
+            # Troca de pegador
+            chaser.is_it, runner.is_it = False, True
+            self.emit("tag")
+
+            # Efeito de repulsão
+            dx = runner.x - chaser.x
+            dy = runner.y - chaser.y
+            d = math.hypot(dx, dy) or 1
+            over = (chaser.r + runner.r) - d + 2
+            nx, ny = dx / d, dy / d
+            chaser.x -= nx * over * 0.5
+            chaser.y -= ny * over * 0.5
+            runner.x += nx * over * 0.5
+            runner.y += ny * over * 0.5
+
+        self.tag_until = now + self.COOLDOWN
+
+    def opponent_of(self, who):
+        """Alvo dos power-ups: o pegador para quem foge; o fugitivo mais próximo para o pegador"""
+        if not who.is_it:
+            return self.players[self.it_index()]
+        d = self.store.distance_matrix()[who.idx]
+        d[who.idx] = np.inf
+        return self.players[int(np.argmin(d))]
+
+    def check_powerups(self):
+        """Verifica coleta de power-ups"""
+        # Consulta só os power-ups nas células próximas de cada jogador
+        for who in self.players:
+            for pu in self.world.items_touching(who.x, who.y, who.r):
+                apply_powerup(who, self.opponent_of(who), pu.kind, self.width, self.height,
+                              now=self.now, rng=self.rng, field=self.field,
+                              speed_mul=self.SPEED_MUL, speed_ms=self.SPEED_MS,
+                              freeze_ms=self.FREEZE_MS, teleport_dist=self.TELEPORT_DIST)
+                self.emit("pickup_" + pu.kind)
+                self.powerups.remove(pu)
+                self.world.remove_item(pu)
+
+    def end_round(self):
+        """Finaliza o round atual"""
+        scores = self.store.view("score")
+        best = np.flatnonzero(scores == scores.max())
+        winner = int(best[0]) if len(best) == 1 else None
+        if winner is not None:
+            self.wins[winner] += 1
+        self.history.append({"round": self.round_idx, "map": self.current_map,
+                             "scores": scores.tolist(), "winner": winner})
+
+        self.round_idx += 1
+
+        # Verifica fim do jogo
+        if max(self.wins) == 2 or self.round_idx > 3:
+            self.game_state = "GAME_END"
+            top = max(self.wins)
+            leaders = [i for i, w in enumerate(self.wins) if w == top]
+            if len(leaders) == 1:
+                self.winner_msg = f"Vencedor: {self.players[leaders[0]].name}"
+            else:
+                self.winner_msg = "Empate!"
+        else:
+            # Próximo round
+            self.reset_round()
+
+    @traced("PegaPegaSim.reset_round", cat="round")
+    def reset_round(self):
+        """Reseta para um novo round"""
+        # Reposiciona jogadores
+        self.reposition_players()
+
+        # Reseta estados
+        store = self.store
+        n = store.count
+        store.score[:n] = 0.0
+        store.speed_mul[:n] = 1.0
+        store.speed_until[:n] = 0
+        store.shield[:n] = 0
+        store.frozen_until[:n] = 0
+
+        # Escolhe pegador aleatório
+        store.is_it[:n] = False
+        store.is_it[self.rng.randrange(n)] = True
+
+        self.start_ticks = self.now
+        self.remain = self.ROUND_MS
+        self.tag_until = 0
+        self.powerups = []
+        self.world.clear_items()
+        self.next_pu = self.start_ticks + self.rng.randint(1500, 3000)
+        self.game_state = "PLAYING"
+
+        # Reseta timer de transição de mapa
+        self.map_transition_timer = self.now
+        self.transition_warning = False
@@ -0,0 +1,107 @@
+import importlib
+import pkgutil
+import sys
+
+class GameInfo:
+    """
+    Ficha de um jogo da cabine, lida do dicionário GAME no __init__ do pacote.
+
+    Só metadados: nome, textos e cor do cartão no seletor, e `entry`, o
+    "módulo:atributo" que cria o gerenciador do jogo (chamado com tela, largura
+    e altura). O módulo de `entry` só é importado quando o jogo é escolhido.
+    """
+    def __init__(self, package, id, name, entry=None, tagline="", description="",
+                 color=(100, 170, 255), icon="", order=100, coming_soon=False, modules=()):
+        self.package = package
+        self.id = id
+        self.name = name
+        self.entry = entry
+        self.tagline = tagline
+        self.description = description
+        self.color = tuple(color)
+        self.icon = icon
+        self.order = order
+        self.coming_soon = coming_soon or entry is None
+        self.modules = list(modules)  # importados junto com `entry` (pré-carga)
+
+    @property
+    def loaded(self):
+        return self.entry is not None and self.entry.split(":")[0] in sys.modules
+
+    def __repr__(self):
+        return f"GameInfo({self.id!r}, {self.package!r})"
+
+class GameRegistry:
+    """
+    Jogos disponíveis, descobertos pelos subpacotes de games/ que declaram GAME.
+
+    Descobrir um jogo importa só o __init__ do pacote, que não deve importar a
+    implementação (ver games/pega_pega/__init__.py); o custo de abrir o seletor
+    não cresce com o tamanho dos jogos. load() importa o jogo escolhido. As
+    subclasses de BaseGame declaradas com `game_id` se registram aqui ao serem
+    importadas (game_class).
+    """
+    def __init__(self, package="games"):
+        self.package = package
+        self.games = None  # id -> GameInfo, na ordem do seletor
+        self.classes = {}  # id -> subclasse de BaseGame já importada
+
+    def discover(self):
+        if self.games is None:
+            root = importlib.import_module(self.package)
+            found = []
+            for module in pkgutil.iter_modules(root.__path__):
+                if not module.ispkg:
+                    continue
+                name = f"{self.package}.{module.name}"
+                try:
+                    meta = getattr(importlib.import_module(name), "GAME", None)
+                except Exception as exc:
+                    print(f"⚠ Jogo {name} ignorado: {type(exc).__name__}: {exc}")
+                    continue
+                if meta is not None:
+                    found.append(GameInfo(name, **meta))
+            found.sort(key=lambda info: (info.order, info.name))
+            self.games = {info.id: info for info in found}
+        return self.games
+
+    def get(self, game_id):
+        return self.discover()[game_id]
+
+    def modules(self, game_id):
+        """Módulos a importar para o jogo (o de `entry` por último)"""
+        info = self.get(game_id)
+        if info.entry is None:
+            return []
+        return info.modules + [info.entry.split(":")[0]]
+
+    def load(self, game_id):
+        """Importa o jogo e devolve a fábrica de `entry`"""
+        info = self.get(game_id)
+        if info.entry is None:
+            raise LookupError(f"{info.name} ainda não tem implementação")
+        module, _, attr = info.entry.partition(":")
+        return getattr(importlib.import_module(module), attr)
+
+    def preload(self, game_id, width, height):
+        """
+        Importa o jogo e, se a fábrica tiver preload(largura, altura), aquece
+        os recursos dele. Feito para a thread de pré-carga; devolve a fábrica.
+        """
+        for name in self.modules(game_id):
+            importlib.import_module(name)
+        factory = self.load(game_id)
+        warm = getattr(factory, "preload", None)
+        if warm is not None:
+            warm(width, height)
+        return factory
+
+    def register_class(self, game_id, cls):
+        self.classes[game_id] = cls
+
+    def game_class(self, game_id):
+        """Subclasse de BaseGame do jogo (None se ainda não foi importada)"""
+        return self.classes.get(game_id)
+
+# Instância global usada pelo seletor (main.py) e por BaseGame
+registry = GameRegistry()
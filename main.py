@@ -1,22 +1,62 @@
+import time
+_T0 = time.perf_counter()  # Início do processo para o relatório de inicialização
+
 import pygame
+_T_PYGAME = time.perf_counter()
 import sys
 import os
-from game_manager import GameManager
+import argparse
+import asyncio
+from utils.startup import startup
+from ui.widgets import get_font, render_text, load_font
+from ui.profiler_overlay import draw_profiler, reset_profiler_panel
+from ui.loading import draw_loading
+from utils.profiler import profiler
+from utils.tracing import tracer
+from utils.assets import assets
+from utils.audio import configure_mixer
+from utils.tasks import tasks
+from utils.scenes import scenes
+from games.registry import registry
+from games.pega_pega.simulation import SIM_HZ
+
+startup.t0 = _T0
+startup.add("pygame", "import", _T0, _T_PYGAME)
+startup.add("main (demais módulos)", "import", _T_PYGAME, time.perf_counter())
+
 
 class ArcadeMultiGames:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, fps=60):
+        # Buffer pequeno no mixer (baixa latência); vale quando o pygame.init adiado abrir o áudio
+        configure_mixer()
+        
+        # Só o necessário para abrir a janela e desenhar o seletor; mixer, fontes
+        # do menu e módulos dos jogos ficam para depois do primeiro frame
+        with startup.step("pygame.display/font"):
+            pygame.display.init()
+            pygame.font.init()
         
         # Configurações básicas
         self.W, self.H = 900, 520
         flags = pygame.SCALED
-        self.screen = pygame.display.set_mode((self.W, self.H), flags)
-        pygame.display.set_caption("Arcade Multi-Games")
+        with startup.step("janela"):
+            self.screen = pygame.display.set_mode((self.W, self.H), flags)
+            pygame.display.set_caption("Arcade Multi-Games")
         self.clock = pygame.time.Clock()
-        self.FPS = 60
+        self.FPS = fps
+        self.frame_cap = fps  # Limite do clock.tick (0 no loop assíncrono, que cadencia sozinho)
+        
+        # Simulação em passo fixo, desacoplada da taxa de desenho
+        self.SIM_HZ = SIM_HZ
+        self.SIM_DT = 1.0 / self.SIM_HZ
+        self.MAX_CATCHUP_STEPS = 8  # Limite de passos por frame (evita espiral da morte)
+        self.accumulator = 0.0
+        self.alpha = 1.0  # Fração do passo para interpolar o desenho
+        profiler.target_fps = fps
         
         # Estados do sistema
         self.running = True
+        self.trace_path = None  # Destino do trace gravado desde o início (--trace)
         self.current_screen = "GAME_SELECTOR"  # GAME_SELECTOR, GAME
         self.selected_game = None
         
@@ -29,27 +69,33 @@ class ArcadeMultiGames:
         self.BLUE = (100, 170, 255)
         self.RED = (255, 100, 100)
         
-        # Fontes
-        self.font_big = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 24)
-        
-        # Jogos disponíveis
-        self.games = {
-            "CORRIDA_MALUCA": {
-                "name": "CORRIDA MALUCA",
-                "description": "Pega-Pega caótico com power-ups!",
-                "color": self.BLUE,
-                "icon": "🏃‍♂️"
-            },
-            "GUERRA_RELAMPAGO": {
-                "name": "GUERRA RELÂMPAGO", 
-                "description": "Modo Mata-Mata competitivo!",
-                "color": self.RED,
-                "icon": "⚔️",
-                "coming_soon": True
-            }
-        }
+        # Fontes do seletor
+        with startup.step("fontes do seletor"):
+            self.font_big = get_font(None, 48)
+            self.font_medium = get_font(None, 36)
+            self.font_small = get_font(None, 24)
+        
+        # Jogos disponíveis: só as fichas GAME dos pacotes; cada jogo é importado
+        # quando escolhido
+        with startup.step("registro de jogos"):
+            self.games = registry.discover()
+        self.layout_game_selector()
+        
+        # Inicialização adiada: uma etapa por frame, a partir do segundo
+        self.deferred = [
+            ("pygame.init (mixer, timer, joystick)", self.init_remaining),
+            ("fontes do menu", self.warm_fonts),
+            ("fundo do menu", self.warm_assets),
+        ]
+        self.startup_report = False
+        self.reported = False
+        
+        # Pré-carga: jogo sob o cursor, gerenciador já montado para ele e jogo
+        # escolhido esperando a pré-carga terminar (tela de carregamento)
+        self.hovered_game = None
+        self.next_manager = None  # (id do jogo, gerenciador)
+        self.loading_game = None
+        self.loading_since = 0
     
     def handle_events(self):
         for event in pygame.event.get():
@@ -64,40 +110,141 @@ class ArcadeMultiGames:
             # Tecla F11 para fullscreen
             if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
                 self.toggle_fullscreen()
-    
-    def handle_game_selector_events(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = event.pos
             
-            # Área do botão Corrida Maluca
-            corrida_rect = pygame.Rect(self.W // 2 - 220, self.H // 2 - 60, 200, 120)
-            # Área do botão Guerra Relâmpago
-            guerra_rect = pygame.Rect(self.W // 2 + 20, self.H // 2 - 60, 200, 120)
+            # Tecla F3 liga/desliga o profiler de frames
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle_profiler()
             
-            if corrida_rect.collidepoint(mouse_pos):
-                self.start_game("CORRIDA_MALUCA")
-            elif guerra_rect.collidepoint(mouse_pos):
-                if not self.games["GUERRA_RELAMPAGO"]["coming_soon"]:
-                    self.start_game("GUERRA_RELAMPAGO")
+            # Tecla F9 inicia/encerra a gravação do trace
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                self.toggle_trace()
+    
+    def handle_game_selector_events(self, event):
+        if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+            # Hit-test pelo índice de retângulos montado uma vez no layout
+            i = pygame.Rect(event.pos, (1, 1)).collidelist(self.selector_rects)
+            if i == -1:
+                return
+            game_id = self.selector_ids[i]
+            if self.games[game_id].coming_soon:
+                return
+            if event.type == pygame.MOUSEMOTION:
+                # Cursor sobre o cartão: o jogo provavelmente é o próximo
+                self.preload_game(game_id)
+            else:
+                self.select_game(game_id)
+    
+    def preload_game(self, game_id):
+        """Importa o jogo e aquece os recursos dele na thread de pré-carga"""
+        # Antes do pygame.init (etapas adiadas) ainda não há mixer nem relógio
+        if not self.deferred:
+            self.hovered_game = game_id
+            if self.next_manager is None or self.next_manager[0] != game_id:
+                scenes.prepare(("game", game_id), lambda: registry.preload(game_id, self.W, self.H))
+    
+    def warm_game(self):
+        """
+        Seletor ocioso e pré-carga do jogo sob o cursor pronta: monta o
+        gerenciador agora (fontes e camadas precisam da thread principal), para
+        o clique ser só uma troca de referência
+        """
+        game_id = self.hovered_game
+        if self.next_manager is not None and self.next_manager[0] == game_id:
+            return False
+        factory = scenes.take(("game", game_id))
+        if factory is None:
+            return False
+        with tracer.span("warm_game", cat="scenes", game=game_id):
+            if self.next_manager is not None:
+                self.next_manager[1].cleanup()
+            manager = factory(self.screen, self.W, self.H)
+            warm = getattr(manager, "warm", None)
+            if warm is not None:
+                warm()
+        self.next_manager = (game_id, manager)
+        return True
+    
+    def update_scenes(self):
+        """Montagem e troca de cenas da pré-carga: uma vez por frame, fora dos passos fixos"""
+        busy = False
+        if self.current_screen == "GAME_SELECTOR" and self.hovered_game:
+            busy = self.warm_game()
+        elif self.current_screen == "LOADING" and scenes.ready(("game", self.loading_game)):
+            self.start_game(self.loading_game)
+            busy = True
+        if busy:
+            # O tempo gasto montando a cena não vira passos de recuperação no próximo frame
+            self.clock.tick()
+    
+    def select_game(self, game_id):
+        """Clique no cartão: troca na hora se a pré-carga terminou; senão mostra a tela de carregamento"""
+        self.run_deferred(all_steps=True)
+        self.preload_game(game_id)
+        if (self.next_manager is not None and self.next_manager[0] == game_id) \
+                or scenes.ready(("game", game_id)):
+            self.start_game(game_id)
+        else:
+            self.loading_game = game_id
+            self.loading_since = pygame.time.get_ticks()
+            self.current_screen = "LOADING"
+    
+    def init_remaining(self):
+        # Inicia o que ainda falta (display e font já estão de pé); o relógio de
+        # pygame.time.get_ticks só começa a contar aqui, antes de qualquer jogo
+        pygame.init()
+        if not pygame.mixer.get_init():
+            print("🔇 Sem áudio")
+    
+    def warm_fonts(self):
+        for size in (22, 30, 34, 46, 64):
+            load_font(size)
+    
+    def warm_assets(self):
+        assets.image("assets/python.png", (self.W, self.H))
+    
+    def run_deferred(self, all_steps=False):
+        """Executa a próxima etapa adiada (ou todas, quando um jogo vai começar já)"""
+        while self.deferred:
+            name, fn = self.deferred.pop(0)
+            with startup.step(name):
+                fn()
+            if not all_steps:
+                break
+        
+        if self.startup_report and not self.reported and not self.deferred:
+            self.reported = True
+            startup.mark("inicialização completa")
+            startup.print_report()
     
     def start_game(self, game_id):
         """Inicia o jogo selecionado"""
-        self.selected_game = game_id
+        info = self.games[game_id]
+        if info.coming_soon:
+            print(f"🚀 {info.name.title()}: em desenvolvimento")
+            return
         
-        if game_id == "CORRIDA_MALUCA":
-            self.game_manager = GameManager(self.screen, self.W, self.H)
+        self.selected_game = game_id
+        self.loading_game = None
+        self.run_deferred(all_steps=True)
+        if self.next_manager is not None and self.next_manager[0] == game_id:
+            self.game_manager = self.next_manager[1]
+            self.next_manager = None
             self.current_screen = "GAME"
-        elif game_id == "GUERRA_RELAMPAGO":
-            # Placeholder para futuro jogo Mata-Mata
-            print("🚀 Iniciando Guerra Relâmpago (Em desenvolvimento)")
-            # self.game_manager = MataMataGameManager(self.screen, self.W, self.H)
-            # self.current_screen = "GAME"
+            return
+        with startup.step(f"carregar {info.id}", "import"):
+            # Com pré-carga agendada espera por ela (importar o mesmo pacote em duas
+            # threads ao mesmo tempo pode cair no detector de deadlock do import)
+            factory = scenes.take(("game", game_id), wait=True) or registry.load(game_id)
+        with startup.step(f"iniciar {info.id}"):
+            self.game_manager = factory(self.screen, self.W, self.H)
+        self.current_screen = "GAME"
     
     def return_to_menu(self):
         """Volta para o seletor de jogos"""
         if self.game_manager:
             self.game_manager.cleanup()
             self.game_manager = None
+        tasks.cancel("game")  # Ex.: handshake de rede ainda esperando o par
         self.current_screen = "GAME_SELECTOR"
         self.selected_game = None
     
@@ -109,79 +256,119 @@ class ArcadeMultiGames:
         else:
             self.screen = pygame.display.set_mode((self.W, self.H), pygame.SCALED | pygame.FULLSCREEN)
         
+        # Superfícies convertidas para o modo anterior podem não casar com o novo formato
+        assets.reconvert()
+        self.selector_layer = None
         if self.game_manager:
             self.game_manager.update_screen(self.screen)
+        if self.next_manager is not None:
+            self.next_manager[1].update_screen(self.screen)
+    
+    def toggle_profiler(self):
+        """Liga/desliga o painel de tempos por fase"""
+        profiler.toggle()
+        reset_profiler_panel()
+        # O painel some/aparece sobre o jogo: a tela inteira precisa ser refeita
+        if self.game_manager and self.game_manager.current_game:
+            self.game_manager.current_game.invalidate()
+    
+    def toggle_trace(self, path=None):
+        """Começa a gravar o trace ou, se já gravando, salva em JSON (chrome://tracing / Perfetto)"""
+        if not tracer.enabled:
+            tracer.start()
+            print("⏺ Gravando trace (F9 para salvar)")
+            return None
+        tracer.stop()
+        path = path or time.strftime("trace-%Y%m%d-%H%M%S.json")
+        count = tracer.dump(path)
+        print(f"💾 Trace salvo em {path} ({count} eventos)")
+        return path
+    
+    def layout_game_selector(self, card=(200, 120), gap=40):
+        """
+        Posição de cada cartão do seletor, calculada uma vez: uma grade
+        centralizada com quantas colunas couberem na largura da tela
+        """
+        self.selector_ids = list(self.games)
+        count = len(self.selector_ids)
+        cols = max(1, min(count, (self.W - gap) // (card[0] + gap)))
+        rows = (count + cols - 1) // cols
+        # Centralizada na tela, mas sem subir por cima do título e do subtítulo
+        top = max(180, self.H // 2 - (rows * card[1] + (rows - 1) * gap) // 2)
+        self.selector_rects = []
+        for i in range(count):
+            row, col = divmod(i, cols)
+            in_row = min(cols, count - row * cols)  # a última linha pode ter menos cartões
+            left = self.W // 2 - (in_row * card[0] + (in_row - 1) * gap) // 2
+            self.selector_rects.append(pygame.Rect(
+                left + col * (card[0] + gap), top + row * (card[1] + gap), card[0], card[1]))
+        self.selector_layer = None
     
     def draw_game_selector(self):
-        """Desenha a tela de seleção de jogos"""
+        """Desenha a tela de seleção de jogos (nada nela muda: é uma camada pronta)"""
+        if self.selector_layer is None:
+            self.selector_layer = self.build_selector_layer()
+        self.screen.blit(self.selector_layer, (0, 0))
+    
+    def build_selector_layer(self):
+        layer = pygame.Surface((self.W, self.H)).convert()
+        
         # Fundo
-        self.screen.fill(self.BG)
+        layer.fill(self.BG)
         
         # Título
-        title = self.font_big.render("ARCADE MULTI-GAMES", True, self.WHITE)
-        self.screen.blit(title, (self.W // 2 - title.get_width() // 2, 80))
+        title = render_text(self.font_big, "ARCADE MULTI-GAMES", True, self.WHITE)
+        layer.blit(title, (self.W // 2 - title.get_width() // 2, 80))
         
         # Subtítulo
-        subtitle = self.font_small.render("Selecione seu jogo favorito!", True, (200, 200, 200))
-        self.screen.blit(subtitle, (self.W // 2 - subtitle.get_width() // 2, 140))
-        
-        # Botão Corrida Maluca
-        corrida_rect = pygame.Rect(self.W // 2 - 220, self.H // 2 - 60, 200, 120)
-        corrida_color = self.games["CORRIDA_MALUCA"]["color"]
-        corrida_hover = self.is_mouse_over(corrida_rect)
-        
-        pygame.draw.rect(self.screen, corrida_color, corrida_rect, border_radius=15)
-        pygame.draw.rect(self.screen, self.WHITE, corrida_rect, 3, border_radius=15)
-        
-        # Ícone e texto
-        icon = self.font_medium.render("🏃‍♂️", True, self.WHITE)
-        self.screen.blit(icon, (corrida_rect.centerx - icon.get_width() // 2, corrida_rect.centery - 30))
+        subtitle = render_text(self.font_small, "Selecione seu jogo favorito!", True, (200, 200, 200))
+        layer.blit(subtitle, (self.W // 2 - subtitle.get_width() // 2, 140))
         
-        name = self.font_small.render("CORRIDA MALUCA", True, self.WHITE)
-        self.screen.blit(name, (corrida_rect.centerx - name.get_width() // 2, corrida_rect.centery))
-        
-        desc = self.font_small.render("Pega-Pega Caótico", True, (230, 230, 230))
-        self.screen.blit(desc, (corrida_rect.centerx - desc.get_width() // 2, corrida_rect.centery + 20))
-        
-        # Botão Guerra Relâmpago
-        guerra_rect = pygame.Rect(self.W // 2 + 20, self.H // 2 - 60, 200, 120)
-        guerra_data = self.games["GUERRA_RELAMPAGO"]
-        guerra_color = guerra_data["color"]
-        guerra_hover = self.is_mouse_over(guerra_rect)
-        
-        # Efeito de "em breve"
-        if guerra_data["coming_soon"]:
-            guerra_color = (100, 100, 100)  # Cinza para indicar desabilitado
-        
-        pygame.draw.rect(self.screen, guerra_color, guerra_rect, border_radius=15)
-        pygame.draw.rect(self.screen, self.WHITE, guerra_rect, 3, border_radius=15)
-        
-        # Ícone e texto
-        icon = self.font_medium.render("⚔️", True, self.WHITE)
-        self.screen.blit(icon, (guerra_rect.centerx - icon.get_width() // 2, guerra_rect.centery - 30))
-        
-        name = self.font_small.render("GUERRA RELÂMPAGO", True, self.WHITE)
-        self.screen.blit(name, (guerra_rect.centerx - name.get_width() // 2, guerra_rect.centery))
-        
-        if guerra_data["coming_soon"]:
-            coming_soon = self.font_small.render("EM BREVE!", True, (255, 255, 0))
-            self.screen.blit(coming_soon, (guerra_rect.centerx - coming_soon.get_width() // 2, guerra_rect.centery + 20))
-        else:
-            desc = self.font_small.render("Mata-Mata", True, (230, 230, 230))
-            self.screen.blit(desc, (guerra_rect.centerx - desc.get_width() // 2, guerra_rect.centery + 20))
+        for game_id, rect in zip(self.selector_ids, self.selector_rects):
+            info = self.games[game_id]
+            
+            # Efeito de "em breve": cinza para indicar desabilitado
+            color = (100, 100, 100) if info.coming_soon else info.color
+            pygame.draw.rect(layer, color, rect, border_radius=15)
+            pygame.draw.rect(layer, self.WHITE, rect, 3, border_radius=15)
+            
+            # Ícone e texto
+            icon = render_text(self.font_medium, info.icon, True, self.WHITE)
+            layer.blit(icon, (rect.centerx - icon.get_width() // 2, rect.centery - 30))
+            
+            name = render_text(self.font_small, info.name, True, self.WHITE)
+            layer.blit(name, (rect.centerx - name.get_width() // 2, rect.centery))
+            
+            if info.coming_soon:
+                desc = render_text(self.font_small, "EM BREVE!", True, (255, 255, 0))
+            else:
+                desc = render_text(self.font_small, info.tagline, True, (230, 230, 230))
+            layer.blit(desc, (rect.centerx - desc.get_width() // 2, rect.centery + 20))
         
         # Rodapé
-        footer = self.font_small.render("Pressione F11 para tela cheia • Vannpipe Game Inc.", True, (150, 150, 150))
-        self.screen.blit(footer, (self.W // 2 - footer.get_width() // 2, self.H - 40))
-    
-    def is_mouse_over(self, rect):
-        """Verifica se o mouse está sobre um retângulo"""
-        return rect.collidepoint(pygame.mouse.get_pos())
+        footer = render_text(self.font_small, "Pressione F11 para tela cheia • Vannpipe Game Inc.", True, (150, 150, 150))
+        layer.blit(footer, (self.W // 2 - footer.get_width() // 2, self.H - 40))
+        return layer
     
     def update(self):
-        """Atualiza a lógica do jogo"""
-        dt = self.clock.tick(self.FPS) / 1000.0
+        """Acumula o tempo do frame e avança a lógica em passos fixos de SIM_DT"""
+        self.accumulator += self.clock.tick(self.frame_cap) / 1000.0
         
+        steps = 0
+        with profiler.phase("update"):
+            while self.accumulator >= self.SIM_DT and steps < self.MAX_CATCHUP_STEPS:
+                self.step(self.SIM_DT)
+                self.accumulator -= self.SIM_DT
+                steps += 1
+        
+        # Frame muito atrasado: descarta o excesso em vez de acelerar o jogo
+        if steps == self.MAX_CATCHUP_STEPS:
+            self.accumulator = min(self.accumulator, self.SIM_DT)
+        
+        self.alpha = self.accumulator / self.SIM_DT
+    
+    def step(self, dt):
+        """Avança a lógica em um passo fixo"""
         if self.current_screen == "GAME" and self.game_manager:
             self.game_manager.update(dt)
             
@@ -191,26 +378,146 @@ class ArcadeMultiGames:
     
     def draw(self):
         """Desenha a tela atual"""
-        if self.current_screen == "GAME_SELECTOR":
-            self.draw_game_selector()
-        elif self.current_screen == "GAME" and self.game_manager:
-            self.game_manager.draw()
+        rects = None
+        with profiler.phase("draw"):
+            if self.current_screen == "GAME_SELECTOR":
+                self.draw_game_selector()
+            elif self.current_screen == "LOADING":
+                # Espera curta fica no seletor; a tela de carregamento só aparece se demorar
+                elapsed = pygame.time.get_ticks() - self.loading_since
+                if elapsed < scenes.LOADING_DELAY_MS:
+                    self.draw_game_selector()
+                else:
+                    info = self.games[self.loading_game]
+                    draw_loading(self.screen, info.name, elapsed / 1000.0, info.color)
+            elif self.current_screen == "GAME" and self.game_manager:
+                rects = self.game_manager.draw(self.alpha)
+        
+        if profiler.enabled:
+            panel = draw_profiler(self.screen, profiler)
+            if rects is not None:
+                rects = rects + [panel]
         
-        pygame.display.flip()
+        # Com retângulos sujos só as áreas alteradas são enviadas para a tela
+        with profiler.phase("flip"):
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
     
-    def run(self):
-        """Loop principal do jogo"""
-        while self.running:
-            self.handle_events()
+    def run_frame(self):
+        """Um frame completo: eventos, passos fixos da lógica, desenho e etapas adiadas"""
+        profiler.begin_frame()
+        with tracer.span("frame", cat="loop"):
+            with profiler.phase("events"):
+                self.handle_events()
             self.update()
             self.draw()
-        
+            self.update_scenes()
+        startup.mark("primeiro frame")
+        if self.deferred or not self.reported:
+            self.run_deferred()
+    
+    def shutdown(self):
+        tasks.shutdown()
+        scenes.shutdown()
+        if tracer.enabled:
+            self.toggle_trace(self.trace_path)
         pygame.quit()
+    
+    def run(self):
+        """Loop principal do jogo (bloqueante); as tarefas assíncronas andam uma volta por frame"""
+        while self.running:
+            self.run_frame()
+            tasks.pump()
+        
+        self.shutdown()
         sys.exit()
+    
+    async def run_async(self, *startup_tasks):
+        """
+        Loop principal cooperativo: devolve a vez ao event loop a cada frame e
+        cadencia os frames com asyncio.sleep em vez de bloquear em clock.tick.
+        Serve também de ponto de entrada para empacotadores WebAssembly.
+        """
+        loop = asyncio.get_running_loop()
+        tasks.attach(loop)
+        for coro in startup_tasks:
+            tasks.spawn(coro, owner="game", name="startup")
+        self.frame_cap = 0  # Quem espera agora é o asyncio.sleep
+        period = 1.0 / self.FPS
+        next_frame = loop.time()
+        while self.running:
+            self.run_frame()
+            next_frame += period
+            delay = next_frame - loop.time()
+            if delay < 0:
+                # Atrasado: não tenta recuperar frames perdidos, só cede a vez
+                next_frame = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+        
+        self.shutdown()
 
 def main():
-    arcade = ArcadeMultiGames()
-    arcade.run()
+    parser = argparse.ArgumentParser(description="Arcade Multi-Games")
+    parser.add_argument("--fps", type=int, default=60,
+                        help="taxa de desenho (a lógica roda sempre a 120 Hz)")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="grava um trace desde o início e salva neste arquivo ao sair")
+    parser.add_argument("--replay", metavar="ARQUIVO",
+                        help="abre direto a reprodução de uma partida gravada (F5 grava)")
+    parser.add_argument("--replay-speed", type=int, default=1,
+                        help="ticks gravados por passo na reprodução (0 = o mais rápido possível)")
+    parser.add_argument("--host", type=int, metavar="PORTA",
+                        help="abre uma partida em rede (rollback) e espera a outra cabine")
+    parser.add_argument("--join", metavar="HOST:PORTA",
+                        help="entra na partida em rede aberta por outra cabine")
+    parser.add_argument("--input-delay", type=int, default=2,
+                        help="atraso da entrada local em rede (ticks de 1/120 s)")
+    parser.add_argument("--net-latency", type=float, default=0,
+                        help="latência extra simulada nos pacotes enviados (ms)")
+    parser.add_argument("--net-jitter", type=float, default=0,
+                        help="variação simulada da latência (ms)")
+    parser.add_argument("--net-loss", type=float, default=0,
+                        help="fração simulada de pacotes perdidos")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="mostra o tempo de importação e de inicialização até o primeiro frame")
+    parser.add_argument("--async", dest="async_loop", action="store_true",
+                        help="usa o loop principal cooperativo (asyncio)")
+    args = parser.parse_args()
+    
+    if args.trace:
+        tracer.start()
+    arcade = ArcadeMultiGames(fps=args.fps)
+    arcade.trace_path = args.trace
+    arcade.startup_report = args.startup_report
+    startup_tasks = []
+    if args.replay:
+        arcade.start_game("CORRIDA_MALUCA")
+        arcade.game_manager.start_replay(args.replay, args.replay_speed)
+    elif args.host is not None or args.join:
+        from games.pega_pega.netplay import UdpTransport, LinkSimulator
+        if args.join:
+            address, port = args.join.rsplit(":", 1)
+            transport = UdpTransport(peer=(address, int(port)))
+        else:
+            transport = UdpTransport(("0.0.0.0", args.host))
+        if args.net_latency or args.net_jitter or args.net_loss:
+            transport = LinkSimulator(transport, args.net_latency, args.net_jitter, args.net_loss)
+        arcade.start_game("CORRIDA_MALUCA")
+        local_index = 0 if args.join is None else 1
+        if args.async_loop:
+            # O handshake vira tarefa: a janela segue respondendo enquanto espera o par
+            startup_tasks.append(arcade.game_manager.start_netplay_async(
+                transport, local_index, arcade.SIM_DT, args.input_delay))
+        else:
+            arcade.game_manager.start_netplay(transport, local_index, arcade.SIM_DT, args.input_delay)
+    
+    if args.async_loop:
+        asyncio.run(arcade.run_async(*startup_tasks))
+    else:
+        arcade.run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+Ferramentas de linha de comando (balanceamento, benchmarks)
+"""
@@ -0,0 +1,221 @@
+"""
+Simulador de balanceamento do Pega-Pega (Monte Carlo).
+
+Roda milhares de partidas headless bot contra bot, com sementes fixas, num pool
+de processos, varrendo combinações de parâmetros dos power-ups, do spawn e da
+troca de mapa. Agrega vitórias, pegadas, coletas e placares por mapa e grava
+CSV + JSON.
+
+    python -m tools.balance --matches 500 --speed-mul 1.4,1.6,1.8 --out balance
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import csv
+import itertools
+import json
+import statistics
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+
+from games.pega_pega.simulation import PegaPegaSim, SIM_HZ
+from games.pega_pega.ai import PegaPegaAI
+
+KINDS = ["speed", "shield", "freeze", "teleport"]
+MAPS = ["original", "novo_mapa"]
+
+# Parâmetro da linha de comando -> atributo do PegaPegaSim
+PARAMS = {
+    "speed_mul": "SPEED_MUL",
+    "speed_ms": "SPEED_MS",
+    "freeze_ms": "FREEZE_MS",
+    "teleport": "TELEPORT_DIST",
+    "spawn_ms": "PU_SPAWN_MS",
+    "transition_ms": "MAP_TRANSITION_TIME",
+}
+
+# Grades de navegação (e campos dos bots) por processo: as partidas de um
+# worker rodam uma por vez e reaproveitam o que as anteriores calcularam
+NAVS = {}
+
+def empty_map_stats():
+    return {"ticks": 0, "tags": 0, "rounds": 0, "round_wins": [0, 0], "draws": 0,
+            "pickups": dict.fromkeys(KINDS, 0), "scores": []}
+
+def play_match(job):
+    """Uma partida completa bot contra bot; devolve as contagens por mapa"""
+    config_id, params, seed, hz, round_ms = job
+    sim = PegaPegaSim(900, 520, "Bot A", "Bot B", seed=seed, navs=NAVS)
+    for name, value in params.items():
+        setattr(sim, PARAMS[name], value)
+    sim.ROUND_MS = round_ms
+    ai = PegaPegaAI(sim, range(len(sim.players)))
+
+    maps = {m: empty_map_stats() for m in MAPS}
+    dt = 1.0 / hz
+    while sim.game_state == "PLAYING":
+        stats = maps[sim.current_map]
+        stats["ticks"] += 1
+        for name in sim.step(ai.fill([0, 0]), dt):
+            if name == "tag":
+                stats["tags"] += 1
+            elif name.startswith("pickup_"):
+                stats["pickups"][name[7:]] += 1
+
+    # Rounds contam para o mapa em que terminaram
+    for rnd in sim.history:
+        stats = maps[rnd["map"]]
+        stats["rounds"] += 1
+        if rnd["winner"] is None:
+            stats["draws"] += 1
+        else:
+            stats["round_wins"][rnd["winner"]] += 1
+        stats["scores"].extend(rnd["scores"])
+
+    lead = sim.wins[0] - sim.wins[1]
+    winner = None if lead == 0 else (0 if lead > 0 else 1)
+    return config_id, winner, maps
+
+def parse_list(text, cast):
+    return [cast(v) for v in text.split(",")]
+
+def parse_range(text):
+    lo, hi = text.split("-")
+    return int(lo), int(hi)
+
+def build_configs(args):
+    """Produto cartesiano dos valores pedidos para cada parâmetro"""
+    options = {
+        "speed_mul": parse_list(args.speed_mul, float),
+        "speed_ms": parse_list(args.speed_ms, int),
+        "freeze_ms": parse_list(args.freeze_ms, int),
+        "teleport": parse_list(args.teleport, int),
+        "spawn_ms": [parse_range(v) for v in args.spawn_ms.split(",")],
+        "transition_ms": parse_list(args.transition_ms, int),
+    }
+    names = list(options)
+    return [dict(zip(names, values)) for values in itertools.product(*options.values())]
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = (len(values) - 1) * p
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+def summarize(config, run, winners, maps):
+    """
+    Resumo de uma configuração: totais da partida e uma entrada por mapa.
+    `run` guarda o que reproduz a varredura (matches, seed base, hz, round_ms).
+    """
+    matches = run["matches"]
+    total_ticks = sum(m["ticks"] for m in maps.values()) or 1
+    result = {
+        "params": {k: list(v) if isinstance(v, tuple) else v for k, v in config.items()},
+        "run": dict(run),
+        "matches": matches,
+        "win_rate": [winners[0] / matches, winners[1] / matches],
+        "draw_rate": winners[None] / matches,
+        "maps": {},
+    }
+    for name, m in maps.items():
+        rounds = m["rounds"] or 1
+        scores = m["scores"]
+        result["maps"][name] = {
+            "time_share": m["ticks"] / total_ticks,
+            "rounds": m["rounds"],
+            "round_win_rate": [m["round_wins"][0] / rounds, m["round_wins"][1] / rounds],
+            "round_draw_rate": m["draws"] / rounds,
+            "tags_per_match": m["tags"] / matches,
+            "pickups_per_match": {k: v / matches for k, v in m["pickups"].items()},
+            "score_mean": statistics.fmean(scores) if scores else 0.0,
+            "score_stdev": statistics.pstdev(scores) if scores else 0.0,
+            "score_p10": percentile(scores, 0.10),
+            "score_p50": percentile(scores, 0.50),
+            "score_p90": percentile(scores, 0.90),
+        }
+    return result
+
+def write_outputs(results, out):
+    with open(out + ".json", "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    with open(out + ".csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(PARAMS) + ["seed", "hz", "round_ms", "map", "matches",
+                                         "p1_win", "p2_win", "draw",
+                                         "round_p1_win", "round_p2_win", "round_draw",
+                                         "tags_per_match"] +
+                        [f"pickups_{k}" for k in KINDS] +
+                        ["score_mean", "score_stdev", "score_p10", "score_p50", "score_p90"])
+        for res in results:
+            params = res["params"]
+            for name, m in res["maps"].items():
+                spawn = params["spawn_ms"]
+                row = [params[k] if k != "spawn_ms" else f"{spawn[0]}-{spawn[1]}" for k in PARAMS]
+                run = res["run"]
+                row += [run["seed"], run["hz"], run["round_ms"]]
+                row += [name, res["matches"], round(res["win_rate"][0], 4),
+                        round(res["win_rate"][1], 4), round(res["draw_rate"], 4),
+                        round(m["round_win_rate"][0], 4), round(m["round_win_rate"][1], 4),
+                        round(m["round_draw_rate"], 4), round(m["tags_per_match"], 3)]
+                row += [round(m["pickups_per_match"][k], 3) for k in KINDS]
+                row += [round(m[k], 3) for k in ("score_mean", "score_stdev", "score_p10",
+                                                 "score_p50", "score_p90")]
+                writer.writerow(row)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de balanceamento do Pega-Pega")
+    parser.add_argument("--matches", type=int, default=200, help="partidas por configuração")
+    parser.add_argument("--workers", type=int, default=cpu_count(), help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--seed", type=int, default=0, help="semente base (partida i usa seed + i)")
+    parser.add_argument("--hz", type=int, default=SIM_HZ,
+                        help=f"passos de simulação por segundo (padrão: {SIM_HZ}, o do jogo)")
+    parser.add_argument("--round-ms", type=int, default=60000, help="duração de cada round")
+    parser.add_argument("--speed-mul", default="1.6", help="multiplicador do speed (lista: 1.4,1.6)")
+    parser.add_argument("--speed-ms", default="3000", help="duração do speed em ms")
+    parser.add_argument("--freeze-ms", default="2000", help="duração do freeze em ms")
+    parser.add_argument("--teleport", default="250", help="distância mínima do teleporte")
+    parser.add_argument("--spawn-ms", default="3000-6000", help="intervalo de spawn (lista: 2000-4000,3000-6000)")
+    parser.add_argument("--transition-ms", default="15000", help="tempo entre trocas de mapa")
+    parser.add_argument("--out", default="balance", help="prefixo dos arquivos .csv/.json")
+    args = parser.parse_args(argv)
+
+    configs = build_configs(args)
+    jobs = [(cid, config, args.seed + i, args.hz, args.round_ms)
+            for cid, config in enumerate(configs) for i in range(args.matches)]
+    print(f"{len(configs)} configurações x {args.matches} partidas = {len(jobs)} partidas "
+          f"em {args.workers} processos")
+
+    winners = [{0: 0, 1: 0, None: 0} for _ in configs]
+    maps = [{m: empty_map_stats() for m in MAPS} for _ in configs]
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        chunk = max(1, len(jobs) // (args.workers * 8))
+        for done, (cid, winner, match_maps) in enumerate(pool.imap_unordered(play_match, jobs, chunk), 1):
+            winners[cid][winner] += 1
+            for name, m in match_maps.items():
+                acc = maps[cid][name]
+                for key in ("ticks", "tags", "rounds", "draws"):
+                    acc[key] += m[key]
+                for i in (0, 1):
+                    acc["round_wins"][i] += m["round_wins"][i]
+                for kind in KINDS:
+                    acc["pickups"][kind] += m["pickups"][kind]
+                acc["scores"].extend(m["scores"])
+            if done % 100 == 0 or done == len(jobs):
+                print(f"\r{done}/{len(jobs)} partidas", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    run = {"matches": args.matches, "seed": args.seed, "hz": args.hz, "round_ms": args.round_ms}
+    results = [summarize(config, run, winners[cid], maps[cid])
+               for cid, config in enumerate(configs)]
+    write_outputs(results, args.out)
+    print(f"Concluído em {time.perf_counter() - start:.1f}s -> {args.out}.csv, {args.out}.json")
+
+if __name__ == "__main__":
+    main()
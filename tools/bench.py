@@ -0,0 +1,262 @@
+"""
+Micro-benchmarks dos caminhos quentes (colisão, entidades e desenho).
+
+Roda com o driver de vídeo `dummy` do SDL sobre arenas sintéticas fixas com
+quantidades crescentes de obstáculos. Salva os tempos em JSON e, com --compare,
+aponta as regressões em relação a um baseline salvo antes.
+
+    python -m tools.bench --out bench.json
+    python -m tools.bench --compare bench.json --threshold 0.15
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from utils.helpers import circle_rect, circles_collide, dist
+from games.pega_pega.entities import spawn_powerup
+from games.pega_pega.maps import MovingRect, draw_obstacles
+from games.pega_pega.pega_pega_game import hud
+from games.pega_pega.simulation import PegaPegaSim
+from ui.hud import draw_hud
+
+W, H = 900, 520
+ARENA_SIZES = [8, 32, 128, 512]
+
+def make_arena(count, seed=1234):
+    """Arena sintética determinística: ~60% retângulos, ~25% círculos, ~15% movers"""
+    rng = random.Random(seed + count)
+    n_rects = max(1, count * 60 // 100)
+    n_circles = max(1, count * 25 // 100)
+    n_movers = max(1, count - n_rects - n_circles)
+    # Obstáculos menores conforme a contagem cresce, para a arena continuar jogável
+    size = max(8, int(90 / (count / 8) ** 0.5))
+
+    def spot(w, h):
+        return rng.randint(0, W - w), rng.randint(110, H - h)
+
+    static_rects = []
+    for _ in range(n_rects):
+        w, h = rng.randint(size // 2, size), rng.randint(size // 2, size)
+        static_rects.append(pygame.Rect(*spot(w, h), w, h))
+    circles = []
+    for _ in range(n_circles):
+        r = rng.randint(size // 4, size // 2)
+        x, y = spot(2 * r, 2 * r)
+        circles.append((x + r, y + r, r))
+    movers = []
+    for _ in range(n_movers):
+        w, h = rng.randint(size // 2, size), rng.randint(size // 4, size // 2)
+        x, y = spot(w, h)
+        movers.append(MovingRect(x, y, w, h, rng.choice("xy"), rng.randint(20, 80),
+                                 rng.uniform(0.5, 2.0), rng=rng))
+    return {"static_rects": static_rects, "circles": circles, "movers": movers}
+
+def arena_sim(count):
+    sim = PegaPegaSim(W, H, seed=count)
+    sim.apply_map(make_arena(count))
+    return sim
+
+MIN_LOOPS = 10  # Chamadas por amostra, no mínimo (uma chamada só é ruído puro)
+
+def time_call(fn, target=0.2, repeat=5):
+    """
+    Tempo por chamada (ns): calibra o número de iterações e devolve mediana e mínimo.
+    Cada amostra dura ao menos target/10 e tem ao menos MIN_LOOPS chamadas.
+    """
+    # Aquecimento: a primeira chamada paga preparações preguiçosas (campos,
+    # caches da arena) e não pode ditar a calibração
+    fn()
+    loops = 1
+    while True:
+        t = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        el = time.perf_counter() - t
+        if el >= target / 10 or loops >= 1 << 24:
+            break
+        loops *= 4
+    loops = max(MIN_LOOPS, int(loops * (target / 10) / max(el, 1e-9)))
+
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - t) / loops * 1e9)
+    return {"ns": statistics.median(samples), "min_ns": min(samples), "loops": loops}
+
+# --- Benchmarks --------------------------------------------------------------
+# Cada fábrica recebe o tamanho da arena (None = independe da arena) e devolve
+# a função a ser cronometrada.
+
+def bench_circle_rect(_):
+    rect = pygame.Rect(100, 100, 80, 40)
+    return lambda: circle_rect(130, 95, 22, rect)
+
+def bench_circles_collide(_):
+    return lambda: circles_collide(100, 100, 22, 140, 120, 22)
+
+def bench_dist(_):
+    return lambda: dist(100, 100, 340, 220)
+
+def bench_move_collide(count):
+    sim = arena_sim(count)
+    player = sim.p1
+    arena = pygame.Rect(0, 0, W, H)
+    step = [5.0]
+
+    def run():
+        if player.move_collide(step[0], step[0] * 0.5, arena, world=sim.world):
+            step[0] = -step[0]
+    return run
+
+def bench_move_collide_lists(count):
+    """Caminho antigo (listas varridas por completo) para comparar com a grade"""
+    sim = arena_sim(count)
+    player = sim.p1
+    arena = pygame.Rect(0, 0, W, H)
+    rects, circles = sim.static_rects, sim.circles
+    movers = sim.mover_rects
+    step = [5.0]
+
+    def run():
+        if player.move_collide(step[0], step[0] * 0.5, arena, rects, movers, circles):
+            step[0] = -step[0]
+    return run
+
+def bench_spawn_powerup(count):
+    sim = arena_sim(count)
+
+    def run():
+        pus = []
+        spawn_powerup(pus, sim.static_rects, sim.movers, sim.circles, W, H,
+                      now=sim.now, rng=sim.rng, world=sim.world, field=sim.field)
+        sim.world.clear_items()
+    return run
+
+def bench_spawn_powerup_scan(count):
+    sim = arena_sim(count)
+
+    def run():
+        spawn_powerup([], sim.static_rects, sim.movers, sim.circles, W, H,
+                      now=sim.now, rng=sim.rng)
+    return run
+
+def bench_find_safe_spawn(count):
+    sim = arena_sim(count)
+    sides = ["left", "right"]
+    i = [0]
+
+    def run():
+        i[0] ^= 1
+        sim.find_safe_spawn(sides[i[0]], 22)
+    return run
+
+def bench_draw_obstacles(count):
+    sim = arena_sim(count)
+    screen = pygame.display.get_surface()
+    return lambda: draw_obstacles(screen, sim.static_rects, sim.movers, sim.circles, now=sim.now)
+
+def bench_hud(_):
+    sim = PegaPegaSim(W, H, seed=1)
+    screen = pygame.display.get_surface()
+    return lambda: hud(screen, sim.p1, sim.p2, 42000, 2, [1, 0], W, H)
+
+def bench_draw_hud(_):
+    sim = PegaPegaSim(W, H, seed=1)
+    screen = pygame.display.get_surface()
+    return lambda: draw_hud(screen, sim.p1, sim.p2, 42000, 2, [1, 0], W, H)
+
+BENCHMARKS = [
+    ("helpers.circle_rect", bench_circle_rect, False),
+    ("helpers.circles_collide", bench_circles_collide, False),
+    ("helpers.dist", bench_dist, False),
+    ("Player.move_collide", bench_move_collide, True),
+    ("Player.move_collide[lists]", bench_move_collide_lists, True),
+    ("spawn_powerup", bench_spawn_powerup, True),
+    ("spawn_powerup[scan]", bench_spawn_powerup_scan, True),
+    ("find_safe_spawn", bench_find_safe_spawn, True),
+    ("draw_obstacles", bench_draw_obstacles, True),
+    ("hud", bench_hud, False),
+    ("ui.hud.draw_hud", bench_draw_hud, False),
+]
+
+def run_all(name_filter=None, sizes=ARENA_SIZES, target=0.2):
+    results = {}
+    for name, factory, per_arena in BENCHMARKS:
+        if name_filter and name_filter not in name:
+            continue
+        for count in (sizes if per_arena else [None]):
+            key = name if count is None else f"{name}@{count}"
+            results[key] = time_call(factory(count), target)
+            print(f"{key:<36} {results[key]['ns']:>12.0f} ns")
+    return results
+
+def compare(results, baseline, threshold):
+    """Lista (nome, base, atual, variação) das entradas mais lentas que o limite"""
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        change = res["ns"] / base["ns"] - 1
+        flag = "REGRESSÃO" if change > threshold else ("melhora" if change < -threshold else "")
+        print(f"{key:<36} {base['ns']:>12.0f} -> {res['ns']:>12.0f} ns  {change:+7.1%}  {flag}")
+        if change > threshold:
+            regressions.append((key, base["ns"], res["ns"], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks do Arcade Multi-Games")
+    parser.add_argument("--out", help="grava os resultados neste JSON")
+    parser.add_argument("--compare", help="JSON de baseline para comparar")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="piora relativa a partir da qual é regressão (0.15 = 15%%)")
+    parser.add_argument("--filter", help="só benchmarks cujo nome contém este texto")
+    parser.add_argument("--quick", action="store_true", help="menos tempo por medida (menos estável)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((W, H))
+
+    results = run_all(args.filter, target=0.05 if args.quick else 0.2)
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+            status = 1
+    pygame.quit()
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
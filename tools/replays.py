@@ -0,0 +1,85 @@
+"""
+Utilitários de replay do Pega-Pega.
+
+    python -m tools.replays convert replays/partida.ppr partida.ppra
+    python -m tools.replays info partida.ppra
+    python -m tools.replays seek partida.ppra 12000
+    python -m tools.replays scan arquivos/*.ppra
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import sys
+import time
+
+from games.pega_pega.replay import Recording
+from games.pega_pega.replay_archive import ReplayArchive, write_archive, scan
+
+def cmd_convert(args):
+    recording = Recording.load(args.src)
+    t = time.perf_counter()
+    sim = write_archive(recording, args.dst, args.interval)
+    expected = recording.header.get("final_hash")
+    status = "ok" if expected in (None, sim.state_hash()) else "DIVERGIU"
+    print(f"{args.dst}: {recording.ticks} ticks em {time.perf_counter() - t:.2f}s ({status})")
+    return 0 if status == "ok" else 1
+
+def cmd_info(args):
+    with ReplayArchive(args.path) as archive:
+        h, tr = archive.header, archive.trailer
+        names = [h["player1"][0], h["player2"][0]] + [p[0] for p in h["extra_players"]]
+        print(f"jogadores: {', '.join(names)}")
+        print(f"semente {h['seed']}  dt {h['dt']:.5f}s  ticks {tr['ticks']}  "
+              f"keyframes {len(archive.block_ticks)} (a cada {h['keyframe_interval']})")
+        print(f"placar {tr['wins']}  {tr['winner_msg'] or tr['game_state']}  hash {tr['final_hash']}")
+    return 0
+
+def cmd_seek(args):
+    with ReplayArchive(args.path) as archive:
+        t = time.perf_counter()
+        sim = archive.seek(args.tick)
+        el = time.perf_counter() - t
+        print(f"tick {args.tick}: round {sim.round_idx}, mapa {sim.current_map}, "
+              f"{len(sim.powerups)} power-ups, hash {sim.state_hash()} ({el * 1000:.1f} ms)")
+        for player in sim.players:
+            tag = " (pegador)" if player.is_it else ""
+            print(f"  {player.name}: ({player.x:.1f}, {player.y:.1f}) score {player.score:.1f}{tag}")
+    return 0
+
+def cmd_scan(args):
+    # Só cabeçalho e trailer de cada arquivo são lidos
+    print("arquivo,ticks,jogadores,resultado,hash")
+    for path, header, trailer in scan(args.paths):
+        print(f"{path},{trailer['ticks']},{header['players']},"
+              f"{trailer['winner_msg'] or trailer['game_state']},{trailer['final_hash']}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replays do Pega-Pega")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("convert", help="converte uma gravação .ppr no arquivo indexado .ppra")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p.add_argument("--interval", type=int, default=600, help="ticks entre keyframes")
+    p.set_defaults(fn=cmd_convert)
+
+    p = sub.add_parser("info", help="resumo de um .ppra")
+    p.add_argument("path")
+    p.set_defaults(fn=cmd_info)
+
+    p = sub.add_parser("seek", help="estado da partida num tick qualquer")
+    p.add_argument("path")
+    p.add_argument("tick", type=int)
+    p.set_defaults(fn=cmd_seek)
+
+    p = sub.add_parser("scan", help="resumo de muitos .ppra (só cabeçalhos)")
+    p.add_argument("paths", nargs="+")
+    p.set_defaults(fn=cmd_scan)
+
+    args = parser.parse_args(argv)
+    return args.fn(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,11 @@
 UI package - Componentes de interface do usuário
 """
 
-from .widgets import Button, Title
+from .widgets import Button, Title, get_font, load_font, render_text, text_cache_stats
 from .hud import draw_hud
+from .surfaces import get_overlay, get_glow, surface_cache_stats
+from .profiler_overlay import draw_profiler
+from .loading import draw_loading
 
-__all__ = ['Button', 'Title', 'draw_hud']
\ No newline at end of file
+__all__ = ['Button', 'Title', 'get_font', 'load_font', 'render_text', 'text_cache_stats', 'draw_hud',
+           'get_overlay', 'get_glow', 'surface_cache_stats', 'draw_profiler', 'draw_loading']
\ No newline at end of file
@@ -1,11 +1,10 @@
-import pygame
+from ui.widgets import get_font, render_text
+from ui.surfaces import get_overlay
 
 def draw_hud(surface, p1, p2, remain, round_idx, wins, width, height):
     """Desenha o HUD do jogo Pega-Pega"""
     bar_h = 110
-    hud_surf = pygame.Surface((width, bar_h), pygame.SRCALPHA)
-    hud_surf.fill((0, 0, 0, 150))
-    surface.blit(hud_surf, (0, 0))
+    surface.blit(get_overlay((width, bar_h), (0, 0, 0, 150)), (0, 0))
 
     # Função auxiliar para abreviar nomes
     def abbrev(t, n=12):
@@ -15,14 +14,15 @@ def draw_hud(surface, p1, p2, remain, round_idx, wins, width, height):
     n1, n2 = abbrev(p1.name), abbrev(p2.name)
 
     # Título
-    font_big = pygame.font.Font(None, 46)
-    title = font_big.render("PEGA - PEGA 1V1", True, (240, 240, 240))
+    font_big = get_font(None, 46)
+    title = render_text(font_big, "PEGA - PEGA 1V1", True, (240, 240, 240))
     title_rect = title.get_rect(midtop=(width // 2, 6))
     surface.blit(title, title_rect)
 
     # Round e vitórias
-    font_medium = pygame.font.Font(None, 30)
-    round_text = font_medium.render(
+    font_medium = get_font(None, 30)
+    round_text = render_text(
+        font_medium,
         f"Round {round_idx}/3 • Vitórias: {n1} {wins[0]} - {wins[1]} {n2}",
         True, (240, 240, 240)
     )
@@ -30,7 +30,7 @@ def draw_hud(surface, p1, p2, remain, round_idx, wins, width, height):
     surface.blit(round_text, round_rect)
 
     # Timer
-    font_sc = pygame.font.Font(None, 34)
+    font_sc = get_font(None, 34)
     def fmt_time(ms):
         ms = max(0, ms)
         s = ms // 1000
@@ -38,17 +38,17 @@ def draw_hud(surface, p1, p2, remain, round_idx, wins, width, height):
         s %= 60
         return f"{m}:{s:02d}"
     
-    timer = font_sc.render(f"Tempo: {fmt_time(remain)}", True, (255, 210, 0))
+    timer = render_text(font_sc, f"Tempo: {fmt_time(remain)}", True, (255, 210, 0))
     timer_rect = timer.get_rect(topleft=(16, round_rect.bottom + 4))
     surface.blit(timer, timer_rect)
 
     # Placar
-    placar = font_sc.render(f"{n1}: {p1.score:0.1f}   |   {n2}: {p2.score:0.1f}", True, (240, 240, 240))
+    placar = render_text(font_sc, f"{n1}: {p1.score:0.1f}   |   {n2}: {p2.score:0.1f}", True, (240, 240, 240))
     placar_rect = placar.get_rect(topright=(width - 16, timer_rect.top))
     surface.blit(placar, placar_rect)
 
     # Pegador atual
     peg = p1.name if p1.is_it else p2.name
-    peg_surf = font_medium.render(f"Pegador: {peg}", True, (255, 210, 0))
+    peg_surf = render_text(font_medium, f"Pegador: {peg}", True, (255, 210, 0))
     peg_rect = peg_surf.get_rect(midtop=(width // 2, timer_rect.bottom + 4))
     surface.blit(peg_surf, peg_rect)
\ No newline at end of file
@@ -0,0 +1,21 @@
+import pygame
+from ui.widgets import get_font, render_text
+
+def draw_loading(surface, label, tsec, color=(100, 170, 255)):
+    """Tela de carregamento: nome do que está carregando e uma faixa correndo numa barra"""
+    width, height = surface.get_size()
+    surface.fill((18, 18, 18))
+
+    title = render_text(get_font(None, 36), label, True, (240, 240, 240))
+    surface.blit(title, title.get_rect(center=(width // 2, height // 2 - 30)))
+    info = render_text(get_font(None, 24), "Carregando...", True, (150, 150, 150))
+    surface.blit(info, info.get_rect(center=(width // 2, height // 2 + 5)))
+
+    bar = pygame.Rect(0, 0, 240, 8)
+    bar.center = (width // 2, height // 2 + 35)
+    pygame.draw.rect(surface, (60, 60, 60), bar, border_radius=4)
+    # Sem progresso conhecido: um trecho de 1/3 da barra vai e volta
+    span = bar.width // 3
+    phase = (tsec * 0.8) % 2.0
+    offset = int((phase if phase < 1.0 else 2.0 - phase) * (bar.width - span))
+    pygame.draw.rect(surface, color, (bar.x + offset, bar.y, span, bar.height), border_radius=4)
@@ -0,0 +1,59 @@
+import time
+import pygame
+from ui.widgets import get_font
+
+PANEL_W = 280
+GRAPH_H = 60
+REFRESH_S = 0.1  # Textos refeitos no máximo 10x por segundo
+
+# Painel de texto em cache (os números mudam todo frame; não vale ir para o cache de textos)
+_panel = {"surf": None, "at": 0.0}
+
+def _build_text_panel(profiler):
+    font = get_font(None, 18)
+    p50, p95, p99 = profiler.percentiles()
+    lines = [
+        (f"frame p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f} ms", (240, 240, 240)),
+        (f"frames perdidos: {profiler.dropped}  (meta {profiler.target_fps} fps)", (255, 210, 0)),
+    ]
+    for name, ms in profiler.phase_means():
+        indent = "    " if "." in name else ""
+        lines.append((f"{indent}{name:<18} {ms:6.2f} ms", (200, 200, 200)))
+
+    line_h = font.get_linesize()
+    surf = pygame.Surface((PANEL_W, 8 + line_h * len(lines)))
+    surf.fill((10, 10, 10))
+    for i, (text, color) in enumerate(lines):
+        surf.blit(font.render(text, True, color), (8, 4 + i * line_h))
+    return surf
+
+def draw_profiler(surface, profiler):
+    """Desenha o painel do profiler no canto superior direito e devolve a área ocupada"""
+    now = time.perf_counter()
+    if _panel["surf"] is None or now - _panel["at"] >= REFRESH_S:
+        _panel["surf"] = _build_text_panel(profiler)
+        _panel["at"] = now
+    text = _panel["surf"]
+
+    x = surface.get_width() - PANEL_W - 8
+    rect = pygame.Rect(x, 8, PANEL_W, text.get_height() + GRAPH_H + 4)
+    pygame.draw.rect(surface, (10, 10, 10), rect)
+    surface.blit(text, rect.topleft)
+
+    # Gráfico dos últimos frames: escala fixa de 2x o orçamento, linha no orçamento
+    budget = 1000 / profiler.target_fps
+    graph = pygame.Rect(x + 4, rect.top + text.get_height(), PANEL_W - 8, GRAPH_H)
+    pygame.draw.rect(surface, (40, 40, 40), graph, 1)
+    budget_y = graph.bottom - int(GRAPH_H / 2)
+    pygame.draw.line(surface, (90, 90, 140), (graph.left, budget_y), (graph.right - 1, budget_y))
+
+    times = profiler.frame_times()[-(graph.width - 2):]
+    for i, ms in enumerate(times):
+        h = min(int(ms / (2 * budget) * GRAPH_H), GRAPH_H - 2)
+        color = (80, 220, 120) if ms <= budget * 1.5 else (255, 90, 90)
+        px = graph.left + 1 + i
+        pygame.draw.line(surface, color, (px, graph.bottom - 2), (px, graph.bottom - 2 - h))
+    return rect
+
+def reset_profiler_panel():
+    _panel["surf"] = None
@@ -0,0 +1,60 @@
+import pygame
+from collections import OrderedDict
+
+# Cache LRU de superfícies translúcidas prontas (overlays e brilhos).
+# As superfícies devolvidas são compartilhadas: só devem ser lidas/blitadas.
+SURFACE_CACHE_SIZE = 128
+_surfaces = OrderedDict()
+_surface_stats = {"hits": 0, "misses": 0}
+
+def _cached(key, build):
+    surf = _surfaces.get(key)
+    if surf is not None:
+        _surfaces.move_to_end(key)
+        _surface_stats["hits"] += 1
+        return surf
+
+    _surface_stats["misses"] += 1
+    surf = build()
+    _surfaces[key] = surf
+    if len(_surfaces) > SURFACE_CACHE_SIZE:
+        _surfaces.popitem(last=False)
+    return surf
+
+def get_overlay(size, color):
+    """Superfície SRCALPHA do tamanho pedido preenchida com color (r, g, b, a)"""
+    size = (int(size[0]), int(size[1]))
+    color = tuple(color)
+
+    def build():
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill(color)
+        return surf
+
+    return _cached(("overlay", size, color), build)
+
+def get_glow(size, color):
+    """Elipse de brilho (r, g, b, a) ocupando toda a superfície do tamanho pedido"""
+    size = (int(size[0]), int(size[1]))
+    color = tuple(color)
+
+    def build():
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.ellipse(surf, color, surf.get_rect())
+        return surf
+
+    return _cached(("glow", size, color), build)
+
+def surface_cache_stats():
+    """Contadores do cache de superfícies"""
+    return {
+        "hits": _surface_stats["hits"],
+        "misses": _surface_stats["misses"],
+        "size": len(_surfaces),
+        "capacity": SURFACE_CACHE_SIZE,
+    }
+
+def clear_surface_cache():
+    """Esvazia o cache (ex.: depois de trocar o modo de vídeo)"""
+    _surfaces.clear()
+    _surface_stats["hits"] = _surface_stats["misses"] = 0
@@ -1,13 +1,44 @@
 import pygame
 import math
 import os
+from collections import OrderedDict
+from ui.surfaces import get_overlay, get_glow
+from utils.tracing import tracer
+
+FANCY_FONT = os.path.join("assets", "Fancy.ttf")
+
+# Registro global de fontes por (path, size): cada arquivo é aberto uma única vez
+_fonts = {}
+
+# Cache LRU de textos renderizados por (fonte, texto, antialias, cor, alpha)
+TEXT_CACHE_SIZE = 512
+_text_cache = OrderedDict()
+_text_stats = {"hits": 0, "misses": 0}
+
+def get_font(path=None, size=24):
+    """Devolve a fonte compartilhada para (path, size); path None usa a fonte padrão do pygame."""
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        with tracer.span("get_font", cat="assets", path=str(path), size=size):
+            font = pygame.font.Font(path, size)
+        _fonts[key] = font
+    return font
 
 def load_font(size=24):
     """Tenta carregar a Fancy.ttf em assets/; caso contrário usa a fonte padrão do sistema."""
-    path = os.path.join("assets", "Fancy.ttf")
-    if os.path.exists(path):
+    key = (FANCY_FONT, size)
+    font = _fonts.get(key)
+    if font is None:
+        with tracer.span("load_font", cat="assets", size=size):
+            font = _open_fancy(size)
+        _fonts[key] = font
+    return font
+
+def _open_fancy(size):
+    if os.path.exists(FANCY_FONT):
         try:
-            return pygame.font.Font(path, size)
+            return pygame.font.Font(FANCY_FONT, size)
         except:
             pass
     # Fallback robusto
@@ -16,7 +47,65 @@ def load_font(size=24):
     except:
         return pygame.font.Font(None, size)
 
-class Button:
+def render_text(font, text, antialias=True, color=(240, 240, 240), alpha=None):
+    """
+    Renderiza um texto usando o cache LRU compartilhado.
+    A superfície devolvida é compartilhada: não altere (use .copy() antes de set_alpha etc.).
+    """
+    key = (font, text, antialias, tuple(color), alpha)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _text_cache.move_to_end(key)
+        _text_stats["hits"] += 1
+        return surf
+
+    _text_stats["misses"] += 1
+    surf = font.render(text, antialias, color)
+    if alpha is not None:
+        surf.set_alpha(alpha)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
+
+def text_cache_stats():
+    """Contadores do cache de textos e do registro de fontes"""
+    return {
+        "hits": _text_stats["hits"],
+        "misses": _text_stats["misses"],
+        "size": len(_text_cache),
+        "capacity": TEXT_CACHE_SIZE,
+        "fonts": len(_fonts),
+    }
+
+def clear_text_cache():
+    """Esvazia o cache de textos e zera os contadores"""
+    _text_cache.clear()
+    _text_stats["hits"] = _text_stats["misses"] = 0
+
+class _Retained:
+    """
+    Superfície pronta do widget, refeita só quando a chave de estado muda
+    (texto, hover, foco, seleção). draw() vira um único blit. Com keep > 1
+    guarda até `keep` chaves (os tamanhos do pulso do Button, por exemplo) e
+    esvazia tudo ao passar disso.
+    """
+    _surfs = None
+
+    def _retained(self, key, build, keep=1):
+        surfs = self._surfs
+        if surfs is None:
+            surfs = self._surfs = {}
+        surf = surfs.get(key)
+        if surf is None:
+            if len(surfs) >= keep:
+                surfs.clear()
+            surf = surfs[key] = build()
+        return surf
+
+class Button(_Retained):
+    PULSE_SIZES = 64  # Tamanhos do pulso guardados por botão
+
     def __init__(self, rect, text, font_size=24, color=(100, 170, 255)):
         self.base_rect = pygame.Rect(rect)
         self.rect = self.base_rect.copy()
@@ -35,19 +124,29 @@ class Button:
         self.rect.h = int(self.base_rect.h * k)
         self.rect.center = self.base_rect.center
 
+        # O pulso só passa por poucos tamanhos inteiros: cada um é desenhado uma vez
+        size = self.rect.size
+        frame = self._retained((size, bool(hover), self.text),
+                               lambda: self._render(size, hover), self.PULSE_SIZES)
+        surface.blit(frame, (self.rect.centerx - frame.get_width() // 2,
+                             self.rect.centery - frame.get_height() // 2))
+
+    def _render(self, size, hover):
+        w, h = size
+        pad = 10 if hover else 0  # Espaço para o brilho em volta
+        surf = pygame.Surface((w + 2 * pad, h + 2 * pad), pygame.SRCALPHA)
+        rect = pygame.Rect(pad, pad, w, h)
+
         fill = (70, 70, 70) if not hover else (95, 95, 95)
-        pygame.draw.rect(surface, fill, self.rect, border_radius=10)
-        pygame.draw.rect(surface, (120, 120, 120), self.rect, 2, border_radius=10)
+        pygame.draw.rect(surf, fill, rect, border_radius=10)
+        pygame.draw.rect(surf, (120, 120, 120), rect, 2, border_radius=10)
 
         if hover:
-            glow = pygame.Surface((self.rect.w + 20, self.rect.h + 20), pygame.SRCALPHA)
-            pygame.draw.ellipse(glow, (100, 170, 255, 90), glow.get_rect())
-            surface.blit(glow, (self.rect.centerx - glow.get_width() // 2,
-                                self.rect.centery - glow.get_height() // 2))
+            surf.blit(get_glow((w + 20, h + 20), (100, 170, 255, 90)), (0, 0))
 
-        txt = self.font.render(self.text, True, (240, 240, 240))
-        surface.blit(txt, (self.rect.centerx - txt.get_width() // 2,
-                           self.rect.centery - txt.get_height() // 2))
+        txt = render_text(self.font, self.text, True, (240, 240, 240))
+        surf.blit(txt, (rect.centerx - txt.get_width() // 2, rect.centery - txt.get_height() // 2))
+        return surf
 
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
@@ -65,11 +164,11 @@ class Title:
         self.font = load_font(self.font_size)
 
     def draw(self, surface):
-        text_surf = self.font.render(self.text, True, self.color)
+        text_surf = render_text(self.font, self.text, True, self.color)
         text_rect = text_surf.get_rect(center=(self.x, self.y))
         surface.blit(text_surf, text_rect)
 
-class ColorPicker:
+class ColorPicker(_Retained):
     """
     Seletor de cores em formato de 'swatches' quadrados, centralizados na largura informada.
     """
@@ -98,26 +197,36 @@ class ColorPicker:
             self.items.append((r, c))
 
         self.rect = pygame.Rect(x, y, width, max(height, desired_size))
+        # Índice de hit-test (Rect.collidelist) e área desenhada, incluindo o contorno da seleção
+        self.item_rects = [r for r, _ in self.items]
+        self.bounds = self.item_rects[0].unionall(self.item_rects).inflate(8, 8)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
-            for i, (r, _) in enumerate(self.items):
-                if r.collidepoint(event.pos):
-                    self.selected_color = i
-                    return True
+            i = pygame.Rect(event.pos, (1, 1)).collidelist(self.item_rects)
+            if i != -1:
+                self.selected_color = i
+                return True
         return False
 
     def draw(self, screen):
+        screen.blit(self._retained(self.selected_color, self._render), self.bounds.topleft)
+
+    def _render(self):
+        surf = pygame.Surface(self.bounds.size, pygame.SRCALPHA)
+        ox, oy = self.bounds.topleft
         for i, (r, c) in enumerate(self.items):
-            pygame.draw.rect(screen, c, r, border_radius=6)
-            pygame.draw.rect(screen, (30, 30, 30), r, 2, border_radius=6)
+            r = r.move(-ox, -oy)
+            pygame.draw.rect(surf, c, r, border_radius=6)
+            pygame.draw.rect(surf, (30, 30, 30), r, 2, border_radius=6)
             if i == self.selected_color:
-                pygame.draw.rect(screen, (255, 255, 255), r.inflate(6, 6), 2, border_radius=8)
+                pygame.draw.rect(surf, (255, 255, 255), r.inflate(6, 6), 2, border_radius=8)
+        return surf
 
     def get_selected_color(self):
         return self.colors[self.selected_color]
 
-class InputBox:
+class InputBox(_Retained):
     """
     Caixa de texto com placeholder, fundo translúcido e borda que destaca no foco.
     """
@@ -147,22 +256,25 @@ class InputBox:
         return False
 
     def draw(self, screen):
+        screen.blit(self._retained((self.text, self.active), self._render), self.rect.topleft)
+
+    def _render(self):
         # Fundo translúcido
-        box = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-        box.fill((0, 0, 0, 160))
-        screen.blit(box, self.rect.topleft)
+        surf = get_overlay(self.rect.size, (0, 0, 0, 160)).copy()
+        local = surf.get_rect()
 
         # Borda
         border_col = (100, 170, 255) if self.active else (160, 160, 160)
-        pygame.draw.rect(screen, border_col, self.rect, 3, border_radius=10)
+        pygame.draw.rect(surf, border_col, local, 3, border_radius=10)
 
         # Texto ou placeholder
         msg = self.text if self.text else self.placeholder
         col = (240, 240, 240) if self.text else (220, 220, 220)
-        text_surface = self.font.render(msg, True, col)
-        screen.blit(text_surface, (self.rect.x + 12, self.rect.y + (self.rect.h - text_surface.get_height()) // 2))
+        text_surface = render_text(self.font, msg, True, col)
+        surf.blit(text_surface, (12, (local.h - text_surface.get_height()) // 2))
+        return surf
 
-class ModeSelector:
+class ModeSelector(_Retained):
     """
     Seletor simples de modo de jogo (mantido se você usar em outro lugar).
     """
@@ -179,12 +291,17 @@ class ModeSelector:
         return False
 
     def draw(self, screen):
-        pygame.draw.rect(screen, (80, 80, 120), self.rect, border_radius=8)
-        pygame.draw.rect(screen, (150, 150, 200), self.rect, 2, border_radius=8)
+        screen.blit(self._retained(self.selected_mode, self._render), self.rect.topleft)
+
+    def _render(self):
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local = surf.get_rect()
+        pygame.draw.rect(surf, (80, 80, 120), local, border_radius=8)
+        pygame.draw.rect(surf, (150, 150, 200), local, 2, border_radius=8)
         text = f"Modo: {self.modes[self.selected_mode]}"
-        text_surf = self.font.render(text, True, (240, 240, 240))
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
+        text_surf = render_text(self.font, text, True, (240, 240, 240))
+        surf.blit(text_surf, text_surf.get_rect(center=local.center))
+        return surf
 
     def get_selected_mode(self):
-        return self.modes[self.selected_mode]
\ No newline at end of file
+        return self.modes[self.selected_mode]
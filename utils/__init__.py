@@ -3,5 +3,18 @@ Utils package - Funções auxiliares para o jogo
 """
 
 from .helpers import clamp, dist, circles_collide, circle_rect
+from .collision import SpatialGrid, CollisionWorld
+from .distance_field import DistanceField
+from .profiler import FrameProfiler, profiler
+from .tracing import Tracer, tracer, traced
+from .assets import AssetManager, assets
+from .startup import StartupReport, startup
+from .audio import SoundBus, audio, configure_mixer
+from .tasks import TaskRunner, tasks
+from .scenes import ScenePreloader, scenes
 
-__all__ = ['clamp', 'dist', 'circles_collide', 'circle_rect']
\ No newline at end of file
+__all__ = ['clamp', 'dist', 'circles_collide', 'circle_rect', 'SpatialGrid', 'CollisionWorld',
+           'DistanceField', 'FrameProfiler', 'profiler',
+           'Tracer', 'tracer', 'traced', 'AssetManager', 'assets',
+           'StartupReport', 'startup', 'SoundBus', 'audio', 'configure_mixer',
+           'TaskRunner', 'tasks', 'ScenePreloader', 'scenes']
\ No newline at end of file
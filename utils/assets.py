@@ -0,0 +1,268 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+import pygame
+from utils.tracing import tracer
+
+class AssetManager:
+    """
+    Cache central de imagens, sons, músicas e superfícies derivadas (as fontes
+    já têm o registro próprio em ui.widgets).
+
+    Cada recurso é lido do disco uma única vez; imagens já saem convertidas para
+    o formato da tela e cada tamanho pedido vira uma variante escalada guardada.
+    Quem usa um recurso o registra em nome de um dono (ex.: "menu", "pega_pega")
+    e release(dono) devolve tudo de uma vez. Recursos sem dono continuam no cache
+    (voltar ao menu e começar outra partida não relê nem re-escala nada) e são
+    os primeiros descartados quando o total passa de `budget` bytes.
+
+    A thread de pré-carga de cenas (utils.scenes) também usa o cache, as
+    operações sobre as entradas ficam sob `lock`. Ela só lê e decodifica
+    (prefetch_image, stage, data): converter para o formato da tela e criar
+    Sound ficam para a thread principal, quando image/derived/sound pedem o
+    recurso e encontram a versão preparada.
+    """
+    def __init__(self, budget=64 * 1024 * 1024):
+        self.budget = budget
+        self.entries = OrderedDict()  # chave -> [valor, bytes]; ordem = uso (LRU)
+        self.refs = {}  # chave -> quantos donos
+        self.owners = {}  # dono -> chaves
+        self.total = 0
+        self.stats = {"hits": 0, "misses": 0, "disk": 0, "scaled": 0, "evicted": 0}
+        self.lock = threading.RLock()
+
+    # Cache genérico
+
+    def _get(self, key, build, owner):
+        # O build também fica sob o lock: se a thread de pré-carga está montando
+        # o mesmo recurso, a thread principal espera por ele em vez de montar outro
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+                value = build()
+                entry = [value, _size_of(value)]
+                self.entries[key] = entry
+                self.total += entry[1]
+            if owner is not None:
+                self.acquire(owner, key)
+            if self.total > self.budget:
+                self.trim(self.budget)
+            return entry[0]
+
+    def acquire(self, owner, key):
+        with self.lock:
+            keys = self.owners.setdefault(owner, set())
+            if key not in keys:
+                keys.add(key)
+                self.refs[key] = self.refs.get(key, 0) + 1
+
+    def release(self, owner):
+        """Solta tudo o que o dono pegou; os recursos ficam no cache até faltar memória"""
+        with self.lock:
+            for key in self.owners.pop(owner, ()):
+                self.refs[key] -= 1
+                if self.refs[key] == 0:
+                    del self.refs[key]
+
+    def cached(self, key):
+        """Valor já no cache (None se não houver), sem contar uso nem ler nada"""
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def _take(self, key):
+        """Tira do cache uma entrada preparada sem dono (None se não houver)"""
+        with self.lock:
+            if key in self.refs or key not in self.entries:
+                return None
+            value, size = self.entries.pop(key)
+            self.total -= size
+            return value
+
+    def trim(self, target=0):
+        """Descarta recursos sem dono, do menos usado ao mais usado, até caber em `target` bytes"""
+        with self.lock:
+            for key in list(self.entries):
+                if self.total <= target:
+                    break
+                if key in self.refs:
+                    continue
+                self.total -= self.entries.pop(key)[1]
+                self.stats["evicted"] += 1
+
+    # Recursos
+
+    def _read(self, path):
+        """Bytes do arquivo direto do disco (None se não existir)"""
+        self.stats["disk"] += 1
+        with tracer.span("assets.read", cat="assets", path=path):
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except OSError:
+                return None
+
+    def _decode(self, path):
+        """Imagem decodificada em 32 bits com alpha, sem depender da tela (None se faltar)"""
+        raw = self._read(path)
+        if raw is None:
+            return None
+        try:
+            surf = pygame.image.load(io.BytesIO(raw), os.path.basename(path))
+        except pygame.error:
+            return None
+        # Cópia em formato fixo (o arquivo pode ser paletado): smoothscale aceita e convert() fica para depois
+        decoded = pygame.Surface(surf.get_size(), pygame.SRCALPHA, 32)
+        decoded.blit(surf, (0, 0))
+        return decoded
+
+    def prefetch_image(self, path, size=None):
+        """
+        Thread de pré-carga: lê, decodifica e escala a imagem sem converter.
+        O image() seguinte com o mesmo tamanho só converte para a tela.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        # Já convertida para a tela: serve como está (a thread só lê os pixels)
+        for alpha in (True, False):
+            ready = self.cached(("image", path, alpha, size))
+            if ready is not None:
+                return ready
+
+        def build():
+            surf = self._decode(path)
+            if surf is not None and size is not None and surf.get_size() != size:
+                self.stats["scaled"] += 1
+                surf = pygame.transform.smoothscale(surf, size)
+            return surf
+
+        return self._get(("staged", "image", path, size), build, None)
+
+    def stage(self, key, build):
+        """Thread de pré-carga: superfície de derived(key) montada sem converter"""
+        ready = self.cached(("derived",) + tuple(key))
+        if ready is not None:
+            return ready
+        return self._get(("staged", "derived") + tuple(key), build, None)
+
+    def prefetch_sound(self, path):
+        """Thread de pré-carga: só os bytes do som; o Sound é criado no sound() seguinte"""
+        if self.cached(("sound", path)) is None:
+            self.data(path)
+
+    def data(self, path, owner=None):
+        """Bytes do arquivo guardados no cache (None se não existir)"""
+        return self._get(("data", path), lambda: self._read(path), owner)
+
+    def image(self, path, size=None, alpha=True, owner=None):
+        """
+        Imagem convertida para o formato da tela; com `size`, a variante escalada
+        (smoothscale) para esse tamanho. None se o arquivo faltar ou for inválido.
+        A superfície é compartilhada: só deve ser lida/blitada.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+
+            def build_scaled():
+                staged = self._take(("staged", "image", path, size))
+                if staged is not None:
+                    return _convert(staged, alpha)
+                base = self.image(path, None, alpha)
+                if base is None:
+                    return None
+                self.stats["scaled"] += 1
+                with tracer.span("assets.scale", cat="assets", path=path, size=str(size)):
+                    return pygame.transform.smoothscale(base, size)
+
+            return self._get(("image", path, alpha, size), build_scaled, owner)
+
+        def build():
+            staged = self._take(("staged", "image", path, None))
+            if staged is not None:
+                return _convert(staged, alpha)
+            raw = self._read(path)
+            if raw is None:
+                return None
+            try:
+                surf = pygame.image.load(io.BytesIO(raw), os.path.basename(path))
+            except pygame.error:
+                return None
+            return _convert(surf, alpha)
+
+        return self._get(("image", path, alpha, None), build, owner)
+
+    def sound(self, path, owner=None):
+        """pygame.mixer.Sound do arquivo (None sem mixer ou sem arquivo)"""
+        def build():
+            # Bytes lidos pela pré-carga (data) viram o Sound aqui, na thread principal
+            raw = self._take(("data", path))
+            if raw is None:
+                raw = self._read(path)
+            if raw is None:
+                return None
+            try:
+                return pygame.mixer.Sound(io.BytesIO(raw))
+            except pygame.error:
+                return None
+        return self._get(("sound", path), build, owner)
+
+    def music(self, path, owner=None):
+        """
+        Carrega a música em pygame.mixer.music a partir dos bytes em cache (o
+        streaming do mixer lê de memória, não do disco). Devolve True se carregou.
+        """
+        raw = self.data(path, owner)
+        if raw is None:
+            return False
+        try:
+            pygame.mixer.music.load(io.BytesIO(raw), os.path.basename(path))
+        except pygame.error:
+            return False
+        return True
+
+    def derived(self, key, build, owner=None):
+        """Superfície montada a partir de outros recursos (ex.: fundo composto), guardada como qualquer outro"""
+        def build_or_adopt():
+            staged = self._take(("staged", "derived") + tuple(key))
+            if staged is not None:
+                return _convert(staged, bool(staged.get_flags() & pygame.SRCALPHA))
+            return build()
+        return self._get(("derived",) + tuple(key), build_or_adopt, owner)
+
+    def reconvert(self):
+        """Depois de trocar o modo de vídeo: reconverte as superfícies em cache para o novo formato"""
+        with self.lock:
+            for key, entry in self.entries.items():
+                value = entry[0]
+                # As preparadas ainda não foram convertidas: isso acontece quando forem pedidas
+                if isinstance(value, pygame.Surface) and key[0] != "staged":
+                    alpha = key[2] if key[0] == "image" else bool(value.get_flags() & pygame.SRCALPHA)
+                    entry[0] = _convert(value, alpha)
+
+    def cache_stats(self):
+        return dict(self.stats, entries=len(self.entries), bytes=self.total,
+                    budget=self.budget, owned=len(self.refs))
+
+def _convert(surf, alpha):
+    # Sem janela (headless) não há formato de tela para converter
+    if not pygame.display.get_init() or pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+def _size_of(value):
+    if isinstance(value, pygame.Surface):
+        return value.get_width() * value.get_height() * value.get_bytesize()
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, pygame.mixer.Sound):
+        freq, _, channels = pygame.mixer.get_init() or (44100, 0, 2)
+        return int(value.get_length() * freq * channels * 2)
+    return 0
+
+# Instância global compartilhada pelo menu e pelos jogos
+assets = AssetManager()
@@ -0,0 +1,95 @@
+import time
+import pygame
+
+# Mixer com buffer pequeno: 512 amostras a 44,1 kHz são ~12 ms de latência
+MIXER_SETTINGS = {"frequency": 44100, "size": -16, "channels": 2, "buffer": 512}
+
+def configure_mixer(**settings):
+    """Deve ser chamado antes de pygame.init()/pygame.mixer.init() para valer"""
+    pygame.mixer.pre_init(**dict(MIXER_SETTINGS, **settings))
+
+class SoundBus:
+    """
+    Barramento de efeitos sonoros.
+
+    Os jogos registram cada som com uma categoria e uma janela de deduplicação
+    e depois só postam nomes de eventos. Repetições do mesmo evento dentro da
+    janela são descartadas (encostar numa parede emite 'hit' a cada tick). Cada
+    categoria tem canais reservados só para ela; sem canal livre, a voz mais
+    antiga da categoria é interrompida. A música usa o stream próprio do
+    mixer (pygame.mixer.music) e nunca disputa canais com os efeitos.
+    """
+    CATEGORIES = {"tag": 2, "hit": 2, "pickup": 2, "ui": 1}
+
+    def __init__(self, categories=None, clock=time.perf_counter):
+        self.categories = dict(categories or self.CATEGORIES)
+        self.clock = clock
+        self.sounds = {}  # evento -> (som, categoria, janela em s)
+        self.last_played = {}  # evento -> instante
+        self.pools = None  # categoria -> [[canal, instante de início], ...]
+        self.stats = {"played": 0, "collapsed": 0, "stolen": 0}
+
+    def register(self, name, sound, category, window_ms=100):
+        if sound is not None:
+            self.sounds[name] = (sound, category, window_ms / 1000)
+
+    def unregister_all(self):
+        self.sounds = {}
+        self.last_played = {}
+
+    def _allocate(self):
+        """Reserva os primeiros canais do mixer para as categorias (Sound.play() não os usa)"""
+        total = sum(self.categories.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.pools = {}
+        index = 0
+        for category, count in self.categories.items():
+            self.pools[category] = [[pygame.mixer.Channel(index + i), 0.0] for i in range(count)]
+            index += count
+
+    def post(self, name):
+        """Toca o evento, a menos que ele tenha tocado há menos que a janela; devolve se tocou"""
+        entry = self.sounds.get(name)
+        if entry is None or not pygame.mixer.get_init():
+            return False
+        sound, category, window = entry
+        now = self.clock()
+        if now - self.last_played.get(name, -window) < window:
+            self.stats["collapsed"] += 1
+            return False
+        self.last_played[name] = now
+
+        if self.pools is None:
+            self._allocate()
+        pool = self.pools.get(category)
+        if pool is None:
+            sound.play()  # Categoria sem reserva: canal livre qualquer
+        else:
+            voice = next((v for v in pool if not v[0].get_busy()), None)
+            if voice is None:
+                voice = min(pool, key=lambda v: v[1])
+                voice[0].stop()
+                self.stats["stolen"] += 1
+            voice[0].play(sound)
+            voice[1] = now
+        self.stats["played"] += 1
+        return True
+
+    def post_all(self, names):
+        for name in names:
+            self.post(name)
+
+    def stop_all(self):
+        if self.pools:
+            for pool in self.pools.values():
+                for channel, _ in pool:
+                    channel.stop()
+
+    def reset(self):
+        """Depois de pygame.mixer.quit()/init() os canais precisam ser reservados de novo"""
+        self.pools = None
+
+# Instância global usada pelos jogos
+audio = SoundBus()
@@ -0,0 +1,138 @@
+from utils.helpers import circle_rect, circles_collide
+
+class SpatialGrid:
+    """
+    Grade uniforme (spatial hash): cada célula guarda as chaves dos objetos cujo
+    retângulo envolvente a toca. Consultas só olham as células próximas.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.items = {}  # chave -> (forma, faixa de células)
+
+    def _span(self, left, top, right, bottom):
+        cs = self.cell_size
+        return (int(left // cs), int(top // cs), int(right // cs), int(bottom // cs))
+
+    def insert(self, key, bounds, shape):
+        """Indexa `shape` sob `key`; bounds = (left, top, right, bottom)"""
+        span = self._span(*bounds)
+        x0, y0, x1, y1 = span
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(key)
+        self.items[key] = (shape, span)
+
+    def remove(self, key):
+        shape, (x0, y0, x1, y1) = self.items.pop(key)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells[(cx, cy)]
+                bucket.remove(key)
+                if not bucket:
+                    del self.cells[(cx, cy)]
+
+    def move(self, key, bounds, shape):
+        """Atualiza um objeto; só mexe nas células se a faixa ocupada mudou"""
+        old = self.items.get(key)
+        if old is not None and old[1] == self._span(*bounds):
+            self.items[key] = (shape, old[1])
+            return
+        if old is not None:
+            self.remove(key)
+        self.insert(key, bounds, shape)
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+
+    def query(self, left, top, right, bottom):
+        """Chaves (sem repetição, em ordem) dos objetos nas células que tocam a área"""
+        x0, y0, x1, y1 = self._span(left, top, right, bottom)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return sorted(cells.get((x0, y0), ()))
+        found = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def shape(self, key):
+        return self.items[key][0]
+
+def _rect_bounds(rect):
+    return (rect.left, rect.top, rect.right, rect.bottom)
+
+def _circle_bounds(circle):
+    cx, cy, cr = circle
+    return (cx - cr, cy - cr, cx + cr, cy + cr)
+
+class CollisionWorld:
+    """
+    Mundo de colisão de um mapa: geometria estática indexada uma vez, movers
+    atualizados incrementalmente a cada tick e itens (power-ups) coletáveis.
+    """
+    def __init__(self, cell_size=64):
+        self.static = SpatialGrid(cell_size)
+        self.movers = SpatialGrid(cell_size)
+        self.items = SpatialGrid(cell_size)
+        self.item_objs = {}
+        self.next_item = 0
+
+    def set_static(self, rects, circles):
+        """Indexa retângulos e círculos fixos do mapa (uma vez por mapa)"""
+        self.static.clear()
+        self.movers.clear()
+        for i, r in enumerate(rects):
+            self.static.insert(("r", i), _rect_bounds(r), r)
+        for i, c in enumerate(circles):
+            self.static.insert(("c", i), _circle_bounds(c), c)
+
+    def update_movers(self, rects):
+        """Atualiza os retângulos dos movers (mesma ordem a cada tick)"""
+        for i, r in enumerate(rects):
+            self.movers.move(i, _rect_bounds(r), r)
+
+    def circle_hits(self, x, y, r):
+        """True se o círculo (x, y, r) toca algum obstáculo estático ou móvel"""
+        left, top, right, bottom = x - r, y - r, x + r, y + r
+        for key in self.static.query(left, top, right, bottom):
+            shape = self.static.shape(key)
+            if key[0] == "r":
+                if circle_rect(x, y, r, shape):
+                    return True
+            elif circles_collide(x, y, r, *shape):
+                return True
+        for key in self.movers.query(left, top, right, bottom):
+            if circle_rect(x, y, r, self.movers.shape(key)):
+                return True
+        return False
+
+    def add_item(self, obj, x, y, r):
+        """Indexa um item circular (ex.: power-up) e devolve sua chave"""
+        key = self.next_item
+        self.next_item += 1
+        self.items.insert(key, (x - r, y - r, x + r, y + r), (obj, x, y, r))
+        self.item_objs[id(obj)] = key
+        return key
+
+    def remove_item(self, obj):
+        key = self.item_objs.pop(id(obj), None)
+        if key is not None:
+            self.items.remove(key)
+
+    def clear_items(self):
+        self.items.clear()
+        self.item_objs.clear()
+
+    def items_touching(self, x, y, r):
+        """Itens cujo círculo toca o círculo (x, y, r), em ordem de inserção"""
+        hits = []
+        for key in self.items.query(x - r, y - r, x + r, y + r):
+            obj, ix, iy, ir = self.items.shape(key)
+            if circles_collide(x, y, r, ix, iy, ir):
+                hits.append(obj)
+        return hits
@@ -0,0 +1,155 @@
+import math
+import numpy as np
+
+def rects_sdf(gx, gy, rects):
+    """Distância com sinal (negativa dentro) de cada ponto da grade ao retângulo mais próximo"""
+    if not rects:
+        return np.full(gx.shape, np.inf)
+    b = np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.float64)
+    left, top, right, bottom = (b[:, i, None, None] for i in range(4))
+    qx = np.maximum(left - gx, gx - right)
+    qy = np.maximum(top - gy, gy - bottom)
+    outside = np.hypot(np.maximum(qx, 0.0), np.maximum(qy, 0.0))
+    inside = np.minimum(np.maximum(qx, qy), 0.0)
+    return (outside + inside).min(axis=0)
+
+def circles_sdf(gx, gy, circles):
+    """Distância com sinal de cada ponto da grade ao círculo mais próximo"""
+    if not circles:
+        return np.full(gx.shape, np.inf)
+    c = np.array(circles, dtype=np.float64)
+    cx, cy, cr = (c[:, i, None, None] for i in range(3))
+    return (np.hypot(gx - cx, gy - cy) - cr).min(axis=0)
+
+def circles_clear_of_boxes(xs, ys, rs, boxes):
+    """Para cada círculo, True se não toca nenhuma caixa (x, y, w, h) do array boxes"""
+    if len(boxes) == 0:
+        return np.ones(len(xs), dtype=bool)
+    left, top = boxes[:, 0], boxes[:, 1]
+    right, bottom = left + boxes[:, 2], top + boxes[:, 3]
+    qx = np.minimum(np.maximum(xs[:, None], left), right)
+    qy = np.minimum(np.maximum(ys[:, None], top), bottom)
+    d = np.hypot(xs[:, None] - qx, ys[:, None] - qy)
+    return (d > rs[:, None]).all(axis=1)
+
+class DistanceField:
+    """
+    Campo de distância grosso de um mapa: para cada célula, a folga (px) até o
+    obstáculo ou parede mais próximo. A parte estática é calculada uma vez por
+    mapa; a dos movers é refeita sob demanda, só quando alguém consulta o campo.
+    """
+    def __init__(self, width, height, cell_size=8):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cols = int(math.ceil(width / cell_size))
+        self.rows = int(math.ceil(height / cell_size))
+        xs = (np.arange(self.cols) + 0.5) * cell_size
+        ys = (np.arange(self.rows) + 0.5) * cell_size
+        self.gx, self.gy = np.meshgrid(xs, ys)
+
+        # Erro máximo ao usar o centro da célula no lugar do ponto exato
+        self.slack = cell_size * math.sqrt(2) / 2
+
+        walls = np.minimum(np.minimum(self.gx, width - self.gx),
+                           np.minimum(self.gy, height - self.gy))
+        self.walls = walls
+        self.static = walls
+        self.mover_rects = []
+        self._field = walls
+
+    def set_static(self, rects, circles):
+        """Recalcula a parte estática (uma vez por mapa)"""
+        d = np.minimum(self.walls, rects_sdf(self.gx, self.gy, rects))
+        self.static = np.minimum(d, circles_sdf(self.gx, self.gy, circles))
+        self.set_movers([])
+
+    def set_movers(self, rects):
+        """Registra os retângulos atuais dos movers; o campo combinado é refeito sob demanda"""
+        self.mover_rects = rects
+        self._field = None
+
+    @property
+    def field(self):
+        if self._field is None:
+            if self.mover_rects:
+                self._field = np.minimum(self.static, rects_sdf(self.gx, self.gy, self.mover_rects))
+            else:
+                self._field = self.static
+        return self._field
+
+    def cell_of(self, x, y):
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return row, col
+
+    def clearance(self, x, y):
+        """Folga aproximada (px) no ponto; erro de no máximo meia diagonal de célula"""
+        return float(self.field[self.cell_of(x, y)])
+
+    def static_clearance(self, xs, ys):
+        """Folga (vetorizada) da parte estática nos pontos xs, ys"""
+        cols = (np.asarray(xs) // self.cell_size).astype(np.intp)
+        rows = (np.asarray(ys) // self.cell_size).astype(np.intp)
+        np.minimum(np.maximum(cols, 0, out=cols), self.cols - 1, out=cols)
+        np.minimum(np.maximum(rows, 0, out=rows), self.rows - 1, out=rows)
+        return self.static[rows, cols]
+
+    def is_free(self, x, y, r):
+        """Teste O(1) e conservador: True garante que o círculo não toca nada"""
+        return self.clearance(x, y) - self.slack >= r
+
+    def free_cells(self, r, region=None):
+        """Índices (achatados) das células onde cabe um círculo de raio r"""
+        mask = self.field >= r + self.slack
+        if region is not None:
+            x0, y0, x1, y1 = region
+            mask &= (self.gx >= x0) & (self.gx <= x1) & (self.gy >= y0) & (self.gy <= y1)
+        return np.flatnonzero(mask)
+
+    def sample_free(self, rng, r, region=None):
+        """Sorteia diretamente um ponto livre para um círculo de raio r (None se não há)"""
+        idx = self.free_cells(r, region)
+        if len(idx) == 0:
+            return None
+        i = int(idx[rng.randrange(len(idx))])
+        return float(self.gx.flat[i]), float(self.gy.flat[i])
+
+    def normal(self, x, y):
+        """Direção (unitária) em que a folga cresce: para onde empurrar quem está sobreposto"""
+        row, col = self.cell_of(x, y)
+        f = self.field
+        c0, c1 = max(col - 1, 0), min(col + 1, self.cols - 1)
+        r0, r1 = max(row - 1, 0), min(row + 1, self.rows - 1)
+        nx = f[row, c1] - f[row, c0]
+        ny = f[r1, col] - f[r0, col]
+        n = math.hypot(nx, ny)
+        if n == 0:
+            return 0.0, 0.0
+        return nx / n, ny / n
+
+    def push_out(self, x, y, r, max_steps=8):
+        """
+        Tira um círculo de dentro da geometria: anda pela normal do campo e, se não
+        bastar, vai para a célula livre mais próxima. Devolve a nova posição.
+        """
+        if self.is_free(x, y, r):
+            return x, y
+
+        px, py = x, y
+        for _ in range(max_steps):
+            nx, ny = self.normal(px, py)
+            if nx == 0 and ny == 0:
+                break
+            step = max(r + self.slack - self.clearance(px, py), self.cell_size)
+            px = min(max(px + nx * step, r), self.width - r)
+            py = min(max(py + ny * step, r), self.height - r)
+            if self.is_free(px, py, r):
+                return px, py
+
+        idx = self.free_cells(r)
+        if len(idx) == 0:
+            return x, y
+        d2 = (self.gx.flat[idx] - x) ** 2 + (self.gy.flat[idx] - y) ** 2
+        i = int(idx[int(np.argmin(d2))])
+        return float(self.gx.flat[i]), float(self.gy.flat[i])
@@ -0,0 +1,137 @@
+import time
+import numpy as np
+
+class _NullPhase:
+    """Contexto vazio usado quando o profiler está desligado"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.t0)
+        return False
+
+class FrameProfiler:
+    """
+    Tempos por fase de cada frame guardados em buffers circulares (NumPy).
+
+    O loop chama begin_frame()/end_frame(); o código mede fases com
+    `with profiler.phase("nome")` ou marca etapas seguidas com lap_start()/lap().
+    Desligado, cada chamada só testa `enabled` e volta.
+    """
+    def __init__(self, size=240, target_fps=60):
+        self.enabled = False
+        self.size = size
+        self.target_fps = target_fps
+        self.frames = np.zeros(size)  # Intervalo entre frames (ms)
+        self.phases = {}  # nome -> buffer circular (ms)
+        self.order = []  # Ordem em que as fases apareceram (para exibir)
+        self.current = {}
+        self.count = 0
+        self.dropped = 0
+        self.frame_start = None
+        self.last_lap = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+        return self.enabled
+
+    def reset(self):
+        self.frames[:] = 0
+        self.phases = {}
+        self.order = []
+        self.current = {}
+        self.count = 0
+        self.dropped = 0
+        self.frame_start = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.end_frame(now)
+        self.frame_start = now
+
+    def end_frame(self, now):
+        """Fecha o frame anterior: grava intervalo e fases na posição atual do anel"""
+        interval = (now - self.frame_start) * 1000
+        i = self.count % self.size
+        self.frames[i] = interval
+        if interval > 1.5 * 1000 / self.target_fps:
+            self.dropped += 1
+        for name, buf in self.phases.items():
+            buf[i] = self.current.get(name, 0.0)
+        self.current = {}
+        self.count += 1
+
+    def add(self, name, seconds):
+        """Soma `seconds` à fase `name` no frame atual"""
+        if name not in self.phases:
+            self.phases[name] = np.zeros(self.size)
+            self.order.append(name)
+        self.current[name] = self.current.get(name, 0.0) + seconds * 1000
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def lap_start(self):
+        if self.enabled:
+            self.last_lap = time.perf_counter()
+
+    def lap(self, name):
+        """Atribui a `name` o tempo desde o último lap (ou lap_start)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.add(name, now - self.last_lap)
+        self.last_lap = now
+
+    def frame_times(self):
+        """Intervalos registrados, do mais antigo ao mais recente"""
+        n = min(self.count, self.size)
+        if self.count <= self.size:
+            return self.frames[:n]
+        i = self.count % self.size
+        return np.concatenate((self.frames[i:], self.frames[:i]))
+
+    def percentiles(self):
+        """p50, p95 e p99 do intervalo entre frames (ms)"""
+        times = self.frame_times()
+        if len(times) == 0:
+            return 0.0, 0.0, 0.0
+        return tuple(float(v) for v in np.percentile(times, (50, 95, 99)))
+
+    def phase_means(self):
+        """Média (ms) de cada fase nos frames do anel; sub-etapas ("draw.x") logo após a fase-mãe"""
+        n = min(self.count, self.size)
+        if n == 0:
+            return []
+        top = [name for name in self.order if "." not in name]
+        parents = set(top)
+        # Sub-etapa sem fase-mãe registrada vira fase de nível superior
+        top += [name for name in self.order if "." in name and name.split(".")[0] not in parents]
+        names = []
+        for name in top:
+            names.append(name)
+            names += [sub for sub in self.order if sub.startswith(name + ".")]
+        return [(name, float(self.phases[name][:n].mean())) for name in names]
+
+# Instância global usada pelo loop principal e pelos jogos
+profiler = FrameProfiler()
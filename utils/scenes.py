@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+from utils.tracing import tracer
+
+class ScenePreloader:
+    """
+    Prepara em segundo plano a cena que provavelmente vem a seguir (o jogo sob
+    o cursor no seletor, a partida com as configurações do menu) enquanto a
+    atual está ociosa.
+
+    Cada preparação tem uma chave que descreve o que ela monta; quem troca de
+    cena pede o resultado pela mesma chave e, se já terminou, a troca é só
+    pegar o objeto pronto. Os trabalhos rodam um por vez numa única thread e
+    só importam módulos, leem e decodificam recursos (assets.prefetch_image,
+    stage, prefetch_sound) e montam estado puro como a simulação. Nada que
+    passe pelo SDL fora da memória: fontes, mixer.Sound e convert() para o
+    formato da tela ficam para a thread principal, quando a cena é adotada.
+    """
+    LOADING_DELAY_MS = 100  # Espera curta não mostra a tela de carregamento
+
+    def __init__(self):
+        self.executor = None
+        self.jobs = {}  # chave -> Future
+        self.stats = {"prepared": 0, "taken": 0, "waited": 0, "discarded": 0, "failed": 0}
+
+    def prepare(self, key, build):
+        """Agenda build() para a chave, se ainda não foi agendado"""
+        job = self.jobs.get(key)
+        if job is None:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scenes")
+            job = self.executor.submit(self._run, key, build)
+            self.jobs[key] = job
+        return job
+
+    def _run(self, key, build):
+        with tracer.span("scenes.prepare", cat="scenes", key=repr(key)):
+            result = build()
+        self.stats["prepared"] += 1
+        return result
+
+    def scheduled(self, key):
+        return key in self.jobs
+
+    def ready(self, key):
+        job = self.jobs.get(key)
+        return job is not None and job.done()
+
+    def take(self, key, wait=False):
+        """
+        Resultado da preparação (que sai da lista). Sem `wait`, None enquanto
+        ela não termina; com `wait`, bloqueia até terminar. None também se a
+        chave não foi agendada ou se a preparação falhou: quem chama monta a
+        cena do jeito normal.
+        """
+        job = self.jobs.get(key)
+        if job is None or not (wait or job.done()):
+            return None
+        del self.jobs[key]
+        if not job.done():
+            self.stats["waited"] += 1
+            with tracer.span("scenes.wait", cat="scenes", key=repr(key)):
+                job.exception()
+        exc = job.exception()
+        if exc is not None:
+            self.stats["failed"] += 1
+            print(f"⚠ Pré-carga de {key!r} falhou: {type(exc).__name__}: {exc}")
+            return None
+        self.stats["taken"] += 1
+        return job.result()
+
+    def discard(self, kind=None, keep=None):
+        """Esquece as preparações do tipo (primeiro item da chave), menos `keep`; todas com kind None"""
+        for key in list(self.jobs):
+            if key != keep and (kind is None or key[0] == kind):
+                # Uma preparação já em andamento termina na thread, mas o resultado é descartado
+                self.jobs.pop(key).cancel()
+                self.stats["discarded"] += 1
+
+    def shutdown(self):
+        self.discard()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+# Instância global usada pelo seletor (main.py) e pelo menu dos jogos
+scenes = ScenePreloader()
@@ -0,0 +1,58 @@
+import threading
+import time
+from utils.tracing import tracer
+
+class _Step:
+    def __init__(self, report, name, kind):
+        self.report = report
+        self.name = name
+        self.kind = kind
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.report.add(self.name, self.kind, self.t0, time.perf_counter())
+        return False
+
+class StartupReport:
+    """
+    Linha do tempo da inicialização: importações, init de subsistemas e marcos
+    (ex.: primeiro frame). Cada etapa também vira evento no trace se ele estiver
+    gravando. print_report() mostra a divisão com --startup-report.
+    """
+    def __init__(self, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.steps = []  # (nome, tipo, início, duração, thread), em segundos
+        self.marks = {}
+        self.lock = threading.Lock()
+
+    def step(self, name, kind="init"):
+        return _Step(self, name, kind)
+
+    def add(self, name, kind, t0, t1):
+        with self.lock:
+            self.steps.append((name, kind, t0 - self.t0, t1 - t0, threading.current_thread().name))
+        if tracer.enabled:
+            tracer.complete(name, "startup", t0, t1, {"kind": kind})
+
+    def mark(self, name):
+        """Registra um marco (só a primeira vez que acontece)"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.t0
+            tracer.instant(name, cat="startup")
+
+    def print_report(self):
+        print("\n⏱  Inicialização (ms desde o início de main.py)")
+        print(f"  {'etapa':<40} {'tipo':<7} {'início':>8} {'duração':>8}  thread")
+        for name, kind, start, dur, thread in sorted(self.steps, key=lambda s: s[2]):
+            print(f"  {name:<40} {kind:<7} {start * 1000:8.1f} {dur * 1000:8.1f}  {thread}")
+        for kind in ("import", "init"):
+            total = sum(s[3] for s in self.steps if s[1] == kind)
+            print(f"  total {kind}: {total * 1000:.1f} ms")
+        for name, at in sorted(self.marks.items(), key=lambda m: m[1]):
+            print(f"  ▶ {name}: {at * 1000:.1f} ms")
+
+# Instância global; main.py ajusta t0 para o começo do processo
+startup = StartupReport()
@@ -0,0 +1,60 @@
+import asyncio
+
+class TaskRunner:
+    """
+    Tarefas assíncronas dos estados do jogo (carregamento, rede, telemetria),
+    sem threads.
+
+    No loop assíncrono (ArcadeMultiGames.run_async) as tarefas rodam no event
+    loop do asyncio, que recebe a vez a cada frame. No loop tradicional o
+    runner cria um event loop próprio e pump() dá uma volta nele por frame.
+    Cada tarefa pode ter um dono; cancel(dono) encerra as de um estado que saiu.
+    """
+    def __init__(self):
+        self.loop = None
+        self.owns_loop = False
+        self.tasks = {}  # tarefa -> dono
+
+    def attach(self, loop):
+        """Usa o event loop em execução (modo assíncrono)"""
+        self.loop = loop
+        self.owns_loop = False
+
+    def spawn(self, coro, owner=None, name=None):
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            self.owns_loop = True
+        task = self.loop.create_task(coro, name=name)
+        self.tasks[task] = owner
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task):
+        self.tasks.pop(task, None)
+        if not task.cancelled() and task.exception() is not None:
+            exc = task.exception()
+            print(f"⚠ Tarefa {task.get_name()} falhou: {type(exc).__name__}: {exc}")
+
+    def pump(self):
+        """Modo síncrono: executa o que estiver pronto no loop próprio (timers vencidos, I/O)"""
+        if self.owns_loop and self.tasks and not self.loop.is_running():
+            self.loop.run_until_complete(asyncio.sleep(0))
+
+    def cancel(self, owner=None):
+        """Cancela as tarefas do dono (todas, com owner None)"""
+        for task, task_owner in list(self.tasks.items()):
+            if owner is None or task_owner == owner:
+                task.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        if self.owns_loop and self.loop is not None:
+            pending = list(self.tasks)
+            if pending:
+                self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.close()
+        self.loop = None
+        self.owns_loop = False
+
+# Instância global usada pelo loop principal e pelos estados do jogo
+tasks = TaskRunner()
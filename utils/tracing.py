@@ -0,0 +1,120 @@
+import functools
+import json
+import os
+import threading
+import time
+
+class _NullSpan:
+    """Contexto vazio devolvido quando o tracing está desligado"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.cat, self.t0, time.perf_counter(), self.args)
+        return False
+
+class Tracer:
+    """
+    Coleta eventos no formato Chrome Trace Event (chrome://tracing, Perfetto).
+
+    Desligado, span() devolve um contexto vazio e os métodos decorados com
+    @traced só testam `enabled` antes de chamar a função original.
+    """
+    def __init__(self, max_events=1_000_000):
+        self.enabled = False
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self.t_origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def start(self):
+        self.events = []
+        self.dropped = 0
+        self.t_origin = time.perf_counter()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def _ts(self, t):
+        return (t - self.t_origin) * 1e6  # microssegundos
+
+    def _push(self, event):
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        self.events.append(event)
+
+    def complete(self, name, cat, t0, t1, args=None):
+        """Evento com duração (ph 'X')"""
+        event = {"name": name, "cat": cat, "ph": "X", "ts": self._ts(t0),
+                 "dur": (t1 - t0) * 1e6, "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self._push(event)
+
+    def instant(self, name, cat="game", **args):
+        """Marco pontual (ph 'i'), ex.: troca de estado"""
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": cat, "ph": "i", "s": "p",
+                 "ts": self._ts(time.perf_counter()), "pid": self.pid,
+                 "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self._push(event)
+
+    def span(self, name, cat="game", **args):
+        """Contexto que registra a duração do bloco"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def dump(self, path):
+        """Grava os eventos coletados em JSON e devolve quantos foram gravados"""
+        data = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return len(self.events)
+
+# Instância global
+tracer = Tracer()
+
+def traced(name=None, cat="game"):
+    """Decorador: registra cada chamada da função como um evento com duração"""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.complete(label, cat, t0, time.perf_counter())
+        wrapper.__traced__ = True
+        return wrapper
+    return decorate